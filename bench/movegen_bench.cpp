@@ -0,0 +1,153 @@
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <new>
+#include <string>
+#include <vector>
+
+#include "board.h"
+#include "perft.h"
+#include "piece.h"
+
+
+/*
+  Times move generation, perft and slider attack lookups in the
+  C++ core, counting the heap allocations each one makes by
+  replacing the global `operator new`
+*/
+
+static std::size_t allocations = 0;
+
+void *operator new(std::size_t size)
+{
+  allocations++;
+  if (void *ptr = std::malloc(size)) { return ptr; }
+  throw std::bad_alloc();
+}
+
+void operator delete(void *ptr) noexcept { std::free(ptr); }
+void operator delete(void *ptr, std::size_t) noexcept { std::free(ptr); }
+
+
+struct BenchPosition {
+  std::string name;
+  std::string fen;
+  int depth;
+};
+
+const std::vector<BenchPosition> POSITIONS {
+  {"start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 5},
+  {"kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 4},
+};
+
+using Clock = std::chrono::steady_clock;
+
+double secondsSince(Clock::time_point start)
+{
+  return std::chrono::duration<double>(Clock::now() - start).count();
+}
+
+/*
+  Generates the moves of `board` over and over, reporting
+  the time and heap allocations of each call
+*/
+void benchGenerateLegalMoves(const BenchPosition &position)
+{
+  Board board;
+  board.fromFen(position.fen);
+  const int calls = 20000;
+
+  std::size_t moves = 0;
+  std::size_t allocations_before = allocations;
+  Clock::time_point start = Clock::now();
+  for (int i = 0; i < calls; i++) {
+    moves += generateLegalMoves(board).size();
+  }
+  double seconds = secondsSince(start);
+
+  std::printf(
+    "%-24s %-10s %10.1f ns/call %8.2f allocs/call (%zu moves)\n",
+    "generateLegalMoves", position.name.c_str(), seconds * 1e9 / calls,
+    double(allocations - allocations_before) / calls, moves / calls
+  );
+}
+
+void benchPerft(const BenchPosition &position)
+{
+  Board board;
+  board.fromFen(position.fen);
+
+  std::size_t allocations_before = allocations;
+  Clock::time_point start = Clock::now();
+  std::vector<U64> counts = perft(board, position.depth);
+  double seconds = secondsSince(start);
+
+  U64 nodes = 0;
+  for (U64 count : counts) { nodes += count; }
+  std::printf(
+    "%-24s %-10s %10.0f nodes/s %8.4f allocs/node (depth %d, %llu nodes)\n",
+    "perft", position.name.c_str(), nodes / seconds,
+    double(allocations - allocations_before) / nodes, position.depth,
+    (unsigned long long)nodes
+  );
+}
+
+/*
+  Bishop and rook attacks from every square, for a spread of
+  pseudo-random occupancies, by magic lookup and by ray scan
+*/
+void benchSliderAttacks()
+{
+  std::vector<U64> occupancies;
+  U64 state = 0x9E3779B97F4A7C15ULL;
+  for (int i = 0; i < 1024; i++) {
+    state ^= state << 13;
+    state ^= state >> 7;
+    state ^= state << 17;
+    occupancies.push_back(state & (state >> 11));
+  }
+  const int rounds = 50;
+  const double lookups = 2.0 * rounds * occupancies.size() * 64;
+
+  U64 sink = 0;
+  Clock::time_point start = Clock::now();
+  for (int round = 0; round < rounds; round++) {
+    for (U64 occupied : occupancies) {
+      for (int idx = 0; idx < 64; idx++) {
+        sink ^= getBishopAttacks(Square(idx), occupied);
+        sink ^= getRookAttacks(Square(idx), occupied);
+      }
+    }
+  }
+  double magic_seconds = secondsSince(start);
+
+  start = Clock::now();
+  for (int round = 0; round < rounds; round++) {
+    for (U64 occupied : occupancies) {
+      for (int idx = 0; idx < 64; idx++) {
+        sink ^= getDiagAttacks(Square(idx), occupied);
+        sink ^= getVertHorizAttacks(Square(idx), occupied);
+      }
+    }
+  }
+  double ray_seconds = secondsSince(start);
+
+  std::printf("%-24s %-10s %10.2f ns/lookup\n", "slider attacks", "magic",
+              magic_seconds * 1e9 / lookups);
+  std::printf("%-24s %-10s %10.2f ns/lookup\n", "slider attacks", "ray scan",
+              ray_seconds * 1e9 / lookups);
+  // Keeps the lookups from being optimized away
+  if (sink == 1) { std::printf("\n"); }
+}
+
+int main()
+{
+  for (const BenchPosition &position : POSITIONS) {
+    benchGenerateLegalMoves(position);
+  }
+  for (const BenchPosition &position : POSITIONS) {
+    benchPerft(position);
+  }
+  benchSliderAttacks();
+  return 0;
+}
@@ -0,0 +1,96 @@
+"""
+    Cross-backend perft benchmark
+
+    Runs the same perft positions on every available backend and
+    reports nodes per second, alongside whether each backend agrees
+    with the reference backend's node counts.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from pesto.bench.positions import PERFT_POSITIONS, BenchPosition
+from pesto.board.backend import (
+    DEFAULT_BACKEND,
+    PositionBackend,
+    available_backends,
+    get_backend,
+)
+from pesto.board.perft import perft
+
+
+@dataclass
+class BackendTiming:
+    """Perft results of one backend over a group of positions"""
+
+    backend: str
+    # Total nodes across all levels, by position name
+    nodes: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+    # Whether `nodes` matches the reference backend
+    correct: bool = True
+
+    @property
+    def total_nodes(self) -> int:
+        return sum(self.nodes.values())
+
+    @property
+    def nps(self) -> float:
+        """Nodes per second over every position"""
+        return self.total_nodes / self.seconds if self.seconds else 0.0
+
+
+def time_backend(
+    backend: PositionBackend, positions: Iterable[BenchPosition]
+) -> BackendTiming:
+    """Runs perft on each of `positions` with `backend`. Only the
+    perft walk is timed, not building the positions.
+    """
+    timing = BackendTiming(backend=backend.name)
+    for position in positions:
+        board = backend.from_fen(position.fen)
+        start = time.perf_counter()
+        node_count = perft(board=board, depth=position.depth)
+        timing.seconds += time.perf_counter() - start
+        timing.nodes[position.name] = sum(node_count.values())
+    return timing
+
+
+def compare_backends(
+    positions: Iterable[BenchPosition] = PERFT_POSITIONS,
+    backends: Optional[Iterable[str]] = None,
+    reference: str = DEFAULT_BACKEND,
+) -> list[BackendTiming]:
+    """Times every available backend (or those named in `backends`)
+    on the same positions, fastest first.
+
+    reference: Backend whose node counts are taken as correct
+    """
+    positions = list(positions)
+    selected = (
+        available_backends()
+        if backends is None
+        else [get_backend(name) for name in backends]
+    )
+
+    timings = [time_backend(backend, positions) for backend in selected]
+    reference_timing = next(
+        (timing for timing in timings if timing.backend == reference),
+        None,
+    ) or time_backend(get_backend(reference), positions)
+
+    expected = reference_timing.nodes
+    for timing in timings:
+        timing.correct = timing.nodes == expected
+    return sorted(timings, key=lambda timing: timing.nps, reverse=True)
+
+
+def format_timings(timings: Iterable[BackendTiming]) -> str:
+    """Renders backend timings as a plain text table"""
+    lines = [f"{'backend':<12}{'nodes':>12}{'seconds':>10}{'nps':>12}  correct"]
+    for timing in timings:
+        lines.append(
+            f"{timing.backend:<12}{timing.total_nodes:>12}"
+            f"{timing.seconds:>10.3f}{timing.nps:>12.0f}  {timing.correct}"
+        )
+    return "\n".join(lines)
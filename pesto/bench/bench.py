@@ -0,0 +1,121 @@
+"""
+    Standard benchmark
+
+    Times each phase of move generation over the fixed positions in
+    `BENCH_POSITIONS`:
+
+        fen_parse   building positions from FEN strings
+        movegen     generating the legal moves of each position
+        make_unmake playing and reverting each of those moves
+        perft       walking each position to its fixed depth
+
+    The total perft node count doubles as a signature, which changes
+    whenever move generation does, so only timings from runs sharing
+    a signature are comparable.
+"""
+import platform
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Optional
+
+from pesto.bench.positions import BENCH_POSITIONS, BenchPosition
+from pesto.board.backend import get_backend
+from pesto.board.perft import perft
+
+# Number of times the short phases are repeated per position,
+# so that they run long enough to time
+FEN_PARSE_REPEATS: int = 200
+MOVEGEN_REPEATS: int = 50
+MAKE_UNMAKE_REPEATS: int = 20
+
+PHASES: tuple[str, ...] = ("fen_parse", "movegen", "make_unmake", "perft")
+
+
+@dataclass
+class PhaseTiming:
+    """Time spent in one phase, and how many nodes (positions
+    parsed, moves generated or played, perft nodes) it covered
+    """
+
+    nodes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class BenchResult:
+    backend: str
+    # Perft node count of each position, by name
+    positions: dict[str, int] = field(default_factory=dict)
+    phases: dict[str, PhaseTiming] = field(
+        default_factory=lambda: {phase: PhaseTiming() for phase in PHASES}
+    )
+
+    @property
+    def signature(self) -> int:
+        """Total perft nodes over every position"""
+        return sum(self.positions.values())
+
+    def to_json(self) -> dict[str, Any]:
+        """The result as JSON-serializable data"""
+        return {
+            "backend": self.backend,
+            "python": platform.python_version(),
+            "signature": self.signature,
+            "seconds": sum(timing.seconds for timing in self.phases.values()),
+            "positions": self.positions,
+            "phases": {
+                phase: {**asdict(timing), "nps": timing.nps}
+                for phase, timing in self.phases.items()
+            },
+        }
+
+
+def run_bench(
+    positions: Iterable[BenchPosition] = BENCH_POSITIONS,
+    backend: Optional[str] = None,
+) -> BenchResult:
+    """Times each phase over `positions` using `backend`,
+    or the default backend when not given
+    """
+    position_backend = get_backend(backend)
+    result = BenchResult(backend=position_backend.name)
+    phases = result.phases
+
+    for position in positions:
+        start = time.perf_counter()
+        for _ in range(FEN_PARSE_REPEATS):
+            board = position_backend.from_fen(position.fen)
+        phases["fen_parse"].seconds += time.perf_counter() - start
+        phases["fen_parse"].nodes += FEN_PARSE_REPEATS
+
+        # Each repeat gets a fresh board, so that nothing a board
+        # caches per position (such as `Board.attack_map`) carries
+        # over from one repeat to the next
+        movegen_boards = [
+            position_backend.from_fen(position.fen) for _ in range(MOVEGEN_REPEATS)
+        ]
+        start = time.perf_counter()
+        for movegen_board in movegen_boards:
+            moves = movegen_board.legal_moves()
+        phases["movegen"].seconds += time.perf_counter() - start
+        phases["movegen"].nodes += MOVEGEN_REPEATS * len(moves)
+
+        start = time.perf_counter()
+        for _ in range(MAKE_UNMAKE_REPEATS):
+            for move in moves:
+                board.push(move)
+                board.pop()
+        phases["make_unmake"].seconds += time.perf_counter() - start
+        phases["make_unmake"].nodes += MAKE_UNMAKE_REPEATS * len(moves)
+
+        start = time.perf_counter()
+        nodes = sum(perft(board=board, depth=position.depth).values())
+        phases["perft"].seconds += time.perf_counter() - start
+        phases["perft"].nodes += nodes
+        result.positions[position.name] = nodes
+
+    return result
@@ -0,0 +1,56 @@
+"""
+    Positions used for benchmarking
+
+    Each position is searched to a fixed depth, so that node counts
+    stay the same from run to run and timings can be compared.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class BenchPosition:
+    name: str
+    fen: str
+    depth: int
+
+
+# The positions of the perft tests, at depths the
+# pure Python backends get through in a few seconds
+PERFT_POSITIONS: tuple[BenchPosition, ...] = (
+    BenchPosition(
+        name="starting_position",
+        fen="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        depth=3,
+    ),
+    BenchPosition(
+        name="position_3",
+        fen="8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        depth=4,
+    ),
+    BenchPosition(
+        name="position_4",
+        fen="r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        depth=3,
+    ),
+    BenchPosition(
+        name="position_5",
+        fen="rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        depth=3,
+    ),
+)
+
+# Fixed set searched by `pesto bench`. Changing any position or depth
+# changes the node signature, so results are only comparable
+# between runs using the same set.
+BENCH_POSITIONS: tuple[BenchPosition, ...] = PERFT_POSITIONS + (
+    BenchPosition(
+        name="kiwipete",
+        fen="r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        depth=2,
+    ),
+    BenchPosition(
+        name="position_6",
+        fen="r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        depth=2,
+    ),
+)
@@ -0,0 +1,58 @@
+"""
+    Summary statistics and significance testing for benchmark samples
+"""
+import math
+import statistics
+from typing import Sequence
+
+
+def median(samples: Sequence[float]) -> float:
+    return statistics.median(samples)
+
+
+def iqr(samples: Sequence[float]) -> float:
+    """Interquartile range, the spread of the middle half of `samples`"""
+    if len(samples) < 2:
+        return 0.0
+    lower, _, upper = statistics.quantiles(samples, n=4)
+    return upper - lower
+
+
+def mann_whitney_p_value(first: Sequence[float], second: Sequence[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test, i.e. how likely
+    samples at least this far apart would be if both groups came from
+    the same distribution. Uses the normal approximation, corrected
+    for ties, which is adequate from around five samples per group.
+    """
+    n_first, n_second = len(first), len(second)
+    if not n_first or not n_second:
+        return 1.0
+
+    ranked = sorted([(value, 0) for value in first] + [(value, 1) for value in second])
+    total = len(ranked)
+
+    # Tied values share the average of the ranks they span
+    rank_sum = 0.0
+    tie_term = 0
+    start = 0
+    while start < total:
+        end = start
+        while end + 1 < total and ranked[end + 1][0] == ranked[start][0]:
+            end += 1
+        ties = end - start + 1
+        rank = (start + end) / 2 + 1
+        rank_sum += rank * sum(1 for _, group in ranked[start : end + 1] if group == 0)
+        tie_term += ties**3 - ties
+        start = end + 1
+
+    u_stat = rank_sum - n_first * (n_first + 1) / 2
+    mean = n_first * n_second / 2
+    variance = (
+        n_first * n_second / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    )
+    if variance <= 0:
+        return 1.0
+
+    # Continuity correction, as U only takes whole values
+    z_score = max(abs(u_stat - mean) - 0.5, 0) / math.sqrt(variance)
+    return math.erfc(z_score / math.sqrt(2))
@@ -0,0 +1,347 @@
+"""
+    Micro-benchmark suite
+
+    Each benchmark times one hot function on a fixed position. A run
+    makes a few warmup calls, then takes several samples, each the
+    mean time of a batch of calls, and summarizes them by median
+    and interquartile range.
+
+    Runs are appended to a local JSON history, and two runs can be
+    compared to flag statistically significant slowdowns.
+"""
+import json
+import platform
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from pesto.bench.stats import iqr, mann_whitney_p_value, median
+from pesto.board.bitboard import BitBoard
+from pesto.board.board import Board
+from pesto.board.fen import dump_piece_map_to_fen, parse_fen_piece_map
+from pesto.board.magic import (
+    bishop_attacks,
+    bishop_ray_attacks,
+    rook_attacks,
+    rook_ray_attacks,
+)
+from pesto.board.move.apply import make_move, make_move_in_place, unmake_move_in_place
+from pesto.board.move.attack import square_is_attacked
+from pesto.board.move.castle import generate_castling_moves
+from pesto.board.move.legal import legal_move_generator
+from pesto.board.perft import perft
+from pesto.board.square import Square
+from pesto.core.enums import Color
+
+# Rich in castling, pins, checks and promotions
+KIWIPETE_FEN: str = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+DEFAULT_HISTORY: str = ".pesto-bench-history.json"
+
+
+@dataclass(frozen=True)
+class MicroBenchmark:
+    """A function to time
+
+    setup: Prepares the position, returning the call to time
+    number: Calls per sample, enough for a sample to be
+        well above timer resolution
+    nodes: Perft nodes visited by each call, for benchmarks
+        walking the tree, so that their times can be read per node
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int
+    nodes: int = 0
+
+
+def _parse_fen_piece_map() -> Callable[[], object]:
+    pieces = KIWIPETE_FEN.split()[0]
+    return lambda: parse_fen_piece_map(pieces)
+
+
+def _dump_piece_map_to_fen() -> Callable[[], object]:
+    piece_map = Board.from_fen(KIWIPETE_FEN).piece_map
+    return lambda: dump_piece_map_to_fen(piece_map)
+
+
+def _square_is_attacked() -> Callable[[], object]:
+    piece_map = Board.from_fen(KIWIPETE_FEN).piece_map
+    return lambda: square_is_attacked(
+        piece_map=piece_map, square=Square.F1, by=Color.BLACK
+    )
+
+
+def _generate_castling_moves() -> Callable[[], object]:
+    board = Board.from_fen(KIWIPETE_FEN)
+    return lambda: generate_castling_moves(
+        piece_map=board.piece_map,
+        castle_rights=board.castle_rights,
+        to_move=board.to_move,
+    )
+
+
+def _legal_move_generator() -> Callable[[], object]:
+    board = Board.from_fen(KIWIPETE_FEN)
+    return lambda: legal_move_generator(
+        piece_map=board.piece_map,
+        to_move=board.to_move,
+        castle_rights=board.castle_rights,
+        en_passant_sq=board.en_passant_target,
+    )
+
+
+def _make_move() -> Callable[[], object]:
+    board = Board.from_fen(KIWIPETE_FEN)
+    moves = list(board.legal_moves())
+    return lambda: [make_move(piece_map=board.piece_map, move=move) for move in moves]
+
+
+def _make_unmake_move() -> Callable[[], object]:
+    board = Board.from_fen(KIWIPETE_FEN)
+    moves = list(board.legal_moves())
+
+    def make_unmake() -> None:
+        for move in moves:
+            played = make_move_in_place(piece_map=board.piece_map, move=move)
+            unmake_move_in_place(piece_map=board.piece_map, move=played)
+
+    return make_unmake
+
+
+def _apply_move() -> Callable[[], object]:
+    board = Board.from_fen(KIWIPETE_FEN)
+    moves = list(board.legal_moves())
+    return lambda: [board.apply_move(move) for move in moves]
+
+
+def _slider_lookups(
+    bishop: Callable[[int, int], int], rook: Callable[[int, int], int]
+) -> Callable[[], object]:
+    white, black = BitBoard.from_fen(KIWIPETE_FEN).occupancy
+    occupied = white | black
+    return lambda: [bishop(idx, occupied) | rook(idx, occupied) for idx in range(64)]
+
+
+def _magic_slider_attacks() -> Callable[[], object]:
+    return _slider_lookups(bishop_attacks, rook_attacks)
+
+
+def _ray_slider_attacks() -> Callable[[], object]:
+    return _slider_lookups(bishop_ray_attacks, rook_ray_attacks)
+
+
+def _perft() -> Callable[[], object]:
+    board = Board.new()
+    return lambda: perft(board=board, depth=2)
+
+
+def _perft_kiwipete() -> Callable[[], object]:
+    board = Board.from_fen(KIWIPETE_FEN)
+    return lambda: perft(board=board, depth=2)
+
+
+MICRO_BENCHMARKS: tuple[MicroBenchmark, ...] = (
+    MicroBenchmark("parse_fen_piece_map", _parse_fen_piece_map, number=500),
+    MicroBenchmark("dump_piece_map_to_fen", _dump_piece_map_to_fen, number=500),
+    MicroBenchmark("square_is_attacked", _square_is_attacked, number=2000),
+    MicroBenchmark("generate_castling_moves", _generate_castling_moves, number=500),
+    MicroBenchmark("legal_move_generator", _legal_move_generator, number=50),
+    # The batch benchmarks below play every legal move of the position
+    MicroBenchmark("make_move", _make_move, number=20),
+    MicroBenchmark("make_unmake_move", _make_unmake_move, number=20),
+    MicroBenchmark("apply_move", _apply_move, number=5),
+    # Bishop and rook attacks from every square of the position, by
+    # magic lookup and by scanning rays for the first blocker
+    MicroBenchmark("magic_slider_attacks", _magic_slider_attacks, number=200),
+    MicroBenchmark("ray_slider_attacks", _ray_slider_attacks, number=200),
+    # Square and color handling is spread over every stage of a
+    # node, so its cost is best seen in the time per perft node
+    MicroBenchmark("perft", _perft, number=1, nodes=420),
+    MicroBenchmark("perft_kiwipete", _perft_kiwipete, number=1, nodes=2087),
+)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    number: int
+    # Mean seconds per call of each sample
+    samples: list[float]
+    # Perft nodes visited per call, if any
+    nodes: int = 0
+
+    @property
+    def median(self) -> float:
+        return median(self.samples)
+
+    @property
+    def iqr(self) -> float:
+        return iqr(self.samples)
+
+    @property
+    def median_per_node(self) -> Optional[float]:
+        return self.median / self.nodes if self.nodes else None
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "number": self.number,
+            "samples": self.samples,
+            "median": self.median,
+            "iqr": self.iqr,
+            "nodes": self.nodes,
+            "median_per_node": self.median_per_node,
+        }
+
+
+def time_benchmark(
+    benchmark: MicroBenchmark, repeats: int = 7, warmup: int = 1
+) -> BenchmarkResult:
+    """Takes `repeats` samples of `benchmark` after
+    `warmup` untimed batches
+    """
+    call = benchmark.setup()
+    for _ in range(warmup * benchmark.number):
+        call()
+
+    samples: list[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(benchmark.number):
+            call()
+        samples.append((time.perf_counter() - start) / benchmark.number)
+
+    return BenchmarkResult(
+        name=benchmark.name,
+        number=benchmark.number,
+        samples=samples,
+        nodes=benchmark.nodes,
+    )
+
+
+def run_suite(
+    repeats: int = 7,
+    warmup: int = 1,
+    names: Optional[Iterable[str]] = None,
+    benchmarks: Iterable[MicroBenchmark] = MICRO_BENCHMARKS,
+) -> dict[str, Any]:
+    """Times each benchmark (or only those in `names`),
+    returning the run as JSON-serializable data
+    """
+    selected = set(names) if names is not None else None
+    results = {
+        benchmark.name: time_benchmark(
+            benchmark, repeats=repeats, warmup=warmup
+        ).to_json()
+        for benchmark in benchmarks
+        if selected is None or benchmark.name in selected
+    }
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "repeats": repeats,
+        "warmup": warmup,
+        "results": results,
+    }
+
+
+def append_history(run: dict[str, Any], path: str = DEFAULT_HISTORY) -> None:
+    """Adds `run` to the end of the JSON history at `path`"""
+    history_path = Path(path)
+    history = (
+        json.loads(history_path.read_text(encoding="utf-8"))
+        if history_path.exists()
+        else []
+    )
+    history.append(run)
+    history_path.write_text(json.dumps(history, indent=2) + "\n", encoding="utf-8")
+
+
+def load_run(path: str) -> dict[str, Any]:
+    """Reads a run from a result file, or the most recent
+    run from a history file
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(data, list):
+        if not data:
+            raise ValueError(f"History {path} holds no runs")
+        return data[-1]
+    return data
+
+
+@dataclass
+class Comparison:
+    name: str
+    base_median: float
+    new_median: float
+    p_value: float
+    # Flagged when the new samples are significantly slower,
+    # by more than the comparison's threshold
+    regression: bool
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median, positive when slower"""
+        return self.new_median / self.base_median - 1 if self.base_median else 0.0
+
+
+def compare_runs(
+    base: dict[str, Any],
+    new: dict[str, Any],
+    alpha: float = 0.05,
+    threshold: float = 0.05,
+) -> list[Comparison]:
+    """Compares the benchmarks present in both runs
+
+    alpha: Significance level of the Mann-Whitney U test
+    threshold: Smallest relative slowdown of the median worth flagging,
+        so that significant but negligible changes aren't reported
+    """
+    comparisons: list[Comparison] = []
+    for name, base_result in base["results"].items():
+        if (new_result := new["results"].get(name)) is None:
+            continue
+
+        comparison = Comparison(
+            name=name,
+            base_median=base_result["median"],
+            new_median=new_result["median"],
+            p_value=mann_whitney_p_value(base_result["samples"], new_result["samples"]),
+            regression=False,
+        )
+        comparison.regression = (
+            comparison.p_value < alpha and comparison.change > threshold
+        )
+        comparisons.append(comparison)
+    return comparisons
+
+
+def format_run(run: dict[str, Any]) -> str:
+    """Renders a run as a plain text table"""
+    lines = [
+        f"{'benchmark':<26}{'median (us)':>14}{'iqr (us)':>12}{'per node (us)':>16}"
+    ]
+    for name, result in run["results"].items():
+        # Runs recorded before nodes were counted have no time per node
+        per_node = result.get("median_per_node")
+        lines.append(
+            f"{name:<26}{result['median'] * 1e6:>14.2f}{result['iqr'] * 1e6:>12.2f}"
+            + (f"{per_node * 1e6:>16.2f}" if per_node is not None else "")
+        )
+    return "\n".join(lines)
+
+
+def format_comparisons(comparisons: Iterable[Comparison]) -> str:
+    """Renders comparisons as a plain text table"""
+    lines = [f"{'benchmark':<26}{'change':>9}{'p-value':>10}"]
+    for comparison in comparisons:
+        flag = "  SLOWER" if comparison.regression else ""
+        lines.append(
+            f"{comparison.name:<26}{comparison.change:>+9.1%}"
+            f"{comparison.p_value:>10.4f}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,56 @@
+import pytest
+
+from pesto.bench.backends import compare_backends, format_timings
+from pesto.bench.positions import BenchPosition
+from pesto.board import backend as backend_module
+from pesto.board.backend import PositionBackend, available_backends
+from pesto.board.board import Board
+
+POSITIONS = (
+    BenchPosition(
+        name="starting_position",
+        fen="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        depth=2,
+    ),
+    BenchPosition(
+        name="position_3",
+        fen="8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        depth=2,
+    ),
+)
+
+
+@pytest.mark.unit
+def test_compare_backends():
+    timings = compare_backends(positions=POSITIONS)
+    assert {timing.backend for timing in timings} == {
+        backend.name for backend in available_backends()
+    }
+    for timing in timings:
+        assert timing.correct
+        assert timing.nodes == {"starting_position": 420, "position_3": 205}
+        assert timing.nps > 0
+
+    assert [timing.nps for timing in timings] == sorted(
+        (timing.nps for timing in timings), reverse=True
+    )
+    assert len(format_timings(timings).splitlines()) == len(timings) + 1
+
+
+@pytest.mark.unit
+def test_compare_backends_flags_wrong_counts(monkeypatch: pytest.MonkeyPatch):
+    # Always starts from the same position, whatever it's asked for
+    broken = PositionBackend(
+        name="broken", from_fen=lambda fen: Board.from_fen(POSITIONS[0].fen)
+    )
+    monkeypatch.setitem(
+        backend_module._BACKENDS,  # pylint: disable=protected-access
+        broken.name,
+        broken,
+    )
+
+    timings = compare_backends(positions=POSITIONS, backends=["python", "broken"])
+    assert {timing.backend: timing.correct for timing in timings} == {
+        "python": True,
+        "broken": False,
+    }
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from pesto.bench.bench import (
+    FEN_PARSE_REPEATS,
+    MAKE_UNMAKE_REPEATS,
+    MOVEGEN_REPEATS,
+    PHASES,
+    run_bench,
+)
+from pesto.bench.positions import BENCH_POSITIONS, BenchPosition
+from pesto.board.backend import available_backends
+from pesto.board.board import Board
+from pesto.board.piece import Move
+
+# Total perft nodes of `BENCH_POSITIONS`
+BENCH_SIGNATURE = 133_435
+
+
+@pytest.mark.unit
+def test_run_bench():
+    position = BenchPosition(
+        name="starting_position",
+        fen="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        depth=2,
+    )
+    result = run_bench(positions=[position], backend="python")
+
+    assert result.positions == {"starting_position": 420}
+    assert result.signature == 420
+    assert result.phases["fen_parse"].nodes == FEN_PARSE_REPEATS
+    assert result.phases["movegen"].nodes == 20 * MOVEGEN_REPEATS
+    assert result.phases["make_unmake"].nodes == 20 * MAKE_UNMAKE_REPEATS
+    assert result.phases["perft"].nodes == 420
+
+    report = json.loads(json.dumps(result.to_json()))
+    assert report["backend"] == "python"
+    assert report["signature"] == 420
+    assert set(report["phases"]) == set(PHASES)
+    assert all(phase["nps"] > 0 for phase in report["phases"].values())
+
+
+@pytest.mark.unit
+def test_movegen_repeats_start_without_cached_attack_map(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    cached: list[bool] = []
+    legal_moves = Board.legal_moves
+
+    def record_cache(board: Board) -> set[Move]:
+        cached.append(board._attack_map is not None)  # pylint: disable=protected-access
+        return legal_moves(board)
+
+    monkeypatch.setattr(Board, "legal_moves", record_cache)
+    position = BenchPosition(
+        name="starting_position",
+        fen="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        depth=1,
+    )
+    run_bench(positions=[position], backend="python")
+    assert not any(cached[:MOVEGEN_REPEATS])
+
+
+@pytest.mark.unit
+def test_bench_positions_include_perft_tests():
+    fens = {position.fen for position in BENCH_POSITIONS}
+    assert {
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    } <= fens
+
+
+@pytest.mark.perft
+@pytest.mark.parametrize("backend", [backend.name for backend in available_backends()])
+def test_bench_signature(backend: str):
+    assert run_bench(backend=backend).signature == BENCH_SIGNATURE
@@ -0,0 +1,29 @@
+import pytest
+
+from pesto.bench.stats import iqr, mann_whitney_p_value, median
+
+
+@pytest.mark.unit
+def test_median_and_iqr():
+    samples = [5.0, 1.0, 3.0, 2.0, 4.0]
+    assert median(samples) == 3.0
+    assert iqr(samples) == 3.0
+    assert iqr([1.0]) == 0.0
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("group_a", "group_b", "exp"),
+    [
+        # Fully separated groups of seven
+        ([1, 2, 3, 4, 5, 6, 7], [8, 9, 10, 11, 12, 13, 14], 0.002165),
+        ([1, 2, 2, 3, 5], [2, 3, 4, 4, 6], 0.241844),
+        ([1, 2, 3], [1, 2, 3], 1.0),
+        ([2, 2, 2], [2, 2, 2], 1.0),
+        ([], [1, 2], 1.0),
+    ],
+)
+def test_mann_whitney_p_value(group_a: list[float], group_b: list[float], exp: float):
+    # The test is symmetric in its groups
+    assert mann_whitney_p_value(group_a, group_b) == pytest.approx(exp, abs=1e-6)
+    assert mann_whitney_p_value(group_b, group_a) == pytest.approx(exp, abs=1e-6)
@@ -0,0 +1,120 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from pesto.bench.suite import (
+    MICRO_BENCHMARKS,
+    MicroBenchmark,
+    append_history,
+    compare_runs,
+    format_run,
+    load_run,
+    run_suite,
+    time_benchmark,
+)
+from pesto.cli import main
+
+
+def _run(**samples: list[float]) -> dict:
+    return {
+        "results": {
+            name: {"samples": values, "median": sorted(values)[len(values) // 2]}
+            for name, values in samples.items()
+        }
+    }
+
+
+@pytest.mark.unit
+def test_time_benchmark():
+    calls = []
+    benchmark = MicroBenchmark("append", lambda: lambda: calls.append(1), number=3)
+    result = time_benchmark(benchmark, repeats=4, warmup=2)
+
+    assert len(calls) == 3 * (4 + 2)
+    assert len(result.samples) == 4
+    assert result.median > 0
+    assert result.iqr >= 0
+
+
+@pytest.mark.unit
+def test_micro_benchmarks_run():
+    """Every benchmark can be set up and called"""
+    for benchmark in MICRO_BENCHMARKS:
+        benchmark.setup()()
+
+
+@pytest.mark.unit
+def test_run_suite_only_named():
+    run = run_suite(repeats=2, warmup=0, names=["square_is_attacked"])
+    assert list(run["results"]) == ["square_is_attacked"]
+    assert len(run["results"]["square_is_attacked"]["samples"]) == 2
+
+
+@pytest.mark.unit
+def test_history(tmp_path: Path):
+    path = str(tmp_path / "history.json")
+    append_history({"results": {}, "created": "first"}, path=path)
+    append_history({"results": {}, "created": "second"}, path=path)
+
+    assert len(json.loads(Path(path).read_text(encoding="utf-8"))) == 2
+    assert load_run(path)["created"] == "second"
+
+
+@pytest.mark.unit
+def test_compare_runs():
+    base = _run(
+        slower=[1.0, 1.1, 1.0, 0.9, 1.0, 1.1, 0.9],
+        unchanged=[1.0, 1.1, 1.0, 0.9, 1.0, 1.1, 0.9],
+        barely_slower=[1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+        removed=[1.0],
+    )
+    new = _run(
+        slower=[1.5, 1.6, 1.5, 1.4, 1.5, 1.6, 1.4],
+        unchanged=[1.1, 1.0, 0.9, 1.0, 1.0, 1.1, 0.9],
+        # Significant, but below the default threshold
+        barely_slower=[1.01, 1.01, 1.01, 1.01, 1.01, 1.01, 1.01],
+    )
+
+    comparisons = {c.name: c for c in compare_runs(base=base, new=new)}
+    assert set(comparisons) == {"slower", "unchanged", "barely_slower"}
+    assert comparisons["slower"].regression
+    assert comparisons["slower"].change == pytest.approx(0.5)
+    assert not comparisons["unchanged"].regression
+    assert comparisons["barely_slower"].p_value < 0.05
+    assert not comparisons["barely_slower"].regression
+
+
+@pytest.mark.unit
+def test_compare_command_exit_code(tmp_path: Path):
+    base, new = tmp_path / "base.json", tmp_path / "new.json"
+    base.write_text(json.dumps(_run(perft=[1.0, 1.1, 1.0, 0.9, 1.0])))
+    new.write_text(json.dumps(_run(perft=[2.0, 2.1, 2.0, 1.9, 2.0])))
+
+    assert main(["suite", "compare", str(base), str(new)]) == 1
+    assert main(["suite", "compare", str(new), str(base)]) == 0
+
+
+@pytest.mark.unit
+def test_time_benchmark_per_node():
+    walk = MicroBenchmark("walk", lambda: lambda: None, number=2, nodes=100)
+    result = time_benchmark(walk, repeats=3, warmup=0)
+    assert result.median_per_node == pytest.approx(result.median / 100)
+    assert result.to_json()["nodes"] == 100
+
+    call = MicroBenchmark("call", lambda: lambda: None, number=1)
+    assert time_benchmark(call, repeats=1).median_per_node is None
+
+
+@pytest.mark.unit
+def test_format_run_per_node():
+    """Runs recorded before nodes were counted still render"""
+    run = {
+        "results": {
+            "perft": {"median": 2e-3, "iqr": 1e-4, "median_per_node": 1e-5},
+            "square_is_attacked": {"median": 2e-6, "iqr": 1e-7},
+        }
+    }
+    lines = format_run(run).splitlines()
+    assert lines[1].split()[-1] == "10.00"
+    assert len(lines[2].split()) == 3
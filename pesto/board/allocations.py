@@ -0,0 +1,264 @@
+"""
+    Allocation profiling of perft
+
+    Uses `tracemalloc` to find out how much memory each perft node
+    allocates, broken down by the source line allocating it.
+
+    tracemalloc reports memory in use rather than memory allocated,
+    so the walk is traced line by line: the peak of traced memory
+    while a line runs, above the memory in use when it started, is
+    what the line allocated. That counts temporaries freed again
+    before the next line, such as the memo of a `deepcopy`, as well
+    as anything the line holds on to. Memory freed and reused within
+    a single line is only counted once. Work done in C is charged to
+    the Python line calling it. What the tracing allocates itself,
+    such as frame objects for the calls it follows, is measured up
+    front and left out.
+
+    Objects are counted by the allocated blocks in use after each
+    line less those before it, so ones freed within the line itself
+    aren't counted.
+
+    Line tracing slows the walk down many times over, and the
+    allocations of the native backend's C++ core can't be seen.
+"""
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from types import FrameType
+from typing import Any, Callable, Optional, TypeVar
+
+from pesto.board import perft as perft_module
+from pesto.board.backend import Position
+from pesto.board.board import Board
+from pesto.board.profiling import is_resumed
+
+T = TypeVar("T")
+
+
+@dataclass
+class LineAllocations:
+    # File and line number of the allocation
+    location: str
+    bytes_per_node: float
+    objects_per_node: float
+
+
+@dataclass
+class AllocationReport:
+    # Nodes counted by the walk, as summed over every level by perft
+    nodes: int
+    # Largest first
+    lines: list[LineAllocations]
+
+    @property
+    def bytes_per_node(self) -> float:
+        return sum(line.bytes_per_node for line in self.lines)
+
+    @property
+    def objects_per_node(self) -> float:
+        return sum(line.objects_per_node for line in self.lines)
+
+    def to_json(self, limit: Optional[int] = None) -> dict[str, Any]:
+        return {
+            "nodes": self.nodes,
+            "bytes_per_node": self.bytes_per_node,
+            "objects_per_node": self.objects_per_node,
+            "lines": [
+                {
+                    "location": line.location,
+                    "bytes_per_node": line.bytes_per_node,
+                    "objects_per_node": line.objects_per_node,
+                }
+                for line in self.lines[:limit]
+            ],
+        }
+
+
+Location = tuple[str, int]
+
+
+class _LineTracer:
+    """Trace function charging the memory allocated between
+    trace events to the line that was running
+    """
+
+    def __init__(self) -> None:
+        self.bytes_by_line: Counter[Location] = Counter()
+        self.objects_by_line: Counter[Location] = Counter()
+        # Spans of time each line was charged for
+        self.runs_by_line: Counter[Location] = Counter()
+        # Functions called from each line, other than generators
+        # being resumed, and the sizes of the frame objects
+        # tracing has to allocate for them
+        self.calls_by_line: Counter[Location] = Counter()
+        self.frame_bytes_by_line: Counter[Location] = Counter()
+        self._location: Optional[Location] = None
+        self._memory = 0
+        self._blocks = 0
+
+    def __call__(self, frame: FrameType, event: str, _arg: Any) -> _LineTracer:
+        # Read before anything else is allocated here
+        _, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        if self._location is not None:
+            self.bytes_by_line[self._location] += peak - self._memory
+            self.objects_by_line[self._location] += max(blocks - self._blocks, 0)
+            self.runs_by_line[self._location] += 1
+            if event == "call" and not is_resumed(frame):
+                self.calls_by_line[self._location] += 1
+                self.frame_bytes_by_line[self._location] += sys.getsizeof(frame)
+
+        # Returning or yielding hands back to the line that called in
+        if event == "return" and frame.f_back is not None:
+            frame = frame.f_back
+        self._location = (frame.f_code.co_filename, frame.f_lineno)
+
+        self._blocks = sys.getallocatedblocks()
+        self._memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        return self
+
+    def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Calls `func` with every line run under it traced"""
+        previous = sys.gettrace()
+        sys.settrace(self)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sys.settrace(previous)
+            # Drop the line running when tracing stopped
+            self._location = None
+
+
+def _noop() -> None:
+    """Allocates nothing, to be traced"""
+
+
+def _idle(runs: int) -> None:
+    for _ in range(runs):
+        _noop()
+
+
+@dataclass(frozen=True)
+class _Overhead:
+    """What the tracer itself allocates, charged to the lines traced"""
+
+    # Bytes and objects per span of a line
+    span_bytes: float
+    span_objects: float
+    # Part of the size of a frame object that isn't newly
+    # allocated when it's created, and objects per call
+    frame_slack: float
+    call_objects: float
+
+    @staticmethod
+    def measure(runs: int = 1000) -> _Overhead:
+        tracer = _LineTracer()
+        tracer.run(_idle, runs)
+        loop = (__file__, _idle.__code__.co_firstlineno + 1)
+        call = (__file__, _idle.__code__.co_firstlineno + 2)
+
+        span_bytes = tracer.bytes_by_line[loop] / tracer.runs_by_line[loop]
+        span_objects = tracer.objects_by_line[loop] / tracer.runs_by_line[loop]
+        calls = tracer.calls_by_line[call]
+        frame_bytes = (
+            tracer.bytes_by_line[call] - tracer.runs_by_line[call] * span_bytes
+        ) / calls
+        return _Overhead(
+            span_bytes=span_bytes,
+            span_objects=span_objects,
+            frame_slack=tracer.frame_bytes_by_line[call] / calls - frame_bytes,
+            call_objects=(
+                tracer.objects_by_line[call] - tracer.runs_by_line[call] * span_objects
+            )
+            / calls,
+        )
+
+    def bytes(self, tracer: _LineTracer, location: Location) -> float:
+        """Bytes `tracer` charged to `location`, less its own"""
+        frame_bytes = (
+            tracer.frame_bytes_by_line[location]
+            - tracer.calls_by_line[location] * self.frame_slack
+        )
+        return (
+            tracer.bytes_by_line[location]
+            - tracer.runs_by_line[location] * self.span_bytes
+            - frame_bytes
+        )
+
+    def objects(self, tracer: _LineTracer, location: Location) -> float:
+        """Objects `tracer` charged to `location`, less its own"""
+        return (
+            tracer.objects_by_line[location]
+            - tracer.runs_by_line[location] * self.span_objects
+            - tracer.calls_by_line[location] * self.call_objects
+        )
+
+
+def allocation_report(
+    board: Position, depth: int, bulk: bool = False
+) -> AllocationReport:
+    """Walks the perft tree below `board` with `get_node_count`,
+    tracing the allocations of every line run on the way
+    """
+    if isinstance(board, Board) and board.native_position is not None:
+        raise ValueError(
+            "Allocations of the native backend are made in its C++ core, "
+            "which tracemalloc can't trace"
+        )
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracer = _LineTracer()
+    try:
+        overhead = _Overhead.measure()
+        node_count = tracer.run(
+            perft_module.get_node_count,
+            start_board=board,
+            curr_depth=0,
+            max_depth=depth,
+            bulk=bulk,
+        )
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    nodes = sum(node_count.values())
+    lines = []
+    for location in tracer.bytes_by_line:
+        # Lines charged no more than the tracer's own
+        # allocations are left out, along with any noise
+        if (size := overhead.bytes(tracer, location)) <= 0:
+            continue
+        filename, lineno = location
+        lines.append(
+            LineAllocations(
+                location=f"{filename}:{lineno}",
+                bytes_per_node=size / max(nodes, 1),
+                objects_per_node=max(overhead.objects(tracer, location), 0)
+                / max(nodes, 1),
+            )
+        )
+
+    lines.sort(key=lambda line: line.bytes_per_node, reverse=True)
+    return AllocationReport(nodes=nodes, lines=lines)
+
+
+def format_report(report: AllocationReport, limit: Optional[int] = 20) -> str:
+    """Renders the largest allocating lines as a plain text table"""
+    lines = [
+        f"{report.bytes_per_node:.0f} bytes and {report.objects_per_node:.1f} "
+        f"objects per node, over {report.nodes} nodes",
+        f"{'location':<60}{'bytes/node':>12}{'objects/node':>14}",
+    ]
+    for line in report.lines[:limit]:
+        lines.append(
+            f"{line.location:<60}{line.bytes_per_node:>12.1f}"
+            f"{line.objects_per_node:>14.2f}"
+        )
+    return "\n".join(lines)
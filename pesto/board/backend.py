@@ -0,0 +1,114 @@
+"""
+    Position backends
+
+    Each backend is a position engine able to build a position from
+    a FEN string. The positions it builds share the interface described
+    by `Position`, covering FEN I/O, legal move generation, playing and
+    reverting moves, and Zobrist hashing, so that callers such as
+    `perft` can use any of them interchangeably.
+
+    Backends are looked up by name. When no name is given the
+    `PESTO_BACKEND` environment variable is used, falling back to
+    the `Board` engine.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Callable, Optional, Protocol
+
+from pesto.board.bitboard import BitBoard
+from pesto.board.board import Board
+from pesto.board.native import NATIVE_AVAILABLE, Backend
+from pesto.board.piece import Move
+
+BACKEND_ENV_VAR: str = "PESTO_BACKEND"
+DEFAULT_BACKEND: str = "python"
+
+
+class Position(Protocol):
+    """Interface shared by the positions of every backend"""
+
+    @property
+    def backend_name(self) -> str:
+        ...
+
+    @property
+    def zobrist_key(self) -> int:
+        ...
+
+    def to_fen(self) -> str:
+        ...
+
+    def legal_moves(self) -> set[Move]:
+        ...
+
+    def count_legal_moves(self) -> int:
+        ...
+
+    def push(self, move: Move) -> None:
+        ...
+
+    def pop(self) -> Move:
+        ...
+
+
+@dataclass(frozen=True)
+class PositionBackend:
+    """A named position engine
+
+    from_fen: Builds a position of this backend from a FEN string
+    available: Whether the backend can be used on this host, i.e.
+        any compiled parts it relies on have been built
+    """
+
+    name: str
+    from_fen: Callable[[str], Position]
+    available: bool = True
+
+
+_BACKENDS: dict[str, PositionBackend] = {}
+
+
+def register_backend(backend: PositionBackend) -> None:
+    """Makes `backend` available by its name, replacing
+    any backend previously registered under it
+    """
+    _BACKENDS[backend.name] = backend
+
+
+def get_backend(name: Optional[str] = None) -> PositionBackend:
+    """Looks up the backend called `name`, or the one named by the
+    `PESTO_BACKEND` environment variable when not given
+    """
+    name = name or os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND
+    if (backend := _BACKENDS.get(name)) is None:
+        raise ValueError(
+            f"Unknown backend {name!r}, expected one of {sorted(_BACKENDS)}"
+        )
+    if not backend.available:
+        raise RuntimeError(f"Backend {name!r} is not available on this host")
+    return backend
+
+
+def available_backends() -> list[PositionBackend]:
+    """Registered backends that can be used on this host"""
+    return [backend for backend in _BACKENDS.values() if backend.available]
+
+
+def position_from_fen(fen: str, backend: Optional[str] = None) -> Position:
+    """Builds a position from a FEN string using the backend called
+    `backend`, or the default one when not given
+    """
+    return get_backend(backend).from_fen(fen)
+
+
+register_backend(PositionBackend(name=Backend.PYTHON.value, from_fen=Board.from_fen))
+register_backend(PositionBackend(name="bitboard", from_fen=BitBoard.from_fen))
+register_backend(
+    PositionBackend(
+        name=Backend.NATIVE.value,
+        from_fen=lambda fen: Board.from_fen(fen, backend=Backend.NATIVE),
+        available=NATIVE_AVAILABLE,
+    )
+)
@@ -0,0 +1,622 @@
+"""
+    Bitboard position representation
+
+    Holds a position as twelve 64-bit integers (one per color and
+    piece type) plus an occupancy integer per color, with squares
+    numbered a1=0 .. h8=63. `BitBoard` mirrors the `Board` API so
+    either can be handed to callers such as `perft`, and shares its
+    side to move, clocks and undo handling through `PositionState`.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, Optional, cast
+
+from pesto.board.magic import BB_ALL, bishop_attacks, rook_attacks
+from pesto.board.move.castle import CastleSide, CastleSquare
+from pesto.board.move.encode import (
+    CAPTURE,
+    DOUBLE_PAWN_PUSH,
+    EN_PASSANT,
+    KING_CASTLE,
+    PROMOTION,
+    QUEEN_CASTLE,
+    QUIET,
+    pack_move,
+)
+from pesto.board.piece import (
+    BaseMove,
+    Bishop,
+    CastlingMove,
+    King,
+    Knight,
+    Move,
+    Pawn,
+    Piece,
+    Queen,
+    Rook,
+    SinglePieceMove,
+)
+from pesto.board.position import PositionState
+from pesto.board.square import SQUARES_BY_INDEX, Square, square_to_index
+from pesto.board.zobrist import hash_position
+from pesto.core.enums import Color
+
+RANK_3: int = 0xFF << 16
+RANK_6: int = 0xFF << 40
+BACK_RANKS: int = 0xFF | (0xFF << 56)
+
+# Piece types in bitboard order, such that a piece's bitboard
+# lives at `color.value * 6 + PieceType.value - 1`
+PIECE_CLASSES: tuple[type[Piece], ...] = (Pawn, Knight, Bishop, Rook, Queen, King)
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+# Looked up by class, which is quicker than going through `Piece.type`
+PIECE_INDICES: dict[type[Piece], int] = {
+    piece_class: idx for idx, piece_class in enumerate(PIECE_CLASSES)
+}
+# The shared `Piece` instance of each bitboard, on each square
+PIECES_BY_INDEX: tuple[tuple[Piece, ...], ...] = tuple(
+    tuple(piece_class.new(color, square) for square in SQUARES_BY_INDEX)
+    for color in Color
+    for piece_class in PIECE_CLASSES
+)
+PROMOTION_PIECES: tuple[int, ...] = (KNIGHT, BISHOP, ROOK, QUEEN)
+FEN_LETTERS: str = "PNBRQK"
+
+
+def iter_bits(bitboard: int) -> Iterator[int]:
+    """Yields the index of each set bit, least significant first"""
+    while bitboard:
+        lsb = bitboard & -bitboard
+        yield lsb.bit_length() - 1
+        bitboard ^= lsb
+
+
+def _step_targets(idx: int, steps: tuple[tuple[int, int], ...]) -> int:
+    """Bitboard of squares one (rank, file) step away from `idx`"""
+    rank, file = divmod(idx, 8)
+    bitboard = 0
+    for rank_step, file_step in steps:
+        to_rank, to_file = rank + rank_step, file + file_step
+        if 0 <= to_rank < 8 and 0 <= to_file < 8:
+            bitboard |= 1 << (to_rank * 8 + to_file)
+    return bitboard
+
+
+KNIGHT_STEPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_STEPS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+
+KNIGHT_ATTACKS: tuple[int, ...] = tuple(
+    _step_targets(idx, KNIGHT_STEPS) for idx in range(64)
+)
+KING_ATTACKS: tuple[int, ...] = tuple(
+    _step_targets(idx, KING_STEPS) for idx in range(64)
+)
+# Indexed by the attacking pawn's color, then its square
+PAWN_ATTACKS: tuple[tuple[int, ...], ...] = (
+    tuple(_step_targets(idx, ((1, -1), (1, 1))) for idx in range(64)),
+    tuple(_step_targets(idx, ((-1, -1), (-1, 1))) for idx in range(64)),
+)
+
+
+def _between(from_idx: int, to_idx: int) -> int:
+    """Bitboard of squares strictly between two squares sharing a
+    rank, file or diagonal, or 0 if they don't share one
+    """
+    rank, file = divmod(from_idx, 8)
+    to_rank, to_file = divmod(to_idx, 8)
+    rank_dist, file_dist = to_rank - rank, to_file - file
+    if from_idx == to_idx or (
+        rank_dist and file_dist and abs(rank_dist) != abs(file_dist)
+    ):
+        return 0
+
+    rank_step = (rank_dist > 0) - (rank_dist < 0)
+    file_step = (file_dist > 0) - (file_dist < 0)
+    bitboard = 0
+    rank, file = rank + rank_step, file + file_step
+    while (rank, file) != (to_rank, to_file):
+        bitboard |= 1 << (rank * 8 + file)
+        rank, file = rank + rank_step, file + file_step
+    return bitboard
+
+
+# Indexed by two squares, see `_between`
+BETWEEN: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_between(from_idx, to_idx) for to_idx in range(64)) for from_idx in range(64)
+)
+
+
+def _castling_path(color: Color, castle_side: CastleSide) -> tuple[int, int, list[int]]:
+    """King square, bitboard of the squares that must be empty and
+    squares the king passes through (which mustn't be attacked)
+    of a castling move
+    """
+    squares = CastleSquare(color=color, castle_side=castle_side)
+    passthrough = 0
+    for square in squares.passthrough_squares:
+        passthrough |= 1 << square_to_index(square)
+    return (
+        square_to_index(squares.king_start),
+        passthrough,
+        [square_to_index(square) for square in squares.king_passthrough_squares],
+    )
+
+
+CASTLING_PATHS: dict[tuple[Color, CastleSide], tuple[int, int, list[int]]] = {
+    (color, castle_side): _castling_path(color, castle_side)
+    for color in Color
+    for castle_side in CastleSide
+}
+
+
+@dataclass(slots=True, eq=False)
+class BitBoard(PositionState):
+    # Indexed by `color.value * 6 + piece type`, see `PIECE_CLASSES`
+    bitboards: list[int]
+    # Indexed by `color.value`
+    occupancy: list[int]
+
+    def __post_init__(self) -> None:
+        if self._zobrist_key is None:
+            self._zobrist_key = hash_position(
+                piece_map=self.piece_map,
+                to_move=self.to_move,
+                castle_rights=self.castle_rights,
+                en_passant_target=self.en_passant_target,
+            )
+
+    @property
+    def backend_name(self) -> str:
+        """Name this board's backend is registered under,
+        see `pesto.board.backend`
+        """
+        return "bitboard"
+
+    @classmethod
+    def new(cls) -> BitBoard:
+        """Create a new board at the starting game position"""
+        return cls.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+
+    @classmethod
+    def from_fen(cls, fen: str) -> BitBoard:
+        """Construct a new `BitBoard` from a FEN string"""
+        pieces, state = cls._parse_fen(fen)
+
+        bitboards = [0] * 12
+        for rank_idx, rank in enumerate(reversed(pieces.split("/"))):
+            file_idx = 0
+            for char in rank:
+                if char.isdigit():
+                    file_idx += int(char)
+                    continue
+
+                color_offset = 0 if char.isupper() else 6
+                bitboards[color_offset + FEN_LETTERS.index(char.upper())] |= 1 << (
+                    rank_idx * 8 + file_idx
+                )
+                file_idx += 1
+
+        return cls(
+            bitboards=bitboards,
+            occupancy=[_union(bitboards[:6]), _union(bitboards[6:])],
+            **state,
+        )
+
+    def _pieces(self) -> object:
+        return self.bitboards
+
+    def _pieces_to_fen(self) -> str:
+        ranks: list[str] = []
+        for rank_idx in range(7, -1, -1):
+            rank_string = ""
+            empty_squares = 0
+            for file_idx in range(8):
+                piece_idx = self._piece_index_at(1 << (rank_idx * 8 + file_idx))
+                if piece_idx is None:
+                    empty_squares += 1
+                    continue
+
+                if empty_squares > 0:
+                    rank_string += str(empty_squares)
+                    empty_squares = 0
+
+                char = FEN_LETTERS[piece_idx % 6]
+                rank_string += char if piece_idx < 6 else char.lower()
+
+            if empty_squares > 0:
+                rank_string += str(empty_squares)
+            ranks.append(rank_string)
+        return "/".join(ranks)
+
+    @property
+    def piece_map(self) -> dict[Square, Piece]:
+        """The position as a `Board`-style piece map"""
+        piece_map: dict[Square, Piece] = {}
+        for piece_idx, bitboard in enumerate(self.bitboards):
+            color = Color.WHITE if piece_idx < 6 else Color.BLACK
+            for idx in iter_bits(bitboard):
+                square = SQUARES_BY_INDEX[idx]
+                piece_map[square] = PIECE_CLASSES[piece_idx % 6].new(color, square)
+        return piece_map
+
+    def apply_move(self, move: Move) -> BitBoard:
+        """Create new board state from the received move"""
+        board = BitBoard(
+            ply=self.ply,
+            halfmove_clock=self.halfmove_clock,
+            to_move=self.to_move,
+            bitboards=self.bitboards.copy(),
+            occupancy=self.occupancy.copy(),
+            castle_rights=self.castle_rights,
+            en_passant_target=self.en_passant_target,
+            _zobrist_key=self.zobrist_key,
+        )
+        # The child starts its own history, with nothing to pop
+        board._play(move)  # pylint: disable=protected-access
+        return board
+
+    def legal_moves(self) -> set[Move]:
+        """Creates a group of moves that are legal when considering the
+        full scope of the board (i.e. do not leave the king in check)
+        """
+        color = self.to_move
+        ours = PIECES_BY_INDEX[color * 6 : color * 6 + 6]
+        their_pawns = PIECES_BY_INDEX[(color ^ 1) * 6 + PAWN]
+
+        moves: set[Move] = set()
+        for from_idx, to_idx, piece, captured_idx in self._legal_targets():
+            start = ours[piece][from_idx]
+            captures: Optional[Piece] = None
+            if captured_idx != to_idx:
+                captures = their_pawns[captured_idx]
+
+            if piece == PAWN and (1 << to_idx) & BACK_RANKS:
+                for promotion in PROMOTION_PIECES:
+                    end = ours[promotion][to_idx]
+                    moves.add(SinglePieceMove(start=start, end=end))
+                continue
+
+            moves.add(
+                SinglePieceMove(start=start, end=ours[piece][to_idx], captures=captures)
+            )
+
+        for castle_side in self._castling_sides():
+            squares = CastleSquare(color=color, castle_side=castle_side)
+            moves.add(
+                CastlingMove(
+                    start=King.new(color, squares.king_start),
+                    end=King.new(color, squares.king_end),
+                    castled_rook=BaseMove(
+                        start=Rook.new(color, squares.rook_start),
+                        end=Rook.new(color, squares.rook_end),
+                    ),
+                )
+            )
+
+        return moves
+
+    def count_legal_moves(self) -> int:
+        """Counts the legal moves of the side to move without
+        creating any move objects
+        """
+        count = 0
+        for _, piece, targets in self._legal_target_sets():
+            count += targets.bit_count()
+            if piece == PAWN:
+                # Each promotion piece counts as a separate move
+                count += 3 * (targets & BACK_RANKS).bit_count()
+        count += sum(1 for _ in self._en_passant_targets())
+        return count + sum(1 for _ in self._castling_sides())
+
+    def legal_move_codes(self) -> array:
+        """Packs the legal moves of the side to move into an `array`
+        of 16-bit move codes (see `pesto.board.move.encode`), without
+        creating any move objects
+        """
+        enemy = self.occupancy[self.to_move ^ 1]
+        codes = array("H")
+        for from_idx, to_idx, piece, captured_idx in self._legal_targets():
+            flags = QUIET
+            if captured_idx != to_idx:
+                flags = EN_PASSANT
+            elif enemy & (1 << to_idx):
+                flags = CAPTURE
+            elif piece == PAWN and abs(to_idx - from_idx) == 16:
+                flags = DOUBLE_PAWN_PUSH
+
+            if piece == PAWN and (1 << to_idx) & BACK_RANKS:
+                for promotion_flag in range(4):
+                    codes.append(
+                        pack_move(from_idx, to_idx, flags | PROMOTION | promotion_flag)
+                    )
+                continue
+
+            codes.append(pack_move(from_idx, to_idx, flags))
+
+        for castle_side in self._castling_sides():
+            squares = CastleSquare(color=self.to_move, castle_side=castle_side)
+            flags = KING_CASTLE if castle_side == CastleSide.SHORT else QUEEN_CASTLE
+            codes.append(
+                pack_move(
+                    square_to_index(squares.king_start),
+                    square_to_index(squares.king_end),
+                    flags,
+                )
+            )
+
+        return codes
+
+    def _legal_targets(self) -> Iterator[tuple[int, int, int, int]]:
+        """Yields `(from, to, piece type, captured square)` for every
+        legal non-castling move of the side to move. The captured
+        square is `to` itself except for en passant.
+        """
+        for from_idx, piece, targets in self._legal_target_sets():
+            for to_idx in iter_bits(targets):
+                yield from_idx, to_idx, piece, to_idx
+        yield from self._en_passant_targets()
+
+    def _legal_target_sets(self) -> Iterator[tuple[int, int, int]]:
+        """Yields `(from, piece type, targets)` for each piece of the
+        side to move, with a bitboard of the squares it can legally
+        move to, leaving out en passant.
+
+        Checks and pins are found once for the position, as masks
+        the targets of each piece are narrowed with.
+        """
+        us = self.to_move
+        them = us ^ 1
+        ours = self.bitboards[us * 6 : us * 6 + 6]
+        own = self.occupancy[us]
+        enemy = self.occupancy[them]
+        occupied = own | enemy
+        king_idx = ours[KING].bit_length() - 1
+
+        yield king_idx, KING, self._king_targets(king_idx, own, occupied)
+
+        checkers = self._attackers(king_idx, them, occupied)
+        # Only the king can get out of double check
+        if checkers & (checkers - 1):
+            return
+
+        # Moves out of check capture the checker or block its line
+        check_mask = BB_ALL
+        if checkers:
+            check_mask = checkers | BETWEEN[king_idx][checkers.bit_length() - 1]
+        pins = self._pins(king_idx, own, occupied)
+
+        empty = ~occupied & BB_ALL
+        step, double_rank = (8, RANK_3) if us == Color.WHITE else (-8, RANK_6)
+        for from_idx in iter_bits(ours[PAWN]):
+            push = 1 << (from_idx + step) & empty
+            if push & double_rank:
+                push |= 1 << (from_idx + 2 * step) & empty
+            targets = push | PAWN_ATTACKS[us][from_idx] & enemy
+            yield from_idx, PAWN, targets & check_mask & pins.get(from_idx, BB_ALL)
+
+        for piece in (KNIGHT, BISHOP, ROOK, QUEEN):
+            for from_idx in iter_bits(ours[piece]):
+                if piece == KNIGHT:
+                    targets = KNIGHT_ATTACKS[from_idx]
+                elif piece == BISHOP:
+                    targets = bishop_attacks(from_idx, occupied)
+                elif piece == ROOK:
+                    targets = rook_attacks(from_idx, occupied)
+                else:
+                    targets = bishop_attacks(from_idx, occupied) | rook_attacks(
+                        from_idx, occupied
+                    )
+                yield from_idx, piece, targets & ~own & check_mask & pins.get(
+                    from_idx, BB_ALL
+                )
+
+    def _king_targets(self, king_idx: int, own: int, occupied: int) -> int:
+        """Bitboard of the squares the king of the side to move can
+        safely move to
+        """
+        them = self.to_move ^ 1
+        # The king is lifted off the board so that it can't step
+        # back along a line it's being attacked on
+        without_king = occupied ^ (1 << king_idx)
+        targets = 0
+        for to_idx in iter_bits(KING_ATTACKS[king_idx] & ~own):
+            to_bb = 1 << to_idx
+            if not self._is_attacked(to_idx, them, without_king | to_bb, to_bb):
+                targets |= to_bb
+        return targets
+
+    def _en_passant_targets(self) -> Iterator[tuple[int, int, int, int]]:
+        """Yields the legal en passant captures of the side to move,
+        in the form of `_legal_targets`.
+
+        En passant lifts two pawns off a line at once, which check
+        and pin masks can't describe, so the king's safety is checked
+        on the occupancy left behind instead.
+        """
+        if self.en_passant_target is None:
+            return
+
+        us = self.to_move
+        them = us ^ 1
+        occupied = self.occupancy[0] | self.occupancy[1]
+        ep_idx = square_to_index(self.en_passant_target)
+        captured_idx = ep_idx - 8 if us == Color.WHITE else ep_idx + 8
+        king_idx = self.bitboards[us * 6 + KING].bit_length() - 1
+        removed = (1 << ep_idx) | (1 << captured_idx)
+        pawns = self.bitboards[us * 6 + PAWN]
+        for from_idx in iter_bits(PAWN_ATTACKS[them][ep_idx] & pawns):
+            after = occupied ^ (1 << from_idx) ^ removed
+            if not self._is_attacked(king_idx, them, after, removed):
+                yield from_idx, ep_idx, PAWN, captured_idx
+
+    def _attackers(self, idx: int, by: int, occupied: int) -> int:
+        """Bitboard of the pieces of color `by`, besides the king,
+        attacking square `idx` given the `occupied` squares
+        """
+        bitboards = self.bitboards
+        base = by * 6
+        queens = bitboards[base + QUEEN]
+        return (
+            (PAWN_ATTACKS[by ^ 1][idx] & bitboards[base + PAWN])
+            | (KNIGHT_ATTACKS[idx] & bitboards[base + KNIGHT])
+            | (bishop_attacks(idx, occupied) & (bitboards[base + BISHOP] | queens))
+            | (rook_attacks(idx, occupied) & (bitboards[base + ROOK] | queens))
+        )
+
+    def _pins(self, king_idx: int, own: int, occupied: int) -> dict[int, int]:
+        """Squares a pinned piece of the side to move may still move
+        to, keyed by the square it's pinned on. Those are the squares
+        of the line between the king and the pinning slider, which
+        may also be captured.
+        """
+        bitboards = self.bitboards
+        base = (self.to_move ^ 1) * 6
+        queens = bitboards[base + QUEEN]
+        # Sliders that would attack the king on an otherwise empty board
+        snipers = (rook_attacks(king_idx, 0) & (bitboards[base + ROOK] | queens)) | (
+            bishop_attacks(king_idx, 0) & (bitboards[base + BISHOP] | queens)
+        )
+
+        pins: dict[int, int] = {}
+        for sniper_idx in iter_bits(snipers):
+            line = BETWEEN[king_idx][sniper_idx]
+            blockers = line & occupied
+            # A single piece of our own in the way is pinned
+            if blockers & own and not blockers & (blockers - 1):
+                pins[blockers.bit_length() - 1] = line | (1 << sniper_idx)
+        return pins
+
+    def _castling_sides(self) -> Iterator[CastleSide]:
+        """Yields the sides the side to move may legally castle to"""
+        color = self.to_move
+        them = color ^ 1
+        occupied = self.occupancy[0] | self.occupancy[1]
+
+        for castle_side in CastleSide:
+            if not self.castle_rights.has(color, castle_side):
+                continue
+
+            king_idx, passthrough, king_passthrough = CASTLING_PATHS[color, castle_side]
+            if self._is_attacked(king_idx, them, occupied):
+                return
+
+            if occupied & passthrough or any(
+                self._is_attacked(idx, them, occupied) for idx in king_passthrough
+            ):
+                continue
+
+            yield castle_side
+
+    def _is_attacked(self, idx: int, by: int, occupied: int, removed: int = 0) -> bool:
+        """Determines if square `idx` is attacked by color `by`, given
+        the `occupied` squares and ignoring any pieces of `by` on the
+        `removed` squares
+        """
+        bitboards = self.bitboards
+        base = by * 6
+        alive = ~removed
+        if PAWN_ATTACKS[by ^ 1][idx] & bitboards[base + PAWN] & alive:
+            return True
+        if KNIGHT_ATTACKS[idx] & bitboards[base + KNIGHT] & alive:
+            return True
+        if KING_ATTACKS[idx] & bitboards[base + KING]:
+            return True
+
+        queens = bitboards[base + QUEEN]
+        if bishop_attacks(idx, occupied) & (bitboards[base + BISHOP] | queens) & alive:
+            return True
+        return bool(
+            rook_attacks(idx, occupied) & (bitboards[base + ROOK] | queens) & alive
+        )
+
+    def _piece_index_at(
+        self, square_bb: int, color: Optional[int] = None
+    ) -> Optional[int]:
+        """Bitboard index of the piece on `square_bb`, only looking
+        through the bitboards of `color` when given
+        """
+        first = 0 if color is None else color * 6
+        last = 12 if color is None else first + 6
+        for piece_idx in range(first, last):
+            if self.bitboards[piece_idx] & square_bb:
+                return piece_idx
+        return None
+
+    def _toggle(self, piece: Piece) -> None:
+        """Flips the bit of `piece` on its bitboard and occupancy"""
+        square_bb = 1 << square_to_index(piece.curr)
+        self.bitboards[piece.color * 6 + PIECE_INDICES[type(piece)]] ^= square_bb
+        self.occupancy[piece.color] ^= square_bb
+
+    def _make(self, move: Move) -> Move:
+        """Plays `move` on the bitboards, returning the move as it
+        was played (i.e. with any captured piece filled in)
+        """
+        start, end = move.start, move.end
+        color = start.color
+        bitboards, occupancy = self.bitboards, self.occupancy
+        start_bb = 1 << square_to_index(start.curr)
+        start_idx = color * 6 + PIECE_INDICES[type(start)]
+        if not bitboards[start_idx] & start_bb:
+            raise ValueError(f"Could not find {start} to move")
+
+        if isinstance(move, CastlingMove):
+            for piece in (start, end, move.castled_rook.start, move.castled_rook.end):
+                self._toggle(piece)
+            return move
+
+        end_bb = 1 << square_to_index(end.curr)
+        if occupancy[color] & end_bb:
+            raise ValueError("Attempted to capture piece of same color")
+
+        captured_piece = move.captures
+        if occupancy[color ^ 1] & end_bb:
+            # The occupancy says a piece is there to be found
+            captured_idx = cast(int, self._piece_index_at(end_bb, color ^ 1))
+            captured_piece = PIECE_CLASSES[captured_idx % 6].new(
+                Color(color ^ 1), end.curr
+            )
+            bitboards[captured_idx] ^= end_bb
+            occupancy[color ^ 1] ^= end_bb
+        elif captured_piece is not None:
+            # En passant, the captured pawn being beside the end square
+            self._toggle(captured_piece)
+
+        bitboards[start_idx] ^= start_bb
+        bitboards[color * 6 + PIECE_INDICES[type(end)]] ^= end_bb
+        occupancy[color] ^= start_bb | end_bb
+
+        if captured_piece is move.captures:
+            return move
+        return SinglePieceMove(start=start, end=end, captures=captured_piece)
+
+    def _unmake(self, move: Move) -> None:
+        """Reverts a move returned by `_make`"""
+        if isinstance(move, CastlingMove):
+            for piece in (
+                move.start,
+                move.end,
+                move.castled_rook.start,
+                move.castled_rook.end,
+            ):
+                self._toggle(piece)
+            return
+
+        start, end = move.start, move.end
+        color = start.color
+        start_bb = 1 << square_to_index(start.curr)
+        end_bb = 1 << square_to_index(end.curr)
+        self.bitboards[color * 6 + PIECE_INDICES[type(start)]] ^= start_bb
+        self.bitboards[color * 6 + PIECE_INDICES[type(end)]] ^= end_bb
+        self.occupancy[color] ^= start_bb | end_bb
+        if move.captures is not None:
+            self._toggle(move.captures)
+
+
+def _union(bitboards: list[int]) -> int:
+    occupied = 0
+    for bitboard in bitboards:
+        occupied |= bitboard
+    return occupied
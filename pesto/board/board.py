@@ -1,44 +1,105 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
 from pesto.board.board_state import (
     find_en_passant_target,
     update_castle_rights,
     update_halfmove_clock,
 )
-from pesto.board.fen import (
-    dump_castling_rights_to_fen,
-    dump_en_passant_target_to_fen,
-    dump_piece_map_to_fen,
-    parse_fen_castling_rights,
-    parse_fen_en_passant_target,
-    parse_fen_piece_map,
+from pesto.board.fen import dump_piece_map_to_fen, parse_fen_piece_map
+from pesto.board.move.apply import (
+    make_move,
+    make_move_in_place,
+    unmake_move_in_place,
 )
-from pesto.board.move.apply import make_move
+from pesto.board.move.attack import attacked_squares
 from pesto.board.move.castle import CastleRights
+from pesto.board.move.encode import decode_move, encode_move
+from pesto.board.move.legal import count_legal_moves, legal_move_generator
+from pesto.board.native import Backend, native_position
 from pesto.board.piece import Bishop, King, Knight, Move, Pawn, Piece, Queen, Rook
+from pesto.board.piece_squares import PieceSquares
+from pesto.board.position import PositionState
 from pesto.board.square import Square
+from pesto.board.zobrist import hash_position, update_key
 from pesto.core.enums import Color
 
 
-@dataclass
-class Board:
-    ply: int
-    halfmove_clock: int
-    to_move: Color
+@dataclass(slots=True, eq=False)
+class Board(PositionState):
     piece_map: dict[Square, Piece]
-    castle_rights: CastleRights
-    en_passant_target: Optional[Square]
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Board):
-            return NotImplemented
-        return self.to_fen() == other.to_fen()
-
-    def __hash__(self) -> int:
-        return hash(self.to_fen())
+    # Where moves are generated, see `pesto.board.native`
+    backend: Backend = field(default=Backend.PYTHON, repr=False)
+    _native_position: Any = field(default=None, repr=False)
+    # Squares of each piece type, along with how many of the moves
+    # in `_undo_stack` they reflect. Moves are only replayed on them
+    # once moves are next generated, so that leaf nodes pushed and
+    # popped without generating moves don't pay for updating them.
+    _piece_squares: PieceSquares = field(init=False, repr=False)
+    _synced_moves: int = field(default=0, init=False, repr=False)
+    # Cached `attack_map` of the current position
+    _attack_map: Optional[set[Square]] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._piece_squares = PieceSquares.from_piece_map(self.piece_map)
+        if self.backend == Backend.NATIVE and self._native_position is None:
+            self._native_position = native_position(self.to_fen())
+        if self._zobrist_key is None:
+            self._zobrist_key = hash_position(
+                piece_map=self.piece_map,
+                to_move=self.to_move,
+                castle_rights=self.castle_rights,
+                en_passant_target=self.en_passant_target,
+            )
+
+    @property
+    def piece_squares(self) -> PieceSquares:
+        """Squares of each piece type, kept up to date as moves
+        are played
+        """
+        for undo in self._undo_stack[self._synced_moves :]:
+            self._piece_squares.play(undo.move)
+        self._synced_moves = len(self._undo_stack)
+        return self._piece_squares
+
+    @property
+    def attack_map(self) -> set[Square]:
+        """Squares attacked by the side not to move, found with the
+        king of the side to move lifted off the board so that it
+        can't step back along a line it's being attacked on.
+
+        Computed once per position when first needed, and shared
+        by king move and castling legality and `is_check`.
+        """
+        if self._attack_map is None:
+            piece_squares = self.piece_squares
+            self._attack_map = attacked_squares(
+                piece_map=self.piece_map,
+                by=Color.WHITE if self.to_move == Color.BLACK else Color.BLACK,
+                ignore=piece_squares.kings[self.to_move],
+                piece_squares=piece_squares,
+            )
+        return self._attack_map
+
+    def is_check(self) -> bool:
+        """Whether the king of the side to move is in check"""
+        return self.piece_squares.kings[self.to_move] in self.attack_map
+
+    @property
+    def backend_name(self) -> str:
+        """Name this board's backend is registered under,
+        see `pesto.board.backend`
+        """
+        return self.backend.value
+
+    @property
+    def native_position(self) -> Any:
+        """Position in the C++ core kept in step with this board,
+        or `None` unless using the native backend
+        """
+        return self._native_position
 
     @classmethod
     def new(cls) -> Board:
@@ -53,57 +114,101 @@ class Board:
         )
 
     @classmethod
-    def from_fen(cls, fen: str) -> Board:
-        """Construct a new `Board` from a FEN string"""
-        (
-            pieces,
-            color,
-            castling,
-            en_passant,
-            halfmove_clock,
-            fullmove_count,
-        ) = fen.split()
-
-        to_move = Color.WHITE if color == "w" else Color.BLACK
-        ply = (int(fullmove_count) * 2) - 1
-        if to_move == Color.BLACK:
-            ply += 1
-
-        return Board(
-            ply=ply,
-            halfmove_clock=int(halfmove_clock),
-            to_move=to_move,
-            piece_map=parse_fen_piece_map(pieces),
-            castle_rights=parse_fen_castling_rights(castling),
-            en_passant_target=parse_fen_en_passant_target(en_passant),
+    def from_fen(cls, fen: str, backend: Backend = Backend.PYTHON) -> Board:
+        """Construct a new `Board` from a FEN string
+
+        backend: Where to generate moves, `Backend.NATIVE`
+            requiring the C++ extension module to be built
+        """
+        pieces, state = cls._parse_fen(fen)
+        return Board(piece_map=parse_fen_piece_map(pieces), backend=backend, **state)
+
+    def legal_moves(self) -> set[Move]:
+        """Creates a group of moves that are legal for the side to move"""
+        if self._native_position is not None:
+            return {
+                decode_move(code, self.piece_map, fill_captures=False)
+                for code in self._native_position.legal_move_codes()
+            }
+
+        return legal_move_generator(
+            piece_map=self.piece_map,
+            to_move=self.to_move,
+            castle_rights=self.castle_rights,
+            en_passant_sq=self.en_passant_target,
+            piece_squares=self.piece_squares,
+            king_danger=self.attack_map,
         )
 
-    def to_fen(self) -> str:
-        """Dumps the current board state to a FEN string"""
-        pieces = dump_piece_map_to_fen(self.piece_map)
-        color = "w" if self.to_move == Color.WHITE else "b"
-        castling = dump_castling_rights_to_fen(self.castle_rights)
-        en_passant = dump_en_passant_target_to_fen(self.en_passant_target)
-        halfmove = str(self.halfmove_clock)
-        _fullmove_extra = 1 if self.to_move == Color.WHITE else 0
-        fullmove = str((self.ply // 2) + _fullmove_extra)
-
-        fen_components = [pieces, color, castling, en_passant, halfmove, fullmove]
-        return " ".join(fen_components)
+    def count_legal_moves(self) -> int:
+        """Counts the legal moves of the side to move without
+        creating any move objects
+        """
+        if self._native_position is not None:
+            return self._native_position.count_legal_moves()
+
+        return count_legal_moves(
+            piece_map=self.piece_map,
+            to_move=self.to_move,
+            castle_rights=self.castle_rights,
+            en_passant_sq=self.en_passant_target,
+            piece_squares=self.piece_squares,
+            king_danger=self.attack_map,
+        )
 
     def apply_move(self, move: Move) -> Board:
         """Create new board state from the received move"""
+        castle_rights = update_castle_rights(self.castle_rights, move=move)
         new_piece_map, played_move = make_move(piece_map=self.piece_map, move=move)
+        en_passant_target = find_en_passant_target(move=played_move)
 
         return Board(
             ply=self.ply + 1,
-            halfmove_clock=update_halfmove_clock(clock=self.halfmove_clock, move=move),
+            halfmove_clock=update_halfmove_clock(
+                clock=self.halfmove_clock, move=played_move
+            ),
             to_move=(Color.WHITE if self.to_move == Color.BLACK else Color.BLACK),
             piece_map=new_piece_map,
-            castle_rights=update_castle_rights(self.castle_rights, move=played_move),
-            en_passant_target=find_en_passant_target(move=played_move),
+            castle_rights=castle_rights,
+            en_passant_target=en_passant_target,
+            _zobrist_key=update_key(
+                key=self.zobrist_key,
+                move=played_move,
+                castle_rights=(self.castle_rights, castle_rights),
+                en_passant_target=(self.en_passant_target, en_passant_target),
+            ),
+            backend=self.backend,
         )
 
+    def _pieces(self) -> object:
+        return self.piece_map
+
+    def _pieces_to_fen(self) -> str:
+        return dump_piece_map_to_fen(self.piece_map)
+
+    def _make(self, move: Move) -> Move:
+        """Moves the pieces for `push`. The native backend only
+        accepts legal moves, raising a `ValueError` otherwise.
+        """
+        if self._native_position is not None:
+            self._native_position.push(encode_move(move, self.piece_map))
+
+        played_move = make_move_in_place(piece_map=self.piece_map, move=move)
+        self._attack_map = None
+        return played_move
+
+    def _unmake(self, move: Move) -> None:
+        """Moves the pieces back for `pop`, once `move`
+        is off the undo stack
+        """
+        unmake_move_in_place(piece_map=self.piece_map, move=move)
+        self._attack_map = None
+        if self._synced_moves > len(self._undo_stack):
+            self._piece_squares.revert(move)
+            self._synced_moves -= 1
+        if self._native_position is not None:
+            self._native_position.pop()
+
 
 def starting_piece_map() -> dict[Square, Piece]:
     return {
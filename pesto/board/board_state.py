@@ -1,10 +1,8 @@
-# pylint: disable=too-many-return-statements, too-many-branches
-from copy import deepcopy
 from typing import Optional
 
 from pesto.board.move.castle import CastleRights, CastleSide
-from pesto.board.piece import CastlingMove, King, Move, Pawn, Rook, SinglePieceMove
-from pesto.board.square import Square
+from pesto.board.piece import CastlingMove, Move, Pawn
+from pesto.board.square import SQUARES_BY_VALUE, Square
 from pesto.core.enums import Color
 
 
@@ -15,76 +13,35 @@ def find_en_passant_target(move: Move) -> Optional[Square]:
     if not isinstance(move.start, Pawn):
         return None
 
-    move_dist: int = abs(move.start.curr.value - move.end.curr.value)
+    move_dist: int = abs(move.start.curr - move.end.curr)
     if move_dist != 32:
         return None
 
     # Pawn moved two squares
     direction: int = 1 if move.start.color == Color.WHITE else -1
-    ep_square_idx: int = move.end.curr.value - 16 * direction
-    return Square(ep_square_idx)
+    ep_square_idx: int = move.end.curr - 16 * direction
+    return SQUARES_BY_VALUE[ep_square_idx]
 
 
 def update_castle_rights(castle_rights: CastleRights, move: Move) -> CastleRights:
-    """Returns a new CastlingRights object based upon
-    the provided move
-    """
-    short_rook_sq = {Square.H1, Square.H8}
-    long_rook_sq = {Square.A1, Square.A8}
-    side: CastleSide
-
-    castle_rights_ = deepcopy(castle_rights)
-
-    if isinstance(move, SinglePieceMove):
-        if isinstance(move.captures, Rook) and move.captures.curr in (
-            short_rook_sq | long_rook_sq
-        ):
-            if move.captures.curr in long_rook_sq:
-                side = CastleSide.LONG
-            else:
-                side = CastleSide.SHORT
-            castle_rights_.set_false(color=move.captures.color, castle_side=side)
-            return castle_rights_
-
-        if not isinstance(move.start, (Rook, King)):
-            return castle_rights_
-
-        if isinstance(move.start, King):
-            castle_rights_.set_false(
-                color=move.start.color, castle_side=CastleSide.SHORT
-            )
-            castle_rights_.set_false(
-                color=move.start.color, castle_side=CastleSide.LONG
-            )
-            return castle_rights_
-
-        if isinstance(move.start, Rook):
-            if move.start.curr not in (short_rook_sq | long_rook_sq):
-                return castle_rights_
-
-            if move.start.curr in long_rook_sq:
-                side = CastleSide.LONG
-            else:
-                side = CastleSide.SHORT
-
-            castle_rights_.set_false(color=move.start.color, castle_side=side)
-            return castle_rights_
+    """Returns the castling rights left after `move`.
 
+    Rights are tied to the starting squares of the king and rooks,
+    so any move leaving or landing on one of them (a capture of the
+    rook included) clears the rights it holds. Castling without
+    the right to raises a `ValueError`.
+    """
     if isinstance(move, CastlingMove):
-        if move.castled_rook.start.curr in long_rook_sq:
-            side = CastleSide.LONG
-        else:
-            side = CastleSide.SHORT
-
+        side = (
+            CastleSide.LONG
+            if move.castled_rook.start.curr in (Square.A1, Square.A8)
+            else CastleSide.SHORT
+        )
         castling_color = move.start.color
-        if not castle_rights_(castling_color)[side]:
+        if not castle_rights.has(castling_color, side):
             raise ValueError(f"{castling_color} has no rights to castle {side.value}")
 
-        castle_rights_.set_false(castling_color, CastleSide.SHORT)
-        castle_rights_.set_false(castling_color, CastleSide.LONG)
-        return castle_rights_
-
-    return castle_rights_
+    return castle_rights.update(move.start.curr, move.end.curr)
 
 
 def update_halfmove_clock(clock: int, move: Move) -> int:
@@ -1,29 +1,33 @@
 from typing import Optional
 
-from pesto.board.move.castle import CastleRights, CastleSide
+from pesto.board.move.castle import (
+    BLACK_LONG,
+    BLACK_SHORT,
+    WHITE_LONG,
+    WHITE_SHORT,
+    CastleRights,
+)
 from pesto.board.piece import Bishop, King, Knight, Pawn, Piece, Queen, Rook
-from pesto.board.square import Square, str_to_square
+from pesto.board.square import SQUARES_BY_VALUE, Square, str_to_square
 from pesto.core.enums import Color
 
+# FEN castling field of each combination of `CastleRights.bits`
+CASTLING_FEN: tuple[str, ...] = tuple(
+    "".join(
+        char
+        for char, bit in zip("KQkq", (WHITE_SHORT, WHITE_LONG, BLACK_SHORT, BLACK_LONG))
+        if bits & bit
+    )
+    or "-"
+    for bits in range(16)
+)
+
 
 def dump_castling_rights_to_fen(castle_rights: CastleRights) -> str:
     """Converts a `CastleRights` object to it's portion
     of a FEN string
     """
-    castle_string = ""
-    if castle_rights(Color.WHITE)[CastleSide.SHORT]:
-        castle_string += "K"
-    if castle_rights(Color.WHITE)[CastleSide.LONG]:
-        castle_string += "Q"
-    if castle_rights(Color.BLACK)[CastleSide.SHORT]:
-        castle_string += "k"
-    if castle_rights(Color.BLACK)[CastleSide.LONG]:
-        castle_string += "q"
-
-    if castle_string == "":
-        return "-"
-
-    return castle_string
+    return CASTLING_FEN[castle_rights.bits]
 
 
 def dump_en_passant_target_to_fen(square: Optional[Square]) -> str:
@@ -55,7 +59,7 @@ def dump_piece_map_to_fen(piece_map: dict[Square, Piece]) -> str:
         empty_squares = 0
 
         for file_idx in range(0, 8):
-            piece = piece_map.get(Square((rank_idx * 16) + file_idx))
+            piece = piece_map.get(SQUARES_BY_VALUE[(rank_idx * 16) + file_idx])
 
             if piece is None:
                 empty_squares += 1
@@ -111,7 +115,7 @@ def parse_fen_piece_map(string: str) -> dict[Square, Piece]:
                 continue
 
             color = Color.WHITE if piece.isupper() else Color.BLACK
-            square = Square((rank_idx * 16) + file_idx)
+            square = SQUARES_BY_VALUE[(rank_idx * 16) + file_idx]
             piece_map[square] = letter_map[piece.upper()].new(
                 color=color,
                 curr=square,
@@ -135,23 +139,17 @@ def parse_fen_castling_rights(string: str) -> CastleRights:
     """Maps the castling string segment of a FEN string into
     a `CastleRights` object
     """
-    castle_rights = CastleRights(
-        _rights={
-            Color.WHITE: {CastleSide.SHORT: False, CastleSide.LONG: False},
-            Color.BLACK: {CastleSide.SHORT: False, CastleSide.LONG: False},
-        }
-    )
     if string == "-":
-        return castle_rights
+        return CastleRights.none()
 
-    char_map: dict[str, tuple[Color, CastleSide]] = {
-        "K": (Color.WHITE, CastleSide.SHORT),
-        "Q": (Color.WHITE, CastleSide.LONG),
-        "k": (Color.BLACK, CastleSide.SHORT),
-        "q": (Color.BLACK, CastleSide.LONG),
+    char_map: dict[str, int] = {
+        "K": WHITE_SHORT,
+        "Q": WHITE_LONG,
+        "k": BLACK_SHORT,
+        "q": BLACK_LONG,
     }
+    bits = 0
     for char in string:
-        color, castle_side = char_map[char]
-        castle_rights.set_true(color, castle_side)
+        bits |= char_map[char]
 
-    return castle_rights
+    return CastleRights(bits)
@@ -0,0 +1,161 @@
+"""
+    Opt-in instrumentation of move generation
+
+    Counts calls to, and accumulates time spent in, the hot functions
+    of `pesto.board.move` and `pesto.board.perft`. Nothing is measured
+    until `enable` is called, which swaps each of those functions for a
+    timing wrapper wherever it has been imported; `disable` puts the
+    originals back. While disabled the code runs exactly as written,
+    so instrumentation costs nothing.
+
+        with instrumented() as stats:
+            perft(board=Board.new(), depth=3)
+        print(format_stats(stats))
+
+    Time is inclusive of anything called from within a function, and a
+    recursive function is only timed at its outermost call. Only modules
+    imported before `enable` is called see the wrappers.
+"""
+import functools
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+# Functions to instrument, by the module defining them
+INSTRUMENTED_FUNCTIONS: tuple[tuple[str, str], ...] = (
+    ("pesto.board.move.legal", "legal_move_generator"),
+    ("pesto.board.move.legal", "count_legal_moves"),
+    ("pesto.board.move.legal", "find_legality_masks"),
+    ("pesto.board.move.attack", "square_is_attacked"),
+    ("pesto.board.move.attack", "attacked_squares"),
+    ("pesto.board.move.castle", "generate_castling_moves"),
+    ("pesto.board.move.castle", "legal_castle_sides"),
+    ("pesto.board.move.apply", "make_move"),
+    ("pesto.board.move.apply", "unmake_move"),
+    ("pesto.board.move.apply", "make_move_in_place"),
+    ("pesto.board.move.apply", "unmake_move_in_place"),
+    ("pesto.board.perft", "get_node_count"),
+    ("pesto.board.perft", "get_hashed_node_count"),
+)
+# Methods to instrument, by the module and class defining them
+INSTRUMENTED_METHODS: tuple[tuple[str, str, str], ...] = (
+    ("pesto.board.piece", "Pawn", "generate_psuedo_legal_moves"),
+    ("pesto.board.piece", "NonPawnPiece", "generate_psuedo_legal_moves"),
+    ("pesto.board.position", "PositionState", "push"),
+    ("pesto.board.position", "PositionState", "pop"),
+)
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+    # Set while a call is running, so recursion is only timed once
+    running: bool = field(default=False, repr=False)
+
+
+# Stats of each instrumented function, by qualified name
+STATS: dict[str, StageStats] = {}
+# Everything replaced by `enable`, as (owner, attribute, original)
+_patched: list[tuple[Any, str, Callable]] = []
+
+
+def _wrap(func: Callable, stats: StageStats) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        stats.calls += 1
+        if stats.running:
+            return func(*args, **kwargs)
+
+        stats.running = True
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.running = False
+
+    return wrapper
+
+
+def is_enabled() -> bool:
+    return bool(_patched)
+
+
+def enable() -> None:
+    """Starts counting calls to the instrumented functions"""
+    if is_enabled():
+        return
+
+    for module_name, name in INSTRUMENTED_FUNCTIONS:
+        original = getattr(importlib.import_module(module_name), name)
+        stats = STATS.setdefault(f"{module_name}.{name}", StageStats())
+        wrapper = _wrap(original, stats)
+
+        # Replace every reference held by a module-level import
+        for module in list(sys.modules.values()):
+            if not getattr(module, "__name__", "").startswith("pesto."):
+                continue
+            for attribute, value in list(vars(module).items()):
+                if value is original:
+                    _patched.append((module, attribute, original))
+                    setattr(module, attribute, wrapper)
+
+    for module_name, class_name, name in INSTRUMENTED_METHODS:
+        owner = getattr(importlib.import_module(module_name), class_name)
+        original = vars(owner)[name]
+        stats = STATS.setdefault(f"{class_name}.{name}", StageStats())
+        _patched.append((owner, name, original))
+        setattr(owner, name, _wrap(original, stats))
+
+
+def disable() -> None:
+    """Restores the original functions, keeping the stats collected"""
+    while _patched:
+        owner, attribute, original = _patched.pop()
+        setattr(owner, attribute, original)
+
+
+def reset() -> None:
+    """Clears the stats collected so far"""
+    for stats in STATS.values():
+        stats.calls = 0
+        stats.seconds = 0.0
+
+
+def get_stats() -> dict[str, dict[str, float]]:
+    """Stats of each function called at least once,
+    as JSON-serializable data
+    """
+    return {
+        name: {"calls": stats.calls, "seconds": stats.seconds}
+        for name, stats in STATS.items()
+        if stats.calls
+    }
+
+
+@contextmanager
+def instrumented() -> Iterator[dict[str, StageStats]]:
+    """Collects fresh stats for the duration of the block,
+    yielding the live stats
+    """
+    reset()
+    enable()
+    try:
+        yield STATS
+    finally:
+        disable()
+
+
+def format_stats(stats: dict[str, StageStats]) -> str:
+    """Renders stats as a plain text table, slowest first"""
+    lines = [f"{'function':<58}{'calls':>10}{'seconds':>10}"]
+    for name, stage in sorted(
+        stats.items(), key=lambda item: item[1].seconds, reverse=True
+    ):
+        if stage.calls:
+            lines.append(f"{name:<58}{stage.calls:>10}{stage.seconds:>10.3f}")
+    return "\n".join(lines)
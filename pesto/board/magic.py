@@ -0,0 +1,371 @@
+"""
+    Magic bitboard slider attacks
+
+    The squares a bishop or rook attacks depend only on which of the
+    squares along its lines are occupied, ignoring the edge squares
+    that end each line. Multiplying those relevant occupied squares
+    by a "magic" number gathers them into the top bits of the
+    product, which then index a table of precomputed attacks for
+    the square. Magics are only accepted when every occupancy they
+    map to the same index has the same attacks.
+
+    Each square has a table just large enough for its relevant
+    squares, as the C++ core does too. Both use the magics below,
+    found once with `find_magics` and written out for the C++ core
+    with `python -m pesto.board.magic src/magics.h`.
+"""
+import sys
+from functools import partial
+from typing import Callable, Iterator, Optional
+
+BB_ALL: int = (1 << 64) - 1
+
+DIAG_STEPS: tuple[tuple[int, int], ...] = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+ORTH_STEPS: tuple[tuple[int, int], ...] = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+# Seed of the random numbers tried as magics by `find_magics`
+MAGIC_SEED: int = 0x9E3779B97F4A7C15
+
+# Indexed by square, a1=0 .. h8=63
+BISHOP_MAGICS: tuple[int, ...] = (
+    0x0008010804840080,
+    0x0410020208420000,
+    0x0010413A00200119,
+    0x8008086109200404,
+    0x0001104042188410,
+    0x0882021004481000,
+    0x4C14010806100000,
+    0x020022840C200600,
+    0x0840A11610020084,
+    0x0044140408821200,
+    0x400051080081005A,
+    0x1000440401880021,
+    0x1800540C20000000,
+    0x40400A0804A51209,
+    0x405024138808C800,
+    0x04000205440C4460,
+    0x80C8022008100180,
+    0x0220000801144082,
+    0x0142000C08011900,
+    0x2804028801401200,
+    0x04840082020A0104,
+    0x0061008030021004,
+    0x484C018100880400,
+    0x0000418904008400,
+    0x08A0060610104208,
+    0x0202020020082261,
+    0x9000A40086040400,
+    0x01400401004300A0,
+    0x0000848004002010,
+    0x100100C042082010,
+    0x40C404002B420201,
+    0xA0024640110C0210,
+    0x01824841010C9040,
+    0x0000901002288200,
+    0x2400110481D00400,
+    0x0500404800A28200,
+    0x0004010010640040,
+    0x81600401000C9041,
+    0x0082008100020800,
+    0x0041010200002200,
+    0x8085012060001001,
+    0x0001080134083000,
+    0x8082104038011000,
+    0x2000482011010800,
+    0x00400805004C0400,
+    0x000510100080A442,
+    0x80080240C2054400,
+    0xA144040042401210,
+    0x01140404540C480B,
+    0x000201A208220006,
+    0x10C0128400A20840,
+    0x1000220020884001,
+    0x821200208C340000,
+    0x0080302001070000,
+    0x0020083001044008,
+    0x00200400C2094300,
+    0x4017160201200809,
+    0x0000202501101004,
+    0x000080002C841009,
+    0x62020C0212840440,
+    0x4000210070020203,
+    0x0008405060A19100,
+    0x0414200A44011C00,
+    0x0086020808010044,
+)
+ROOK_MAGICS: tuple[int, ...] = (
+    0x9080001184204004,
+    0x00C01008A0004000,
+    0x0500081100C12000,
+    0x4700090084203000,
+    0x9200060068210410,
+    0x0080020014000980,
+    0x00801A0001005080,
+    0x0900018021450002,
+    0x3000800220400480,
+    0x2000400042201000,
+    0x2201001020010940,
+    0x8000801000800800,
+    0x09010008020C1100,
+    0x0602001012000884,
+    0x0441002402000100,
+    0x0140800244802100,
+    0x9220608000C00090,
+    0x0090054000C82000,
+    0x0001010010406001,
+    0x4801848018003000,
+    0x0404050010080100,
+    0x0001010006040008,
+    0x0900040048900621,
+    0x000102000A81004C,
+    0x1C0440008004208C,
+    0x1020100340042040,
+    0x8D02002200348040,
+    0x0000080080100080,
+    0x1084240080080280,
+    0x14890C0080020080,
+    0x0081284400223001,
+    0x0100884600108114,
+    0x0002400020800880,
+    0x0002814000802000,
+    0x0020806000801004,
+    0x800A002112004008,
+    0x02C2800400800803,
+    0x0040800400800200,
+    0x08408A2804000110,
+    0x040280C582000104,
+    0x0080044460044004,
+    0x0020400285030025,
+    0x8009001020010040,
+    0x0001004810010020,
+    0x0201002800110004,
+    0x2002008084008002,
+    0x0813000600110004,
+    0x0801000040810002,
+    0xA001014024800500,
+    0x02C0A08240090100,
+    0x0C0A20001106C100,
+    0x00A8000880100480,
+    0x200908020C008080,
+    0x020200504804C200,
+    0x01010042000C1100,
+    0x000580010000D080,
+    0x0400209201048042,
+    0x4A01015080400721,
+    0x0702091020010045,
+    0x0888100100082045,
+    0x0013001004080023,
+    0xC022000425081002,
+    0xC201000200008401,
+    0xC0000510E4440082,
+)
+
+
+def _ray(idx: int, step: tuple[int, int]) -> int:
+    """Bitboard of squares sliding from `idx` along `step`,
+    excluding `idx` itself
+    """
+    rank, file = divmod(idx, 8)
+    bitboard = 0
+    while True:
+        rank, file = rank + step[0], file + step[1]
+        if not (0 <= rank < 8 and 0 <= file < 8):
+            return bitboard
+        bitboard |= 1 << (rank * 8 + file)
+
+
+# Rays whose squares increase in index scan for their first blocker
+# from the least significant bit, the rest from the most significant
+_POSITIVE_DIAG_RAYS = tuple(
+    tuple(_ray(idx, step) for idx in range(64)) for step in DIAG_STEPS[:2]
+)
+_NEGATIVE_DIAG_RAYS = tuple(
+    tuple(_ray(idx, step) for idx in range(64)) for step in DIAG_STEPS[2:]
+)
+_POSITIVE_ORTH_RAYS = tuple(
+    tuple(_ray(idx, step) for idx in range(64)) for step in ORTH_STEPS[:2]
+)
+_NEGATIVE_ORTH_RAYS = tuple(
+    tuple(_ray(idx, step) for idx in range(64)) for step in ORTH_STEPS[2:]
+)
+
+
+def _slider_attacks(
+    idx: int,
+    occupied: int,
+    positive_rays: tuple[tuple[int, ...], ...],
+    negative_rays: tuple[tuple[int, ...], ...],
+) -> int:
+    attacks = 0
+    for rays in positive_rays:
+        ray = rays[idx]
+        if blockers := ray & occupied:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in negative_rays:
+        ray = rays[idx]
+        if blockers := ray & occupied:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def bishop_ray_attacks(idx: int, occupied: int) -> int:
+    """Squares a bishop on `idx` attacks, found by scanning each
+    diagonal for its first occupied square
+    """
+    return _slider_attacks(idx, occupied, _POSITIVE_DIAG_RAYS, _NEGATIVE_DIAG_RAYS)
+
+
+def rook_ray_attacks(idx: int, occupied: int) -> int:
+    """Squares a rook on `idx` attacks, found by scanning each
+    rank and file for its first occupied square
+    """
+    return _slider_attacks(idx, occupied, _POSITIVE_ORTH_RAYS, _NEGATIVE_ORTH_RAYS)
+
+
+def relevant_mask(idx: int, steps: tuple[tuple[int, int], ...]) -> int:
+    """Squares along the lines from `idx` whose occupancy can change
+    its attacks. The last square of each line is attacked whether or
+    not it's occupied, so is left out.
+    """
+    mask = 0
+    for step in steps:
+        ray = _ray(idx, step)
+        # Drop the square furthest from `idx`, at the board's edge
+        if ray:
+            edge = (
+                ray.bit_length() - 1 if step > (0, 0) else (ray & -ray).bit_length() - 1
+            )
+            ray ^= 1 << edge
+        mask |= ray
+    return mask
+
+
+def iter_subsets(mask: int) -> Iterator[int]:
+    """Yields every subset of the bits of `mask`, starting with none"""
+    subset = 0
+    while True:
+        yield subset
+        subset = (subset - mask) & mask
+        if not subset:
+            return
+
+
+def _attack_table(
+    mask: int,
+    magic: int,
+    attacks: Callable[[int], int],
+) -> Optional[list[int]]:
+    """Table of the attacks for each occupancy of `mask`, indexed by
+    `magic`, or `None` if two occupancies with different attacks
+    collide
+    """
+    shift = 64 - mask.bit_count()
+    table: list[Optional[int]] = [None] * (1 << mask.bit_count())
+    for occupied in iter_subsets(mask):
+        index = ((occupied * magic) & BB_ALL) >> shift
+        found = attacks(occupied)
+        if table[index] is None:
+            table[index] = found
+        elif table[index] != found:
+            return None
+    # Indices no occupancy maps to are never looked up
+    return [0 if entry is None else entry for entry in table]
+
+
+def _random_numbers(seed: int) -> Iterator[int]:
+    """64-bit xorshift generator, so that a search is repeatable"""
+    state = seed
+    while True:
+        state ^= (state << 13) & BB_ALL
+        state ^= state >> 7
+        state ^= (state << 17) & BB_ALL
+        yield state
+
+
+def find_magics(
+    steps: tuple[tuple[int, int], ...],
+    attacks: Callable[[int, int], int],
+    seed: int = MAGIC_SEED,
+) -> tuple[int, ...]:
+    """Searches for a magic for each square, trying random numbers
+    with few bits set until one indexes its square's table without
+    any harmful collisions
+    """
+    numbers = _random_numbers(seed)
+    magics: list[int] = []
+    for idx in range(64):
+        mask = relevant_mask(idx, steps)
+        while True:
+            magic = next(numbers) & next(numbers) & next(numbers)
+            # Magics spreading too few bits into the top byte rarely work
+            if ((mask * magic) & BB_ALL) >> 56 == 0:
+                continue
+            if _attack_table(mask, magic, partial(attacks, idx)):
+                magics.append(magic)
+                break
+    return tuple(magics)
+
+
+def _build_magic_entries(
+    steps: tuple[tuple[int, int], ...],
+    magics: tuple[int, ...],
+    attacks: Callable[[int, int], int],
+) -> tuple[tuple[int, int, int, list[int]], ...]:
+    """Relevant mask, magic, shift and attack table of each square"""
+    entries = []
+    for idx, magic in enumerate(magics):
+        mask = relevant_mask(idx, steps)
+        table = _attack_table(mask, magic, partial(attacks, idx))
+        if table is None:
+            raise ValueError(f"Magic {magic:#x} doesn't index square {idx}")
+        entries.append((mask, magic, 64 - mask.bit_count(), table))
+    return tuple(entries)
+
+
+_BISHOP_ENTRIES = _build_magic_entries(DIAG_STEPS, BISHOP_MAGICS, bishop_ray_attacks)
+_ROOK_ENTRIES = _build_magic_entries(ORTH_STEPS, ROOK_MAGICS, rook_ray_attacks)
+
+
+def bishop_attacks(idx: int, occupied: int) -> int:
+    """Squares a bishop on `idx` attacks, stopping at the
+    first occupied square along each diagonal
+    """
+    mask, magic, shift, table = _BISHOP_ENTRIES[idx]
+    return table[((occupied & mask) * magic & BB_ALL) >> shift]
+
+
+def rook_attacks(idx: int, occupied: int) -> int:
+    """Squares a rook on `idx` attacks, stopping at the
+    first occupied square along each rank and file
+    """
+    mask, magic, shift, table = _ROOK_ENTRIES[idx]
+    return table[((occupied & mask) * magic & BB_ALL) >> shift]
+
+
+def render_header() -> str:
+    """C++ header declaring the magics, for the native core"""
+    lines = [
+        "// Generated by `python -m pesto.board.magic src/magics.h`, do not edit",
+        "#ifndef _MAGICS_H_",
+        "#define _MAGICS_H_",
+        "",
+        '#include "types.h"',
+    ]
+    for name, magics in (
+        ("BISHOP_MAGICS", BISHOP_MAGICS),
+        ("ROOK_MAGICS", ROOK_MAGICS),
+    ):
+        lines += ["", f"constexpr U64 {name}[64] = {{"]
+        for start in range(0, 64, 4):
+            row = ", ".join(f"0x{magic:016X}ULL" for magic in magics[start : start + 4])
+            lines.append(f"  {row},")
+        lines.append("};")
+    lines += ["", "#endif  // _MAGICS_H_", ""]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    with open(sys.argv[1], "w", encoding="utf-8") as header:
+        header.write(render_header())
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from typing import Optional
 
 from pesto.board.piece import CastlingMove, Move, Piece, SinglePieceMove
@@ -11,9 +10,35 @@ def make_move(
     """Creates and returns a new `piece_map` based on the
     given `move` to be played.
     """
-    _piece_map: dict[Square, Piece] = deepcopy(piece_map)
+    # Pieces are immutable, so a shallow copy of the map is
+    # enough to leave the original untouched
+    _piece_map: dict[Square, Piece] = piece_map.copy()
+    _move = make_move_in_place(piece_map=_piece_map, move=move)
+    return _piece_map, _move
+
+
+def unmake_move(piece_map: dict[Square, Piece], move: Move) -> dict[Square, Piece]:
+    """Creates and returns a new `piece_map` based on
+    reverting the provided `move`.
+
+    Considers reverting both the "main" piece (i.e. the piece
+    described in `move.start`) the the "captured" piece (i.e.
+    the piece described in `move.captures`)
+    """
+    _piece_map: dict[Square, Piece] = piece_map.copy()
+    unmake_move_in_place(piece_map=_piece_map, move=move)
+    return _piece_map
+
+
+def make_move_in_place(piece_map: dict[Square, Piece], move: Move) -> Move:
+    """Plays `move` directly on `piece_map`.
 
-    if (start_piece := _piece_map.pop(move.start.curr, None)) is None:
+    Returns the move as it was played (i.e. with any captured
+    piece filled in), which is all that `unmake_move_in_place`
+    needs to revert it. `piece_map` is left untouched if the
+    move can't be played.
+    """
+    if (start_piece := piece_map.get(move.start.curr)) is None:
         raise ValueError(f"Could not find piece on {move.start.curr} to move")
 
     if start_piece != move.start:
@@ -21,34 +46,37 @@ def make_move(
             "Discrepancy between provided piece and what was found on that square"
         )
 
-    _move: Move
     if isinstance(move, SinglePieceMove):
-        captured_piece: Optional[Piece] = None
-
         # Check for captures found from looking on the board
-        if (observed_capture := _piece_map.pop(move.end.curr, None)) is not None:
-            if observed_capture.color == move.end.color:
+        if (captured_piece := piece_map.get(move.end.curr)) is not None:
+            if captured_piece.color == move.end.color:
                 raise ValueError("Attempted to capture piece of same color")
-            captured_piece = observed_capture
 
         # Check for captures from provided `move` object
         if (provided_capture := move.captures) is not None:
             if provided_capture.color == move.end.color:
                 raise ValueError("Attempted to capture piece of same color")
 
-            if _piece_map.pop(provided_capture.curr, None) is None:
+            if (
+                provided_capture.curr == move.end.curr
+                or provided_capture.curr not in piece_map
+            ):
                 raise ValueError(
                     f"Provided capture, {provided_capture} is not found on the board"
                 )
+            del piece_map[provided_capture.curr]
             captured_piece = provided_capture
 
-        _move = SinglePieceMove(start=move.start, end=move.end, captures=captured_piece)
-
         # Update piece map to reflect having moved the piece
-        _piece_map[_move.end.curr] = _move.end
+        del piece_map[move.start.curr]
+        piece_map[move.end.curr] = move.end
 
-    elif isinstance(move, CastlingMove):
-        if (rook_to_move := _piece_map.pop(move.castled_rook.start.curr, None)) is None:
+        if captured_piece is move.captures:
+            return move
+        return SinglePieceMove(start=move.start, end=move.end, captures=captured_piece)
+
+    if isinstance(move, CastlingMove):
+        if (rook_to_move := piece_map.get(move.castled_rook.start.curr)) is None:
             raise ValueError(
                 f"Could not find rook on {move.castled_rook.start.curr} to move"
             )
@@ -58,52 +86,45 @@ def make_move(
                 "Discrepancy between rook to move and what was found on that square"
             )
 
-        _piece_map[move.end.curr] = move.end
-        _piece_map[move.castled_rook.end.curr] = move.castled_rook.end
-        _move = deepcopy(move)
+        del piece_map[move.start.curr]
+        del piece_map[move.castled_rook.start.curr]
+        piece_map[move.end.curr] = move.end
+        piece_map[move.castled_rook.end.curr] = move.castled_rook.end
+        return move
 
-    else:
-        raise TypeError(f"Unknown move type provided: {type(move)}")
+    raise TypeError(f"Unknown move type provided: {type(move)}")
 
-    return _piece_map, _move
 
+def unmake_move_in_place(piece_map: dict[Square, Piece], move: Move) -> None:
+    """Reverts `move` directly on `piece_map`.
 
-def unmake_move(piece_map: dict[Square, Piece], move: Move) -> dict[Square, Piece]:
-    """Creates and returns a new `piece_map` based on
-    reverting the provided `move`.
-
-    Considers reverting both the "main" piece (i.e. the piece
-    described in `move.start`) the the "captured" piece (i.e.
-    the piece described in `move.captures`)
+    `move` must be the move as returned by `make_move_in_place`,
+    so that any captured piece is known and can be put back.
     """
-    _piece_map = deepcopy(piece_map)
-    _move = deepcopy(move)
-
-    if _piece_map.get(_move.start.curr) is not None:
+    if piece_map.get(move.start.curr) is not None:
         raise ValueError("Could not revert move, as existing piece was found on square")
 
-    if _piece_map.get(_move.end.curr) != move.end:
+    if piece_map.get(move.end.curr) != move.end:
         raise ValueError(
             "Could not revert move, as the main piece was not found on the end square"
         )
 
     # Clear the square where the main piece landed
-    _piece_map.pop(_move.end.curr, None)
+    del piece_map[move.end.curr]
 
-    if isinstance(_move, SinglePieceMove):
-        if _move.captures is not None:
+    if isinstance(move, SinglePieceMove):
+        captured_piece: Optional[Piece] = move.captures
+        if captured_piece is not None:
             # Add captured piece back to it's original location
-            _piece_map[_move.captures.curr] = _move.captures
+            piece_map[captured_piece.curr] = captured_piece
 
-    elif isinstance(_move, CastlingMove):
+    elif isinstance(move, CastlingMove):
         # Reset the rook to it's original location
-        _piece_map.pop(_move.castled_rook.end.curr)
-        _piece_map[_move.castled_rook.start.curr] = _move.castled_rook.start
+        del piece_map[move.castled_rook.end.curr]
+        piece_map[move.castled_rook.start.curr] = move.castled_rook.start
 
     else:
-        raise TypeError(f"Unknown move type provided: {type(_move)}")
+        raise TypeError(f"Unknown move type provided: {type(move)}")
 
     # Update piece map to put the original piece back in it's starting place
-    _piece_map[_move.start.curr] = _move.start
-
-    return _piece_map
+    piece_map[move.start.curr] = move.start
@@ -1,37 +1,243 @@
-from typing import Optional
+# pylint: disable=too-many-branches
+from typing import Iterator, Optional
 
-from pesto.board.piece import Piece
-from pesto.board.square import Square
+from pesto.board.piece import (
+    DIAG_DIRECTIONS,
+    DIAG_RAYS,
+    KING_TABLE,
+    KNIGHT_OFFSETS,
+    KNIGHT_TABLE,
+    PAWN_ATTACKER_TABLE,
+    QUEEN_RAYS,
+    VERT_HORIZ_DIRECTIONS,
+    VERT_HORIZ_RAYS,
+    Bishop,
+    King,
+    Knight,
+    Pawn,
+    Piece,
+    Queen,
+    Rook,
+)
+from pesto.board.piece_squares import PIECE_TYPES, PieceSquares
+from pesto.board.square import SQUARES_BY_VALUE, Square
 from pesto.core.enums import Color
 
+# Bits of the kinds of piece that can attack along a square
+# difference, in `ATTACK_MASKS`. Pawns attack in one direction
+# only, so each color has its own bit.
+ATTACKER_BITS: dict[tuple[type[Piece], Color], int] = {
+    **{(Pawn, Color.WHITE): 1, (Pawn, Color.BLACK): 2},
+    **{
+        (piece_type, color): 4 << shift
+        for shift, piece_type in enumerate(PIECE_TYPES[1:])
+        for color in Color
+    },
+}
+SLIDER_BITS: int = (
+    ATTACKER_BITS[Bishop, Color.WHITE]
+    | ATTACKER_BITS[Rook, Color.WHITE]
+    | ATTACKER_BITS[Queen, Color.WHITE]
+)
+
+# The difference between two 0x88 squares, `target - attacker`, is
+# unique to the line between them whatever the squares themselves
+# are. Both tables are indexed by that difference plus this offset,
+# to cover differences from -119 to 119.
+ATTACK_DELTA_OFFSET: int = 119
+
+
+def _build_attack_tables() -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Works out the `ATTACK_MASKS` and `ATTACK_STEPS` tables"""
+    masks = [0] * 240
+    steps = [0] * 240
+
+    def add(piece_type: type[Piece], direction: int, distance: int) -> None:
+        idx = direction * distance + ATTACK_DELTA_OFFSET
+        for color in Color:
+            masks[idx] |= ATTACKER_BITS[piece_type, color]
+        steps[idx] = direction
+
+    for offset in KNIGHT_OFFSETS:
+        add(Knight, offset, 1)
+    for direction in DIAG_DIRECTIONS + VERT_HORIZ_DIRECTIONS:
+        add(King, direction, 1)
+        for distance in range(1, 8):
+            add(Queen, direction, distance)
+            add(Bishop if direction in DIAG_DIRECTIONS else Rook, direction, distance)
+
+    # Pawns capture one square diagonally forward
+    for color, forward in ((Color.WHITE, 16), (Color.BLACK, -16)):
+        for direction in (forward - 1, forward + 1):
+            masks[direction + ATTACK_DELTA_OFFSET] |= ATTACKER_BITS[Pawn, color]
+    return tuple(masks), tuple(steps)
+
+
+# Which kinds of piece could attack along each square difference
+# on an empty board, and for sliders the step to walk the line from
+# the attacker towards the target
+ATTACK_MASKS, ATTACK_STEPS = _build_attack_tables()
+
+
+def piece_attacks(piece_map: dict[Square, Piece], piece: Piece, target: Square) -> bool:
+    """Determines if `piece` attacks `target`. Most pairs are ruled
+    out by their square difference alone, leaving only the squares
+    between a slider and its target to check.
+    """
+    delta = target - piece.curr + ATTACK_DELTA_OFFSET
+    bit = ATTACKER_BITS[type(piece), piece.color]
+    if not ATTACK_MASKS[delta] & bit:
+        return False
+    if not bit & SLIDER_BITS:
+        return True
+
+    step = ATTACK_STEPS[delta]
+    idx = piece.curr + step
+    while idx != target:
+        if SQUARES_BY_VALUE[idx] in piece_map:
+            return False
+        idx += step
+    return True
+
 
 def square_is_attacked(
     piece_map: dict[Square, Piece],
     square: Square,
     by: Optional[Color] = None,
+    piece_squares: Optional[PieceSquares] = None,
 ) -> bool:
     """Determines if `square` is attacked by any pieces on
     the board.
 
     piece_map: Locations of all pieces on the board
-    en_passant_square: Target square that can be moved to via en passant
     square: Location to check if under attack
     by: When `Color` is provided, check only if that `Color`
         attacks `square`
+    piece_squares: Squares of the pieces in `piece_map`. When
+        provided along with `by`, each of that side's pieces is
+        checked against the attack tables instead of looking
+        outward from `square`. Squares left empty in `piece_map`
+        are skipped, so pieces may be lifted off it temporarily.
     """
-    for _, piece in piece_map.items():
-        if by is not None and piece.color != by:
-            continue
-
-        moves = piece.generate_psuedo_legal_moves(
-            # We can ignore en passant captures in this context, as
-            # we're only concerned with which squares are under attack,
-            # not if an additional pawn can be captured
-            piece_map=piece_map,
-            **{"en_passant_sq": None}
-        )
-        attacked_squares: set[Square] = {move.end.curr for move in moves}
-        if square in attacked_squares:
-            return True
+    if piece_squares is not None and by is not None:
+        if (occupant := piece_map.get(square)) is not None and occupant.color == by:
+            return False
+        for attacker in piece_squares.of(by):
+            piece = piece_map.get(attacker)
+            if piece is not None and piece_attacks(
+                piece_map=piece_map, piece=piece, target=square
+            ):
+                return True
+        return False
 
+    for _ in _iter_attackers(piece_map=piece_map, square=square, by=by):
+        return True
     return False
+
+
+def attackers_to(
+    piece_map: dict[Square, Piece],
+    square: Square,
+    by: Optional[Color] = None,
+) -> list[Piece]:
+    """Finds every piece attacking `square`.
+
+    piece_map: Locations of all pieces on the board
+    square: Location to find the attackers of
+    by: When `Color` is provided, only return attackers of
+        that `Color`
+    """
+    return list(_iter_attackers(piece_map=piece_map, square=square, by=by))
+
+
+def _iter_attackers(
+    piece_map: dict[Square, Piece],
+    square: Square,
+    by: Optional[Color],
+) -> Iterator[Piece]:
+    """Lazily yields the pieces attacking `square`, looking
+    outward from it the way each piece type would attack it.
+
+    Pieces never attack a square held by their own color, so
+    attackers sharing a color with the occupant are skipped.
+    """
+    idx = square
+    if (occupant := piece_map.get(square)) is not None:
+        if by == occupant.color:
+            return
+        by = Color.WHITE if occupant.color == Color.BLACK else Color.BLACK
+
+    piece: Optional[Piece]
+    for color in (Color.WHITE, Color.BLACK) if by is None else (by,):
+        for attacker_square in PAWN_ATTACKER_TABLE[color][idx]:
+            piece = piece_map.get(attacker_square)
+            if isinstance(piece, Pawn) and piece.color == color:
+                yield piece
+
+    for attacker_square in KNIGHT_TABLE[idx]:
+        piece = piece_map.get(attacker_square)
+        if isinstance(piece, Knight) and (by is None or piece.color == by):
+            yield piece
+
+    for attacker_square in KING_TABLE[idx]:
+        piece = piece_map.get(attacker_square)
+        if isinstance(piece, King) and (by is None or piece.color == by):
+            yield piece
+
+    for rays, sliders in (
+        (DIAG_RAYS[idx], (Bishop, Queen)),
+        (VERT_HORIZ_RAYS[idx], (Rook, Queen)),
+    ):
+        for ray in rays:
+            for attacker_square in ray:
+                if (piece := piece_map.get(attacker_square)) is None:
+                    continue
+                if isinstance(piece, sliders) and (by is None or piece.color == by):
+                    yield piece
+                break
+
+
+def attacked_squares(
+    piece_map: dict[Square, Piece],
+    by: Color,
+    ignore: Optional[Square] = None,
+    piece_squares: Optional[PieceSquares] = None,
+) -> set[Square]:
+    """Collects every square attacked by the pieces of color `by`,
+    including squares held by pieces they defend.
+
+    ignore: Square to treat as empty, such that sliding pieces
+        see through it (e.g. the king about to step out of a ray)
+    piece_squares: Squares of the pieces in `piece_map`, found
+        from it when not provided
+    """
+    if piece_squares is None:
+        piece_squares = PieceSquares.from_piece_map(piece_map)
+    pieces = piece_squares.squares
+
+    squares: set[Square] = set()
+    # A pawn attacks the squares from which a pawn of the
+    # opposite color would be attacking it
+    pawn_targets = PAWN_ATTACKER_TABLE[
+        Color.WHITE if by == Color.BLACK else Color.BLACK
+    ]
+    for square in pieces[by, Pawn]:
+        squares.update(pawn_targets[square])
+    for square in pieces[by, Knight]:
+        squares.update(KNIGHT_TABLE[square])
+    for square in pieces[by, King]:
+        squares.update(KING_TABLE[square])
+
+    for piece_type, ray_table in (
+        (Bishop, DIAG_RAYS),
+        (Rook, VERT_HORIZ_RAYS),
+        (Queen, QUEEN_RAYS),
+    ):
+        for square in pieces[by, piece_type]:
+            for ray in ray_table[square]:
+                for target in ray:
+                    squares.add(target)
+                    if target != ignore and target in piece_map:
+                        break
+
+    return squares
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional, Union
 
 from pesto.board.move.attack import square_is_attacked
 from pesto.board.piece import BaseMove, CastlingMove, King, Piece, Rook
+from pesto.board.piece_squares import PieceSquares
 from pesto.board.square import Square
 from pesto.core.enums import Color
 
@@ -14,38 +16,121 @@ class CastleSide(Enum):
     LONG: str = "long"
 
 
-@dataclass
+# Bit of each castling right, in the order they appear in FEN
+WHITE_SHORT: int = 1
+WHITE_LONG: int = 2
+BLACK_SHORT: int = 4
+BLACK_LONG: int = 8
+ALL_RIGHTS: int = WHITE_SHORT | WHITE_LONG | BLACK_SHORT | BLACK_LONG
+
+CASTLE_BITS: dict[tuple[Color, CastleSide], int] = {
+    (Color.WHITE, CastleSide.SHORT): WHITE_SHORT,
+    (Color.WHITE, CastleSide.LONG): WHITE_LONG,
+    (Color.BLACK, CastleSide.SHORT): BLACK_SHORT,
+    (Color.BLACK, CastleSide.LONG): BLACK_LONG,
+}
+
+# Rights kept when a move starts or ends on each square, indexed by
+# the square's 0x88 value. Moving the king or a rook off its starting
+# square, or capturing a rook on its own, clears the matching rights.
+CASTLE_RIGHTS_MASKS: tuple[int, ...] = tuple(
+    ALL_RIGHTS
+    & ~{
+        Square.E1.value: WHITE_SHORT | WHITE_LONG,
+        Square.H1.value: WHITE_SHORT,
+        Square.A1.value: WHITE_LONG,
+        Square.E8.value: BLACK_SHORT | BLACK_LONG,
+        Square.H8.value: BLACK_SHORT,
+        Square.A8.value: BLACK_LONG,
+    }.get(idx, 0)
+    for idx in range(128)
+)
+
+
 class CastleRights:
-    _rights: dict[Color, dict[CastleSide, bool]]
+    """Castling rights packed into the four bits above.
+
+    Instances are immutable values: playing a move derives new rights
+    with `update`, and `revoked`/`granted` return changed copies,
+    leaving the rights they're called on untouched. This lets them be
+    shared between positions and undo records. The in-place
+    `set_false`/`set_true` they replace raise a `TypeError`.
+
+    _rights: Either the packed bits, or the nested
+        `{color: {side: has_right}}` form to fold into them
+    """
+
+    __slots__ = ("_bits",)
+
+    def __init__(
+        self, _rights: Union[int, dict[Color, dict[CastleSide, bool]]] = 0
+    ) -> None:
+        if isinstance(_rights, int):
+            self._bits: int = _rights
+            return
+
+        bits = 0
+        for color, sides in _rights.items():
+            for castle_side, has_right in sides.items():
+                if has_right:
+                    bits |= CASTLE_BITS[color, castle_side]
+        self._bits = bits
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CastleRights):
+            return NotImplemented
+        return self._bits == other._bits
+
+    def __hash__(self) -> int:
+        return hash(self._bits)
+
+    def __repr__(self) -> str:
+        return f"CastleRights({self._bits:#06b})"
+
+    @property
+    def bits(self) -> int:
+        """The packed rights, see `CASTLE_BITS`"""
+        return self._bits
 
     @classmethod
     def new(cls) -> CastleRights:
         """Initialize a `CastleRights` object representing game start"""
-        return CastleRights(
-            _rights={
-                Color.WHITE: {CastleSide.SHORT: True, CastleSide.LONG: True},
-                Color.BLACK: {CastleSide.SHORT: True, CastleSide.LONG: True},
-            }
-        )
+        return CastleRights(ALL_RIGHTS)
 
     @classmethod
     def none(cls) -> CastleRights:
         """Initialize a `CastleRights` object where no one has rights"""
-        return CastleRights(
-            _rights={
-                Color.WHITE: {CastleSide.SHORT: False, CastleSide.LONG: False},
-                Color.BLACK: {CastleSide.SHORT: False, CastleSide.LONG: False},
-            }
-        )
+        return CastleRights(0)
 
     def __call__(self, color: Color) -> dict[CastleSide, bool]:
-        return self._rights[color]
+        return {castle_side: self.has(color, castle_side) for castle_side in CastleSide}
+
+    def has(self, color: Color, castle_side: CastleSide) -> bool:
+        """Whether `color` may still castle towards `castle_side`"""
+        return bool(self._bits & CASTLE_BITS[color, castle_side])
+
+    def update(self, start: Square, end: Square) -> CastleRights:
+        """Rights left after a move from `start` to `end`. Returns
+        this same object when the move doesn't change them.
+        """
+        bits = self._bits & CASTLE_RIGHTS_MASKS[start] & CASTLE_RIGHTS_MASKS[end]
+        return self if bits == self._bits else CastleRights(bits)
+
+    def revoked(self, color: Color, castle_side: CastleSide) -> CastleRights:
+        """Copy of these rights with `color` unable to castle `castle_side`"""
+        return CastleRights(self._bits & ~CASTLE_BITS[color, castle_side])
+
+    def granted(self, color: Color, castle_side: CastleSide) -> CastleRights:
+        """Copy of these rights with `color` able to castle `castle_side`"""
+        return CastleRights(self._bits | CASTLE_BITS[color, castle_side])
 
     def set_false(self, color: Color, castle_side: CastleSide) -> None:
-        self._rights[color][castle_side] = False
+        """Removed: rights can't be changed in place, see `revoked`"""
+        raise TypeError("CastleRights is immutable, use `rights = rights.revoked(...)`")
 
     def set_true(self, color: Color, castle_side: CastleSide) -> None:
-        self._rights[color][castle_side] = True
+        """Removed: rights can't be changed in place, see `granted`"""
+        raise TypeError("CastleRights is immutable, use `rights = rights.granted(...)`")
 
 
 @dataclass
@@ -109,24 +194,80 @@ def generate_castling_moves(
     piece_map: dict[Square, Piece],
     castle_rights: CastleRights,
     to_move: Color,
+    attacked: Optional[set[Square]] = None,
+    piece_squares: Optional[PieceSquares] = None,
 ) -> set[CastlingMove]:
     """Return a collection of castling move objects if the side `to_move`
     is legally allowed to castle in either direction
+
+    attacked: Squares attacked by the opposing side, see
+        `legal_castle_sides`
+    piece_squares: Squares of the pieces in `piece_map`, see
+        `legal_castle_sides`
     """
     moves: set[CastlingMove] = set()
+    for castling_side in legal_castle_sides(
+        piece_map=piece_map,
+        castle_rights=castle_rights,
+        to_move=to_move,
+        attacked=attacked,
+        piece_squares=piece_squares,
+    ):
+        squares = CastleSquare(color=to_move, castle_side=castling_side)
+        moves.add(
+            CastlingMove(
+                start=King.new(to_move, squares.king_start),
+                end=King.new(to_move, squares.king_end),
+                castled_rook=BaseMove(
+                    start=Rook.new(to_move, squares.rook_start),
+                    end=Rook.new(to_move, squares.rook_end),
+                ),
+            )
+        )
+
+    return moves
+
+
+def legal_castle_sides(
+    piece_map: dict[Square, Piece],
+    castle_rights: CastleRights,
+    to_move: Color,
+    attacked: Optional[set[Square]] = None,
+    piece_squares: Optional[PieceSquares] = None,
+) -> list[CastleSide]:
+    """Return the sides the side `to_move` is legally
+    allowed to castle towards
+
+    attacked: Squares attacked by the opposing side, when already
+        known, which are then looked up rather than checked one
+        at a time. These may be found with the king lifted off the
+        board, since a line of attack through the king onto a
+        square it passes through would already be giving check.
+    piece_squares: Squares of the pieces in `piece_map`, letting
+        squares be checked against the opposing side's pieces
+        when `attacked` isn't known
+    """
+    sides: list[CastleSide] = []
     opposite_color: Color = Color.WHITE if to_move == Color.BLACK else Color.BLACK
-    rights: dict[CastleSide, bool] = castle_rights(color=to_move)
+
+    def is_attacked(square: Square) -> bool:
+        if attacked is not None:
+            return square in attacked
+        return square_is_attacked(
+            piece_map=piece_map,
+            square=square,
+            by=opposite_color,
+            piece_squares=piece_squares,
+        )
 
     for castling_side in CastleSide:
         able_to_castle: bool = True
 
-        if rights[castling_side] is True:
+        if castle_rights.has(to_move, castling_side):
             squares = CastleSquare(color=to_move, castle_side=castling_side)
 
             # Check if the king starts in check
-            if square_is_attacked(
-                piece_map=piece_map, square=squares.king_start, by=opposite_color
-            ):
+            if is_attacked(squares.king_start):
                 able_to_castle = False
                 break
 
@@ -141,9 +282,7 @@ def generate_castling_moves(
 
             # Check if the king passes through check
             for square in squares.king_passthrough_squares:
-                if square_is_attacked(
-                    piece_map=piece_map, square=square, by=opposite_color
-                ):
+                if is_attacked(square):
                     able_to_castle = False
                     break
 
@@ -151,15 +290,6 @@ def generate_castling_moves(
                 continue
 
             # Able to castle!
-            moves.add(
-                CastlingMove(
-                    start=King(color=to_move, curr=squares.king_start),
-                    end=King(color=to_move, curr=squares.king_end),
-                    castled_rook=BaseMove(
-                        start=Rook(color=to_move, curr=squares.rook_start),
-                        end=Rook(color=to_move, curr=squares.rook_end),
-                    ),
-                )
-            )
+            sides.append(castling_side)
 
-    return moves
+    return sides
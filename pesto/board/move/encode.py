@@ -0,0 +1,155 @@
+"""
+    Packed 16-bit move encoding
+
+    An alternative to the `SinglePieceMove`/`CastlingMove` dataclasses
+    for when moves are generated and stored in bulk, laid out as
+
+        bits 0-5    start square index (a1=0 .. h8=63)
+        bits 6-11   end square index
+        bits 12-15  flags, see below
+
+    Codes fit an unsigned short, so a list of moves can be kept
+    in an `array("H")` rather than a set of objects.
+"""
+from array import array
+from typing import Iterable, Optional
+
+from pesto.board.move.castle import CastleSide, CastleSquare
+from pesto.board.piece import (
+    BaseMove,
+    Bishop,
+    CastlingMove,
+    King,
+    Knight,
+    Move,
+    Pawn,
+    Piece,
+    Queen,
+    Rook,
+    SinglePieceMove,
+)
+from pesto.board.square import SQUARES_BY_INDEX, Square, square_to_index
+from pesto.core.enums import Color
+
+QUIET: int = 0
+DOUBLE_PAWN_PUSH: int = 1
+KING_CASTLE: int = 2
+QUEEN_CASTLE: int = 3
+CAPTURE: int = 4
+EN_PASSANT: int = 5
+# Promotions set this bit plus the index of the promotion piece
+# in `PROMOTION_PIECES` in the lowest two bits, along with
+# `CAPTURE` when promoting by capturing
+PROMOTION: int = 8
+
+PROMOTION_PIECES: tuple[type[Piece], ...] = (Knight, Bishop, Rook, Queen)
+
+
+def pack_move(start: int, end: int, flags: int = QUIET) -> int:
+    """Packs square indices and flags into a move code"""
+    return start | (end << 6) | (flags << 12)
+
+
+def move_start(code: int) -> int:
+    """Start square index of a move code"""
+    return code & 0x3F
+
+
+def move_end(code: int) -> int:
+    """End square index of a move code"""
+    return (code >> 6) & 0x3F
+
+
+def move_flags(code: int) -> int:
+    """Flags of a move code"""
+    return code >> 12
+
+
+def encode_move(move: Move, piece_map: dict[Square, Piece]) -> int:
+    """Packs `move` into a 16-bit move code.
+
+    piece_map: Position the move is played from, used to
+        recognize captures that the move doesn't describe
+    """
+    start = square_to_index(move.start.curr)
+    end = square_to_index(move.end.curr)
+
+    if isinstance(move, CastlingMove):
+        # Short castling moves the rook from the h-file
+        is_short = move.castled_rook.start.curr & 7 == 7
+        return pack_move(start, end, KING_CASTLE if is_short else QUEEN_CASTLE)
+
+    flags = QUIET
+    if move.captures is not None and move.captures.curr != move.end.curr:
+        flags = EN_PASSANT
+    elif move.captures is not None or move.end.curr in piece_map:
+        flags = CAPTURE
+
+    if type(move.end) is not type(move.start):
+        flags |= PROMOTION | PROMOTION_PIECES.index(type(move.end))
+    elif isinstance(move.start, Pawn) and abs(end - start) == 16:
+        flags = DOUBLE_PAWN_PUSH
+
+    return pack_move(start, end, flags)
+
+
+def decode_move(
+    code: int, piece_map: dict[Square, Piece], fill_captures: bool = True
+) -> Move:
+    """Unpacks a 16-bit move code into a move object.
+
+    piece_map: Position the move is played from, used to
+        find the piece being moved and any piece captured
+    fill_captures: Whether to look up the captured piece of a
+        capture, as `push` reports it. Generated moves leave it
+        out, apart from en passant captures.
+    """
+    start_square = SQUARES_BY_INDEX[move_start(code)]
+    end_idx = move_end(code)
+    flags = move_flags(code)
+
+    if (piece := piece_map.get(start_square)) is None:
+        raise ValueError(f"Could not find piece on {start_square} to move")
+    color = piece.color
+
+    if flags in (KING_CASTLE, QUEEN_CASTLE):
+        squares = CastleSquare(
+            color=color,
+            castle_side=CastleSide.SHORT if flags == KING_CASTLE else CastleSide.LONG,
+        )
+        return CastlingMove(
+            start=piece,
+            end=King.new(color, squares.king_end),
+            castled_rook=BaseMove(
+                start=Rook.new(color, squares.rook_start),
+                end=Rook.new(color, squares.rook_end),
+            ),
+        )
+
+    end_piece = type(piece)
+    if flags & PROMOTION:
+        end_piece = PROMOTION_PIECES[flags & 3]
+
+    captures: Optional[Piece] = None
+    if flags == EN_PASSANT:
+        # The captured pawn sits directly behind the end square
+        captured_idx = end_idx - 8 if color == Color.WHITE else end_idx + 8
+        captures = Pawn.new(
+            Color.WHITE if color == Color.BLACK else Color.BLACK,
+            SQUARES_BY_INDEX[captured_idx],
+        )
+    elif flags & CAPTURE and fill_captures:
+        captures = piece_map[SQUARES_BY_INDEX[end_idx]]
+
+    return SinglePieceMove(
+        start=piece,
+        end=end_piece.new(color, SQUARES_BY_INDEX[end_idx]),
+        captures=captures,
+    )
+
+
+def encode_moves(moves: Iterable[Move], piece_map: dict[Square, Piece]) -> array:
+    """Packs a group of moves played from the same position
+    into an `array` of 16-bit move codes
+    """
+    return array("H", (encode_move(move, piece_map) for move in moves))
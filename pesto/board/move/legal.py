@@ -1,56 +1,388 @@
-from typing import Optional
+# pylint: disable=too-many-branches, too-many-locals
+from dataclasses import dataclass
+from typing import Optional, cast
 
-from pesto.board.move.apply import make_move, unmake_move
-from pesto.board.move.attack import square_is_attacked
-from pesto.board.move.castle import CastleRights, generate_castling_moves
-from pesto.board.piece import King, Move, Piece, SinglePieceMove
-from pesto.board.square import Square
+from pesto.board.move.attack import (
+    ATTACK_DELTA_OFFSET,
+    ATTACK_MASKS,
+    ATTACK_STEPS,
+    ATTACKER_BITS,
+    attacked_squares,
+    square_is_attacked,
+)
+from pesto.board.move.castle import (
+    CastleRights,
+    generate_castling_moves,
+    legal_castle_sides,
+)
+from pesto.board.piece import (
+    DIAG_RAYS,
+    KING_TABLE,
+    KNIGHT_TABLE,
+    PAWN_ATTACKER_TABLE,
+    QUEEN_RAYS,
+    VERT_HORIZ_RAYS,
+    Bishop,
+    King,
+    Knight,
+    Move,
+    Pawn,
+    Piece,
+    Queen,
+    Rays,
+    Rook,
+    SinglePieceMove,
+)
+from pesto.board.piece_squares import NON_KING_TYPES, PieceSquares
+from pesto.board.square import SQUARES_BY_VALUE, Square
 from pesto.core.enums import Color
 
+_SLIDER_RAYS: dict[type[Piece], tuple[Rays, ...]] = {
+    Bishop: DIAG_RAYS,
+    Rook: VERT_HORIZ_RAYS,
+    Queen: QUEEN_RAYS,
+}
+
+
+@dataclass
+class LegalityMasks:
+    """Check and pin details of a position, computed once so that
+    pseudo-legal moves can be judged without trying them out
+    """
+
+    king: King
+    checkers: list[Piece]
+    # Squares a non-king move must land on to capture the checking
+    # piece or block its line; `None` when the king isn't in check
+    check_mask: Optional[set[Square]]
+    # Locations of pinned pieces, mapped to the squares they may
+    # still move to (along the pin, up to and including the pinner)
+    pins: dict[Square, set[Square]]
+    # Squares the king may not step on to, with the king itself
+    # lifted off the board so it can't hide behind its own shadow
+    king_danger: set[Square]
+
+
+def find_legality_masks(
+    piece_map: dict[Square, Piece],
+    to_move: Color,
+    piece_squares: Optional[PieceSquares] = None,
+    king_danger: Optional[set[Square]] = None,
+) -> LegalityMasks:
+    """Finds the checkers, pinned pieces and king danger squares
+    for the side `to_move`
+
+    piece_squares: Squares of the pieces in `piece_map`, found
+        from it when not provided
+    king_danger: Squares attacked by the opposing side with the
+        king lifted off the board, when already known
+    """
+    if piece_squares is None:
+        piece_squares = PieceSquares.from_piece_map(piece_map)
+    opposite_color = Color.WHITE if to_move == Color.BLACK else Color.BLACK
+    king = cast(King, piece_map[piece_squares.kings[to_move]])
+
+    piece: Optional[Piece]
+    idx = king.curr
+    checkers: list[Piece] = []
+    check_mask: set[Square] = set()
+    pins: dict[Square, set[Square]] = {}
+
+    # Pawns and knights can only give check, never pin
+    for checker_square in PAWN_ATTACKER_TABLE[opposite_color][idx]:
+        piece = piece_map.get(checker_square)
+        if isinstance(piece, Pawn) and piece.color == opposite_color:
+            checkers.append(piece)
+            check_mask.add(checker_square)
+
+    for checker_square in KNIGHT_TABLE[idx]:
+        piece = piece_map.get(checker_square)
+        if isinstance(piece, Knight) and piece.color == opposite_color:
+            checkers.append(piece)
+            check_mask.add(checker_square)
+
+    # Sliders lined up with the king check it directly, or pin
+    # exactly one of its own pieces standing in between
+    for slider_square in piece_squares.of(opposite_color, (Bishop, Rook, Queen)):
+        slider = piece_map[slider_square]
+        delta = idx - slider_square + ATTACK_DELTA_OFFSET
+        if not ATTACK_MASKS[delta] & ATTACKER_BITS[type(slider), opposite_color]:
+            continue
+
+        step = ATTACK_STEPS[delta]
+        line = {slider_square}
+        shield: Optional[Piece] = None
+        square = slider_square + step
+        while square != idx:
+            between = SQUARES_BY_VALUE[square]
+            if (piece := piece_map.get(between)) is not None:
+                if piece.color != to_move or shield is not None:
+                    break
+                shield = piece
+            line.add(between)
+            square += step
+        else:
+            if shield is None:
+                checkers.append(slider)
+                check_mask |= line
+            else:
+                pins[shield.curr] = line
+
+    return LegalityMasks(
+        king=king,
+        checkers=checkers,
+        check_mask=check_mask if checkers else None,
+        pins=pins,
+        king_danger=(
+            attacked_squares(
+                piece_map=piece_map,
+                by=opposite_color,
+                ignore=king.curr,
+                piece_squares=piece_squares,
+            )
+            if king_danger is None
+            else king_danger
+        ),
+    )
+
 
 def legal_move_generator(
     piece_map: dict[Square, Piece],
     to_move: Color,
     castle_rights: CastleRights,
     en_passant_sq: Optional[Square],
+    *,
+    piece_squares: Optional[PieceSquares] = None,
+    king_danger: Optional[set[Square]] = None,
 ) -> set[Move]:
     """Creates a group of moves that are legal when considering the
     full scope of the board (i.e. do not leave the king in check)
+
+    piece_squares: Squares of the pieces in `piece_map`, found
+        from it when not provided
+    king_danger: Squares attacked by the opposing side with the
+        king lifted off the board, when already known
     """
+    if piece_squares is None:
+        piece_squares = PieceSquares.from_piece_map(piece_map)
+    masks = find_legality_masks(
+        piece_map=piece_map,
+        to_move=to_move,
+        piece_squares=piece_squares,
+        king_danger=king_danger,
+    )
+    king = masks.king
 
-    # Find king of color to move
-    king: King
-    for piece in piece_map.values():
-        if isinstance(piece, King) and piece.color == to_move:
-            king = piece
-            break
-
-    single_piece_moves: set[SinglePieceMove] = set()
-    for piece in piece_map.values():
-        if piece.color != to_move:
-            continue
+    moves: set[Move] = {
+        move
+        for move in king.generate_psuedo_legal_moves(piece_map=piece_map)
+        if move.end.curr not in masks.king_danger
+    }
 
-        piece_is_king: bool = piece == king
+    # Only the king can get out of double check
+    if len(masks.checkers) > 1:
+        return moves
 
+    en_passant_moves: list[SinglePieceMove] = []
+    for square in piece_squares.of(to_move, NON_KING_TYPES):
+        piece = piece_map[square]
+        pin = masks.pins.get(piece.curr)
         for move in piece.generate_psuedo_legal_moves(
             piece_map=piece_map, **{"en_passant_sq": en_passant_sq}
         ):
-            # Temporarily make move and see if king is in check
-            tmp_piece_map, tmp_move = make_move(piece_map=piece_map, move=move)
+            if move.captures is not None:
+                # En passant removes two pieces from the same rank, which
+                # a pin can't describe, so these are checked separately
+                en_passant_moves.append(move)
+                continue
 
-            king_square: Square
-            if piece_is_king:
-                king_square = tmp_move.end.curr
-            else:
-                king_square = king.curr
+            if masks.check_mask is not None and move.end.curr not in masks.check_mask:
+                continue
+            if pin is not None and move.end.curr not in pin:
+                continue
+            moves.add(move)
+
+    for move in en_passant_moves:
+        if _en_passant_is_legal(
+            piece_map=piece_map,
+            start=move.start.curr,
+            end=move.end.curr,
+            king=king.curr,
+            piece_squares=piece_squares,
+        ):
+            moves.add(move)
+
+    if masks.check_mask is None:
+        moves |= generate_castling_moves(
+            piece_map=piece_map,
+            castle_rights=castle_rights,
+            to_move=to_move,
+            attacked=masks.king_danger,
+            piece_squares=piece_squares,
+        )
+
+    return moves
 
-            if not square_is_attacked(piece_map=tmp_piece_map, square=king_square):
-                single_piece_moves.add(move)
 
-            _ = unmake_move(piece_map=tmp_piece_map, move=tmp_move)
+def count_legal_moves(
+    piece_map: dict[Square, Piece],
+    to_move: Color,
+    castle_rights: CastleRights,
+    en_passant_sq: Optional[Square],
+    *,
+    piece_squares: Optional[PieceSquares] = None,
+    king_danger: Optional[set[Square]] = None,
+) -> int:
+    """Counts the moves `legal_move_generator` would create,
+    by walking target squares rather than creating moves
+    """
+    if piece_squares is None:
+        piece_squares = PieceSquares.from_piece_map(piece_map)
+    masks = find_legality_masks(
+        piece_map=piece_map,
+        to_move=to_move,
+        piece_squares=piece_squares,
+        king_danger=king_danger,
+    )
+    king = masks.king
+
+    count = 0
+    for square in KING_TABLE[king.curr]:
+        if square in masks.king_danger:
+            continue
+        if (piece := piece_map.get(square)) is None or piece.color != to_move:
+            count += 1
+
+    # Only the king can get out of double check
+    if len(masks.checkers) > 1:
+        return count
+
+    check_mask = masks.check_mask
+    en_passant_starts: list[Square] = []
+    for start in piece_squares.of(to_move, NON_KING_TYPES):
+        piece = piece_map[start]
+        pin = masks.pins.get(start)
+        for square in _piece_targets(
+            piece_map=piece_map, piece=piece, en_passant_sq=en_passant_sq
+        ):
+            if square == en_passant_sq and isinstance(piece, Pawn):
+                en_passant_starts.append(start)
+                continue
+
+            if check_mask is not None and square not in check_mask:
+                continue
+            if pin is not None and square not in pin:
+                continue
+            # Each promotion piece counts as a separate move
+            count += 4 if isinstance(piece, Pawn) and square >> 4 in (0, 7) else 1
+
+    for start in en_passant_starts:
+        if _en_passant_is_legal(
+            piece_map=piece_map,
+            start=start,
+            end=cast(Square, en_passant_sq),
+            king=king.curr,
+            piece_squares=piece_squares,
+        ):
+            count += 1
+
+    if check_mask is None:
+        count += len(
+            legal_castle_sides(
+                piece_map=piece_map,
+                castle_rights=castle_rights,
+                to_move=to_move,
+                attacked=masks.king_danger,
+                piece_squares=piece_squares,
+            )
+        )
+
+    return count
+
+
+def _piece_targets(
+    piece_map: dict[Square, Piece], piece: Piece, en_passant_sq: Optional[Square]
+) -> list[Square]:
+    """Squares a non-king `piece` can move to, ignoring pins and checks"""
+    if isinstance(piece, Pawn):
+        return _pawn_targets(
+            piece_map=piece_map, pawn=piece, en_passant_sq=en_passant_sq
+        )
+
+    opposite_color = Color.WHITE if piece.color == Color.BLACK else Color.BLACK
+    if isinstance(piece, Knight):
+        return [
+            square
+            for square in KNIGHT_TABLE[piece.curr]
+            if (other := piece_map.get(square)) is None or other.color == opposite_color
+        ]
+
+    targets: list[Square] = []
+    for ray in _SLIDER_RAYS[type(piece)][piece.curr]:
+        for square in ray:
+            if (other := piece_map.get(square)) is not None:
+                if other.color == opposite_color:
+                    targets.append(square)
+                break
+            targets.append(square)
+    return targets
+
+
+def _pawn_targets(
+    piece_map: dict[Square, Piece], pawn: Pawn, en_passant_sq: Optional[Square]
+) -> list[Square]:
+    """Squares `pawn` can move to, including the en passant square"""
+    opposite_color = Color.WHITE if pawn.color == Color.BLACK else Color.BLACK
+    targets: list[Square] = []
+
+    # A pawn captures onto the squares from which a pawn of
+    # the opposite color would be attacking it
+    for square in PAWN_ATTACKER_TABLE[opposite_color][pawn.curr]:
+        if square == en_passant_sq:
+            targets.append(square)
+        elif (piece := piece_map.get(square)) is not None and piece.color != pawn.color:
+            targets.append(square)
+
+    direction = 16 if pawn.color == Color.WHITE else -16
+    one_forward = SQUARES_BY_VALUE[pawn.curr + direction]
+    if one_forward not in piece_map:
+        targets.append(one_forward)
+
+        # Pawns on their starting rank may also move two squares
+        if pawn.curr >> 4 == (1 if pawn.color == Color.WHITE else 6):
+            two_forward = SQUARES_BY_VALUE[one_forward + direction]
+            if two_forward not in piece_map:
+                targets.append(two_forward)
+
+    return targets
+
+
+def _en_passant_is_legal(
+    piece_map: dict[Square, Piece],
+    start: Square,
+    end: Square,
+    king: Square,
+    piece_squares: PieceSquares,
+) -> bool:
+    """Temporarily plays the en passant capture from `start` to `end`
+    to see if it leaves the king on `king` in check. `piece_squares`
+    describes the board before the capture; the captured pawn is
+    skipped as its square is left empty.
+    """
+    # The captured pawn sits on the end file, alongside the capturer
+    captured_square = SQUARES_BY_VALUE[(end & 0x0F) | (start & 0xF0)]
+    pawn = piece_map.pop(start)
+    captured_pawn = piece_map.pop(captured_square)
+    piece_map[end] = pawn
 
-    castling_moves = generate_castling_moves(
-        piece_map=piece_map, castle_rights=castle_rights, to_move=to_move
+    in_check = square_is_attacked(
+        piece_map=piece_map,
+        square=king,
+        by=captured_pawn.color,
+        piece_squares=piece_squares,
     )
 
-    return single_piece_moves | castling_moves
+    del piece_map[end]
+    piece_map[start] = pawn
+    piece_map[captured_square] = captured_pawn
+    return not in_check
@@ -1,7 +1,13 @@
 import pytest
 from pytest_cases import parametrize_with_cases
 
-from pesto.board.move.apply import Move, make_move, unmake_move
+from pesto.board.move.apply import (
+    Move,
+    make_move,
+    make_move_in_place,
+    unmake_move,
+    unmake_move_in_place,
+)
 from pesto.board.move.tests.test_apply_cases import (
     TestMakeAndUnmakeMoveCases,
     TestMakeMoveCases,
@@ -69,3 +75,67 @@ def test_make_and_unmake_move(
     ending_piece_map = unmake_move(piece_map, move)
 
     assert starting_piece_map == ending_piece_map
+
+
+@pytest.mark.unit
+@parametrize_with_cases(
+    ("in_piece_map", "in_move", "out_piece_map", "out_move", "exception"),
+    TestMakeMoveCases,
+)
+def test_make_move_in_place(
+    in_piece_map: dict[Square, Piece],
+    in_move: Move,
+    out_piece_map: dict[Square, Piece],
+    out_move: Move,
+    exception: bool,
+):
+    piece_map = in_piece_map.copy()
+    if exception:
+        with pytest.raises(ValueError):
+            _ = make_move_in_place(piece_map, in_move)
+        assert piece_map == in_piece_map
+
+    else:
+        obs_move = make_move_in_place(piece_map, in_move)
+        assert piece_map == out_piece_map
+        assert obs_move == out_move
+
+
+@pytest.mark.unit
+@parametrize_with_cases(
+    ("in_piece_map", "in_move", "out_piece_map", "exception"),
+    TestUnmakeMoveCases,
+)
+def test_unmake_move_in_place(
+    in_piece_map: dict[Square, Piece],
+    in_move: Move,
+    out_piece_map: dict[Square, Piece],
+    exception: bool,
+):
+    piece_map = in_piece_map.copy()
+    if exception:
+        with pytest.raises(ValueError):
+            unmake_move_in_place(piece_map, in_move)
+
+    else:
+        unmake_move_in_place(piece_map, in_move)
+        assert piece_map == out_piece_map
+
+
+@pytest.mark.unit
+@parametrize_with_cases(
+    ("starting_piece_map", "input_move"),
+    TestMakeAndUnmakeMoveCases,
+)
+def test_make_and_unmake_move_in_place(
+    starting_piece_map: dict[Square, Piece],
+    input_move: Move,
+):
+    """Ensure `piece_map` is unchanged after making and
+    reverting a move on it in place
+    """
+    piece_map = starting_piece_map.copy()
+    move = make_move_in_place(piece_map, input_move)
+    unmake_move_in_place(piece_map, move)
+
+    assert starting_piece_map == piece_map
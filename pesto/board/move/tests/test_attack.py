@@ -3,9 +3,21 @@ from typing import Optional
 import pytest
 from pytest_cases import parametrize_with_cases
 
-from pesto.board.move.attack import square_is_attacked
-from pesto.board.move.tests.test_attack_cases import TestSquareIsAttackedCases
-from pesto.board.piece import Piece
+from pesto.board.move.attack import (
+    ATTACK_DELTA_OFFSET,
+    ATTACK_MASKS,
+    ATTACK_STEPS,
+    ATTACKER_BITS,
+    attackers_to,
+    piece_attacks,
+    square_is_attacked,
+)
+from pesto.board.move.tests.test_attack_cases import (
+    TestAttackersToCases,
+    TestSquareIsAttackedCases,
+)
+from pesto.board.piece import Bishop, King, Knight, Pawn, Piece, Queen, Rook
+from pesto.board.piece_squares import PieceSquares
 from pesto.board.square import Square
 from pesto.core.enums import Color
 
@@ -20,3 +32,72 @@ def test_square_is_attacked(
 ):
     obs = square_is_attacked(piece_map=piece_map, square=square, by=by)
     assert exp == obs
+
+    if by is not None:
+        obs = square_is_attacked(
+            piece_map=piece_map,
+            square=square,
+            by=by,
+            piece_squares=PieceSquares.from_piece_map(piece_map),
+        )
+        assert exp == obs
+
+
+@pytest.mark.unit
+@parametrize_with_cases(
+    ("square", "piece_map", "by", "exp"),
+    TestAttackersToCases,
+)
+def test_attackers_to(
+    square: Square,
+    piece_map: dict[Square, Piece],
+    by: Optional[Color],
+    exp: list[Piece],
+):
+    obs = attackers_to(piece_map=piece_map, square=square, by=by)
+    assert set(obs) == set(exp)
+    assert len(obs) == len(exp)
+
+
+@pytest.mark.unit
+def test_attack_tables():
+    def entry(attacker: Square, target: Square) -> tuple[int, int]:
+        delta = target - attacker + ATTACK_DELTA_OFFSET
+        return ATTACK_MASKS[delta], ATTACK_STEPS[delta]
+
+    mask, step = entry(Square.A1, Square.H8)
+    assert mask & ATTACKER_BITS[Bishop, Color.WHITE]
+    assert mask & ATTACKER_BITS[Queen, Color.BLACK]
+    assert not mask & ATTACKER_BITS[Rook, Color.WHITE]
+    assert step == 17
+
+    mask, step = entry(Square.H4, Square.A4)
+    assert mask & ATTACKER_BITS[Rook, Color.BLACK]
+    assert not mask & ATTACKER_BITS[King, Color.BLACK]
+    assert step == -1
+
+    mask, _ = entry(Square.E4, Square.F5)
+    assert mask & ATTACKER_BITS[Pawn, Color.WHITE]
+    assert not mask & ATTACKER_BITS[Pawn, Color.BLACK]
+    assert mask & ATTACKER_BITS[King, Color.WHITE]
+
+    mask, _ = entry(Square.G1, Square.F3)
+    assert mask == ATTACKER_BITS[Knight, Color.WHITE]
+
+    # Squares that share no line, and aren't a knight's move apart
+    assert entry(Square.A1, Square.B4) == (0, 0)
+
+
+@pytest.mark.unit
+def test_piece_attacks():
+    rook = Rook(Color.WHITE, Square.A1)
+    blocker = Pawn(Color.BLACK, Square.A5)
+    piece_map: dict[Square, Piece] = {Square.A1: rook, Square.A5: blocker}
+
+    assert piece_attacks(piece_map=piece_map, piece=rook, target=Square.A5)
+    assert not piece_attacks(piece_map=piece_map, piece=rook, target=Square.A8)
+    assert piece_attacks(piece_map=piece_map, piece=rook, target=Square.H1)
+    assert not piece_attacks(piece_map=piece_map, piece=rook, target=Square.B2)
+    # Black pawns attack down the board
+    assert piece_attacks(piece_map=piece_map, piece=blocker, target=Square.B4)
+    assert not piece_attacks(piece_map=piece_map, piece=blocker, target=Square.B6)
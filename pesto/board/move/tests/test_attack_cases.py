@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pesto.board.piece import Bishop, Pawn, Piece, Rook
+from pesto.board.piece import Bishop, King, Knight, Pawn, Piece, Queen, Rook
 from pesto.board.square import Square
 from pesto.core.enums import Color
 
@@ -48,3 +48,97 @@ class TestSquareIsAttackedCases:
         by: Optional[Color] = None
         exp = False
         return square, piece_map, by, exp
+
+    def case_pawn_attacks_empty_square_diagonally(self) -> _TestSquareIsAttackedCase:
+        square = Square.F6
+        piece_map: dict[Square, Piece] = {Square.G7: Pawn(Color.BLACK, Square.G7)}
+        by = Color.BLACK
+        exp = True
+        return square, piece_map, by, exp
+
+    def case_pawn_does_not_attack_square_ahead(self) -> _TestSquareIsAttackedCase:
+        square = Square.E4
+        piece_map: dict[Square, Piece] = {Square.E3: Pawn(Color.WHITE, Square.E3)}
+        by: Optional[Color] = None
+        exp = False
+        return square, piece_map, by, exp
+
+    def case_pawn_does_not_attack_backwards(self) -> _TestSquareIsAttackedCase:
+        square = Square.D3
+        piece_map: dict[Square, Piece] = {Square.E4: Pawn(Color.WHITE, Square.E4)}
+        by = Color.WHITE
+        exp = False
+        return square, piece_map, by, exp
+
+    def case_attacked_by_knight(self) -> _TestSquareIsAttackedCase:
+        square = Square.H8
+        piece_map: dict[Square, Piece] = {Square.G6: Knight(Color.WHITE, Square.G6)}
+        by = Color.WHITE
+        exp = True
+        return square, piece_map, by, exp
+
+    def case_attacked_by_king(self) -> _TestSquareIsAttackedCase:
+        square = Square.A1
+        piece_map: dict[Square, Piece] = {Square.B2: King(Color.BLACK, Square.B2)}
+        by = Color.BLACK
+        exp = True
+        return square, piece_map, by, exp
+
+    def case_piece_defended_by_own_color(self) -> _TestSquareIsAttackedCase:
+        square = Square.E5
+        piece_map: dict[Square, Piece] = {
+            Square.E5: Knight(Color.WHITE, Square.E5),
+            Square.A1: Queen(Color.WHITE, Square.A1),
+        }
+        by: Optional[Color] = None
+        exp = False
+        return square, piece_map, by, exp
+
+
+_TestAttackersToCase = tuple[Square, dict[Square, Piece], Optional[Color], list[Piece]]
+
+
+class TestAttackersToCases:
+    def case_no_attackers(self) -> _TestAttackersToCase:
+        square = Square.D4
+        piece_map: dict[Square, Piece] = {Square.D6: Knight(Color.BLACK, Square.D6)}
+        by: Optional[Color] = None
+        exp: list[Piece] = []
+        return square, piece_map, by, exp
+
+    def case_every_piece_type(self) -> _TestAttackersToCase:
+        square = Square.D4
+        piece_map: dict[Square, Piece] = {
+            Square.E5: Pawn(Color.BLACK, Square.E5),
+            Square.B5: Knight(Color.BLACK, Square.B5),
+            Square.D3: King(Color.BLACK, Square.D3),
+            Square.G1: Bishop(Color.BLACK, Square.G1),
+            Square.D8: Rook(Color.BLACK, Square.D8),
+            Square.A4: Queen(Color.BLACK, Square.A4),
+        }
+        by = Color.BLACK
+        exp = list(piece_map.values())
+        return square, piece_map, by, exp
+
+    def case_only_attackers_of_color(self) -> _TestAttackersToCase:
+        square = Square.C3
+        piece_map: dict[Square, Piece] = {
+            Square.B2: Pawn(Color.WHITE, Square.B2),
+            Square.C7: Rook(Color.BLACK, Square.C7),
+            Square.A1: Bishop(Color.WHITE, Square.A1),
+        }
+        by = Color.WHITE
+        exp: list[Piece] = [
+            Pawn(Color.WHITE, Square.B2),
+        ]
+        return square, piece_map, by, exp
+
+    def case_x_ray_is_not_an_attack(self) -> _TestAttackersToCase:
+        square = Square.H1
+        piece_map: dict[Square, Piece] = {
+            Square.H3: Rook(Color.WHITE, Square.H3),
+            Square.H8: Queen(Color.WHITE, Square.H8),
+        }
+        by: Optional[Color] = None
+        exp: list[Piece] = [Rook(Color.WHITE, Square.H3)]
+        return square, piece_map, by, exp
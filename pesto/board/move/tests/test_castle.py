@@ -1,9 +1,17 @@
 import pytest
 from pytest_cases import parametrize_with_cases
 
-from pesto.board.move.castle import CastleRights, generate_castling_moves
+from pesto.board.move.castle import (
+    BLACK_SHORT,
+    WHITE_LONG,
+    WHITE_SHORT,
+    CastleRights,
+    CastleSide,
+    generate_castling_moves,
+)
 from pesto.board.move.tests.test_castle_cases import TestGenerateCastlingMovesCases
 from pesto.board.piece import CastlingMove, Piece
+from pesto.board.piece_squares import PieceSquares
 from pesto.board.square import Square
 from pesto.core.enums import Color
 
@@ -23,3 +31,40 @@ def test_generate_castling_moves(
         piece_map=piece_map, castle_rights=castle_rights, to_move=to_move
     )
     assert sorted(obs_moves) == sorted(exp_moves)
+
+    obs_moves = generate_castling_moves(
+        piece_map=piece_map,
+        castle_rights=castle_rights,
+        to_move=to_move,
+        piece_squares=PieceSquares.from_piece_map(piece_map),
+    )
+    assert sorted(obs_moves) == sorted(exp_moves)
+
+
+@pytest.mark.unit
+def test_castle_rights_nested_form():
+    castle_rights = CastleRights(
+        {
+            Color.WHITE: {CastleSide.SHORT: False, CastleSide.LONG: True},
+            Color.BLACK: {CastleSide.SHORT: True, CastleSide.LONG: False},
+        }
+    )
+    assert castle_rights.bits == WHITE_LONG | BLACK_SHORT
+    assert castle_rights(Color.WHITE) == {
+        CastleSide.SHORT: False,
+        CastleSide.LONG: True,
+    }
+    assert castle_rights.has(Color.BLACK, CastleSide.SHORT)
+    assert not castle_rights.has(Color.BLACK, CastleSide.LONG)
+
+
+@pytest.mark.unit
+def test_castle_rights_update():
+    castle_rights = CastleRights.new()
+
+    # Moves away from the corners leave the rights, and the object, as they are
+    assert castle_rights.update(Square.E2, Square.E4) is castle_rights
+
+    obs = castle_rights.update(Square.A1, Square.A8)
+    assert obs.bits == WHITE_SHORT | BLACK_SHORT
+    assert castle_rights == CastleRights.new()
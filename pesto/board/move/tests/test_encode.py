@@ -0,0 +1,68 @@
+import pytest
+from pytest_cases import parametrize_with_cases
+
+from pesto.board.bitboard import BitBoard
+from pesto.board.board import Board
+from pesto.board.move.encode import (
+    decode_move,
+    encode_move,
+    encode_moves,
+    move_end,
+    move_flags,
+    move_start,
+    pack_move,
+)
+from pesto.board.move.tests.test_encode_cases import (
+    TestEncodeMoveCases,
+    TestEncodeRoundTripCases,
+)
+from pesto.board.piece import Move, Piece
+from pesto.board.square import Square, square_to_index
+
+
+@pytest.mark.unit
+def test_pack_move():
+    code = pack_move(63, 1, 15)
+    assert (move_start(code), move_end(code), move_flags(code)) == (63, 1, 15)
+    assert code <= 0xFFFF
+
+
+@pytest.mark.unit
+@parametrize_with_cases(("move", "piece_map", "flags"), TestEncodeMoveCases)
+def test_encode_move(move: Move, piece_map: dict[Square, Piece], flags: int):
+    code = encode_move(move=move, piece_map=piece_map)
+    assert move_start(code) == square_to_index(move.start.curr)
+    assert move_end(code) == square_to_index(move.end.curr)
+    assert move_flags(code) == flags
+
+
+@pytest.mark.unit
+@parametrize_with_cases("fen", TestEncodeRoundTripCases)
+def test_encode_decode_round_trip(fen: str):
+    board = Board.from_fen(fen)
+    for move in board.legal_moves():
+        code = encode_move(move=move, piece_map=board.piece_map)
+        decoded = decode_move(code=code, piece_map=board.piece_map, fill_captures=False)
+        assert decoded == move
+
+
+@pytest.mark.unit
+@parametrize_with_cases("fen", TestEncodeRoundTripCases)
+def test_encode_decode_played_round_trip(fen: str):
+    board = Board.from_fen(fen)
+    for move in board.legal_moves():
+        board.push(move)
+        played = board.pop()
+        code = encode_move(move=played, piece_map=board.piece_map)
+        assert decode_move(code=code, piece_map=board.piece_map) == played
+
+
+@pytest.mark.unit
+@parametrize_with_cases("fen", TestEncodeRoundTripCases)
+def test_bitboard_legal_move_codes(fen: str):
+    board = Board.from_fen(fen)
+    exp = encode_moves(board.legal_moves(), board.piece_map)
+
+    obs = BitBoard.from_fen(fen).legal_move_codes()
+    assert obs.typecode == "H"
+    assert sorted(obs) == sorted(exp)
@@ -0,0 +1,123 @@
+from pesto.board.move.encode import (
+    CAPTURE,
+    DOUBLE_PAWN_PUSH,
+    EN_PASSANT,
+    KING_CASTLE,
+    PROMOTION,
+    QUEEN_CASTLE,
+    QUIET,
+)
+from pesto.board.piece import (
+    BaseMove,
+    CastlingMove,
+    King,
+    Knight,
+    Move,
+    Pawn,
+    Piece,
+    Queen,
+    Rook,
+    SinglePieceMove,
+)
+from pesto.board.square import Square
+from pesto.core.enums import Color
+
+_TestEncodeMoveCase = tuple[Move, dict[Square, Piece], int]
+
+
+class TestEncodeMoveCases:
+    def case_quiet_knight_move(self) -> _TestEncodeMoveCase:
+        move = SinglePieceMove(
+            start=Knight(Color.WHITE, Square.G1), end=Knight(Color.WHITE, Square.F3)
+        )
+        piece_map: dict[Square, Piece] = {Square.G1: move.start}
+        return move, piece_map, QUIET
+
+    def case_double_pawn_push(self) -> _TestEncodeMoveCase:
+        move = SinglePieceMove(
+            start=Pawn(Color.BLACK, Square.E7), end=Pawn(Color.BLACK, Square.E5)
+        )
+        piece_map: dict[Square, Piece] = {Square.E7: move.start}
+        return move, piece_map, DOUBLE_PAWN_PUSH
+
+    def case_capture_found_on_board(self) -> _TestEncodeMoveCase:
+        """Generated moves don't describe their captures"""
+        move = SinglePieceMove(
+            start=Rook(Color.WHITE, Square.A1), end=Rook(Color.WHITE, Square.A8)
+        )
+        piece_map: dict[Square, Piece] = {
+            Square.A1: move.start,
+            Square.A8: Knight(Color.BLACK, Square.A8),
+        }
+        return move, piece_map, CAPTURE
+
+    def case_en_passant(self) -> _TestEncodeMoveCase:
+        move = SinglePieceMove(
+            start=Pawn(Color.WHITE, Square.E5),
+            end=Pawn(Color.WHITE, Square.D6),
+            captures=Pawn(Color.BLACK, Square.D5),
+        )
+        piece_map: dict[Square, Piece] = {
+            Square.E5: move.start,
+            Square.D5: Pawn(Color.BLACK, Square.D5),
+        }
+        return move, piece_map, EN_PASSANT
+
+    def case_promotion(self) -> _TestEncodeMoveCase:
+        move = SinglePieceMove(
+            start=Pawn(Color.WHITE, Square.B7), end=Knight(Color.WHITE, Square.B8)
+        )
+        piece_map: dict[Square, Piece] = {Square.B7: move.start}
+        return move, piece_map, PROMOTION
+
+    def case_capture_promotion(self) -> _TestEncodeMoveCase:
+        move = SinglePieceMove(
+            start=Pawn(Color.BLACK, Square.G2), end=Queen(Color.BLACK, Square.H1)
+        )
+        piece_map: dict[Square, Piece] = {
+            Square.G2: move.start,
+            Square.H1: Rook(Color.WHITE, Square.H1),
+        }
+        return move, piece_map, PROMOTION | CAPTURE | 3
+
+    def case_short_castle(self) -> _TestEncodeMoveCase:
+        move = CastlingMove(
+            start=King(Color.WHITE, Square.E1),
+            end=King(Color.WHITE, Square.G1),
+            castled_rook=BaseMove(
+                start=Rook(Color.WHITE, Square.H1), end=Rook(Color.WHITE, Square.F1)
+            ),
+        )
+        piece_map: dict[Square, Piece] = {
+            Square.E1: move.start,
+            Square.H1: move.castled_rook.start,
+        }
+        return move, piece_map, KING_CASTLE
+
+    def case_long_castle(self) -> _TestEncodeMoveCase:
+        move = CastlingMove(
+            start=King(Color.BLACK, Square.E8),
+            end=King(Color.BLACK, Square.C8),
+            castled_rook=BaseMove(
+                start=Rook(Color.BLACK, Square.A8), end=Rook(Color.BLACK, Square.D8)
+            ),
+        )
+        piece_map: dict[Square, Piece] = {
+            Square.E8: move.start,
+            Square.A8: move.castled_rook.start,
+        }
+        return move, piece_map, QUEEN_CASTLE
+
+
+class TestEncodeRoundTripCases:
+    def case_starting_position(self) -> str:
+        return "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+    def case_kiwipete(self) -> str:
+        return "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+    def case_promotions(self) -> str:
+        return "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+
+    def case_en_passant(self) -> str:
+        return "8/8/8/2k5/3Pp3/8/8/4K3 b - d3 0 1"
@@ -5,8 +5,15 @@ from pytest_cases import parametrize_with_cases
 
 from pesto.board.move.apply import Move
 from pesto.board.move.castle import CastleRights
-from pesto.board.move.legal import legal_move_generator
-from pesto.board.move.tests.test_legal_cases import TestLegalMoveGeneratorCases
+from pesto.board.move.legal import (
+    count_legal_moves,
+    find_legality_masks,
+    legal_move_generator,
+)
+from pesto.board.move.tests.test_legal_cases import (
+    TestFindLegalityMasksCases,
+    TestLegalMoveGeneratorCases,
+)
 from pesto.board.piece import Piece
 from pesto.board.square import Square
 from pesto.core.enums import Color
@@ -31,3 +38,42 @@ def test_legal_move_generator(
         en_passant_sq=en_passant_sq,
     )
     assert sorted(obs) == sorted(exp)
+
+
+@pytest.mark.unit
+@parametrize_with_cases(
+    ("piece_map", "castle_rights", "en_passant_sq", "to_move", "exp"),
+    TestLegalMoveGeneratorCases,
+)
+def test_count_legal_moves(
+    piece_map: dict[Square, Piece],
+    castle_rights: CastleRights,
+    en_passant_sq: Optional[Square],
+    to_move: Color,
+    exp: set[Move],
+):
+    obs = count_legal_moves(
+        piece_map=piece_map,
+        to_move=to_move,
+        castle_rights=castle_rights,
+        en_passant_sq=en_passant_sq,
+    )
+    assert obs == len(exp)
+
+
+@pytest.mark.unit
+@parametrize_with_cases(
+    ("piece_map", "to_move", "checkers", "check_mask", "pins"),
+    TestFindLegalityMasksCases,
+)
+def test_find_legality_masks(
+    piece_map: dict[Square, Piece],
+    to_move: Color,
+    checkers: list[Piece],
+    check_mask: Optional[set[Square]],
+    pins: dict[Square, set[Square]],
+):
+    obs = find_legality_masks(piece_map=piece_map, to_move=to_move)
+    assert obs.checkers == checkers
+    assert obs.check_mask == check_mask
+    assert obs.pins == pins
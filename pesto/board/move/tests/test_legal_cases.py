@@ -171,3 +171,127 @@ class TestLegalMoveGeneratorCases:
         }
 
         return piece_map, castle_rights, ep_square, to_move, exp
+
+    def case_double_check_only_king_moves(self) -> _TestLegalMoveGeneratorCase:
+        """King is checked twice, so the queen can't capture a checker"""
+        king = King(Color.BLACK, Square.E8)
+        piece_map: dict[Square, Piece] = {
+            Square.E8: king,
+            Square.D8: Queen(Color.BLACK, Square.D8),
+            Square.E1: Rook(Color.WHITE, Square.E1),
+            Square.D6: Knight(Color.WHITE, Square.D6),
+        }
+        castle_rights = CastleRights.none()
+        ep_square: Optional[Square] = None
+        to_move = Color.BLACK
+        exp: set[Move] = {
+            SinglePieceMove(start=king, end=King(Color.BLACK, Square.D7)),
+            SinglePieceMove(start=king, end=King(Color.BLACK, Square.F8)),
+        }
+        return piece_map, castle_rights, ep_square, to_move, exp
+
+    def case_pinned_piece_moves_along_pin(self) -> _TestLegalMoveGeneratorCase:
+        king = King(Color.WHITE, Square.E1)
+        rook = Rook(Color.WHITE, Square.E4)
+        piece_map: dict[Square, Piece] = {
+            Square.E1: king,
+            Square.E4: rook,
+            Square.E8: Rook(Color.BLACK, Square.E8),
+        }
+        castle_rights = CastleRights.none()
+        ep_square: Optional[Square] = None
+        to_move = Color.WHITE
+        exp: set[Move] = {
+            SinglePieceMove(start=king, end=King(Color.WHITE, Square.D1)),
+            SinglePieceMove(start=king, end=King(Color.WHITE, Square.D2)),
+            SinglePieceMove(start=king, end=King(Color.WHITE, Square.E2)),
+            SinglePieceMove(start=king, end=King(Color.WHITE, Square.F1)),
+            SinglePieceMove(start=king, end=King(Color.WHITE, Square.F2)),
+            SinglePieceMove(start=rook, end=Rook(Color.WHITE, Square.E2)),
+            SinglePieceMove(start=rook, end=Rook(Color.WHITE, Square.E3)),
+            SinglePieceMove(start=rook, end=Rook(Color.WHITE, Square.E5)),
+            SinglePieceMove(start=rook, end=Rook(Color.WHITE, Square.E6)),
+            SinglePieceMove(start=rook, end=Rook(Color.WHITE, Square.E7)),
+            SinglePieceMove(start=rook, end=Rook(Color.WHITE, Square.E8)),
+        }
+        return piece_map, castle_rights, ep_square, to_move, exp
+
+    def case_en_passant_exposes_king_along_rank(self) -> _TestLegalMoveGeneratorCase:
+        """Capturing en passant would clear both pawns off the
+        king's rank, leaving it in check from the rook
+        """
+        king = King(Color.WHITE, Square.A5)
+        pawn = Pawn(Color.WHITE, Square.B5)
+        piece_map: dict[Square, Piece] = {
+            Square.A5: king,
+            Square.B5: pawn,
+            Square.C5: Pawn(Color.BLACK, Square.C5),
+            Square.H5: Rook(Color.BLACK, Square.H5),
+        }
+        castle_rights = CastleRights.none()
+        ep_square = Square.C6
+        to_move = Color.WHITE
+        exp: set[Move] = {
+            SinglePieceMove(start=king, end=King(Color.WHITE, Square.A4)),
+            SinglePieceMove(start=king, end=King(Color.WHITE, Square.A6)),
+            SinglePieceMove(start=king, end=King(Color.WHITE, Square.B6)),
+            SinglePieceMove(start=pawn, end=Pawn(Color.WHITE, Square.B6)),
+        }
+        return piece_map, castle_rights, ep_square, to_move, exp
+
+
+_TestFindLegalityMasksCase = tuple[
+    dict[Square, Piece],
+    Color,
+    list[Piece],
+    Optional[set[Square]],
+    dict[Square, set[Square]],
+]
+
+
+class TestFindLegalityMasksCases:
+    def case_not_in_check(self) -> _TestFindLegalityMasksCase:
+        piece_map: dict[Square, Piece] = {
+            Square.E1: King(Color.WHITE, Square.E1),
+            Square.E8: King(Color.BLACK, Square.E8),
+        }
+        to_move = Color.WHITE
+        checkers: list[Piece] = []
+        check_mask: Optional[set[Square]] = None
+        pins: dict[Square, set[Square]] = {}
+        return piece_map, to_move, checkers, check_mask, pins
+
+    def case_sliding_check_can_be_blocked(self) -> _TestFindLegalityMasksCase:
+        queen = Queen(Color.BLACK, Square.A5)
+        piece_map: dict[Square, Piece] = {
+            Square.E1: King(Color.WHITE, Square.E1),
+            Square.A5: queen,
+        }
+        to_move = Color.WHITE
+        checkers: list[Piece] = [queen]
+        check_mask = {Square.D2, Square.C3, Square.B4, Square.A5}
+        pins: dict[Square, set[Square]] = {}
+        return piece_map, to_move, checkers, check_mask, pins
+
+    def case_knight_check_and_pinned_bishop(self) -> _TestFindLegalityMasksCase:
+        knight = Knight(Color.WHITE, Square.G6)
+        piece_map: dict[Square, Piece] = {
+            Square.H8: King(Color.BLACK, Square.H8),
+            Square.G7: Bishop(Color.BLACK, Square.G7),
+            Square.B2: Bishop(Color.WHITE, Square.B2),
+            Square.G6: knight,
+        }
+        to_move = Color.BLACK
+        checkers: list[Piece] = [knight]
+        check_mask = {Square.G6}
+        pins = {
+            Square.G7: {
+                Square.G7,
+                Square.F6,
+                Square.E5,
+                Square.D4,
+                Square.C3,
+                Square.B2,
+            },
+        }
+        return piece_map, to_move, checkers, check_mask, pins
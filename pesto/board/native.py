@@ -0,0 +1,33 @@
+"""
+    Optional C++ backend
+
+    The C++ core in src/ can be compiled into the `pesto._native`
+    extension module (see the README). When it's been built, a `Board`
+    created with `Backend.NATIVE` hands move generation and perft to
+    it, while keeping its own piece map in step so that the rest of
+    the Python API works unchanged.
+"""
+from enum import Enum
+from typing import Any
+
+try:
+    from pesto import _native  # type: ignore[attr-defined]
+except ImportError:
+    _native = None
+
+NATIVE_AVAILABLE: bool = _native is not None
+
+
+class Backend(Enum):
+    PYTHON: str = "python"
+    NATIVE: str = "native"
+
+
+def native_position(fen: str) -> Any:
+    """Creates a position in the C++ core from a FEN string"""
+    if _native is None:
+        raise RuntimeError(
+            "The native backend is not available, "
+            "build the pesto._native extension module first"
+        )
+    return _native.Position(fen)  # pylint: disable=c-extension-no-member
@@ -1,39 +1,302 @@
+import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Optional
 
+from pesto.board.backend import Position, position_from_fen
 from pesto.board.board import Board
-from pesto.board.move.legal import legal_move_generator
 
+# Rough size of one table entry: a slot in each of the three
+# entry lists, the 64-bit key and a tuple of a few node counts
+ENTRY_BYTES: int = 160
 
-def perft(board: Board, depth: int) -> Counter[int]:
+
+class ReplacementPolicy(Enum):
+    # Overwrite whatever is stored in the slot
+    ALWAYS: str = "always"
+    # Only overwrite entries holding an equal or shallower subtree,
+    # since deeper subtrees are the most expensive to recount
+    DEPTH_PREFERRED: str = "depth_preferred"
+
+
+@dataclass
+class PerftTable:
+    """Fixed-size table of subtree node counts, keyed by the
+    Zobrist key of a position and the depth searched below it.
+
+    size_mb: Approximate memory to use, rounded down to a
+        power of two number of entries
+    replacement: Which entry to keep when two positions
+        share a slot
+    """
+
+    size_mb: float = 16
+    replacement: ReplacementPolicy = ReplacementPolicy.DEPTH_PREFERRED
+    probes: int = field(default=0, init=False)
+    hits: int = field(default=0, init=False)
+    stores: int = field(default=0, init=False)
+    replacements: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        entries = max(1, int(self.size_mb * 2**20) // ENTRY_BYTES)
+        self._mask: int = (1 << (entries.bit_length() - 1)) - 1
+        self._keys: list[int] = [0] * self.entries
+        self._depths: list[int] = [0] * self.entries
+        self._counts: list[Optional[tuple[int, ...]]] = [None] * self.entries
+
+    @property
+    def entries(self) -> int:
+        """Number of subtrees the table can hold"""
+        return self._mask + 1
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of probes that found a stored subtree"""
+        return self.hits / self.probes if self.probes else 0.0
+
+    def _slot(self, key: int, depth: int) -> int:
+        # Spread the depths of one position over different slots
+        return (key ^ (depth * 0x9E3779B97F4A7C15)) & self._mask
+
+    def probe(self, key: int, depth: int) -> Optional[tuple[int, ...]]:
+        """Looks up the node counts at each level below the
+        position with `key`, searched `depth` levels deep
+        """
+        self.probes += 1
+        slot = self._slot(key, depth)
+        if self._keys[slot] != key or self._depths[slot] != depth:
+            return None
+
+        counts = self._counts[slot]
+        if counts is not None:
+            self.hits += 1
+        return counts
+
+    def store(self, key: int, depth: int, counts: tuple[int, ...]) -> None:
+        """Records the node counts below a position, subject
+        to the table's replacement policy
+        """
+        slot = self._slot(key, depth)
+        if self._counts[slot] is not None:
+            if (
+                self.replacement == ReplacementPolicy.DEPTH_PREFERRED
+                and depth < self._depths[slot]
+            ):
+                return
+            self.replacements += 1
+
+        self.stores += 1
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._counts[slot] = counts
+
+    def clear(self) -> None:
+        """Empties the table and resets its statistics"""
+        self._keys = [0] * self.entries
+        self._depths = [0] * self.entries
+        self._counts = [None] * self.entries
+        self.probes = self.hits = self.stores = self.replacements = 0
+
+
+def perft(
+    board: Position,
+    depth: int,
+    table: Optional[PerftTable] = None,
+    bulk: bool = False,
+) -> Counter[int]:
     """Counts distinct moves (nodes) at each level
     down the tree starting from the passed `board`,
     going `depth` levels.
 
-    Returns a counter shaped like `{depth: node_count}`
+    Returns a counter shaped like `{depth: node_count}`.
+    Moves are played on `board` in place and reverted as the
+    traversal unwinds, leaving it unchanged once complete.
+
+    table: When provided, counts of subtrees already seen via
+        a different move order are looked up in (and new ones
+        stored to) this table rather than recounted. Its hit
+        rate can be inspected once the count is complete.
+        Without a table, boards using the native backend are
+        counted entirely in the C++ core.
+    bulk: Count the moves of the final level rather than
+        playing each of them out
     """
-    return get_node_count(start_board=board, curr_depth=0, max_depth=depth)
+    native: Any = board.native_position if isinstance(board, Board) else None
+    if table is None and native is None:
+        return get_node_count(
+            start_board=board, curr_depth=0, max_depth=depth, bulk=bulk
+        )
 
+    if depth <= 0:
+        return Counter({1: 0})
+    if table is None:
+        # The whole walk happens in the C++ core
+        counts = tuple(native.perft(depth, bulk))
+    else:
+        counts = get_hashed_node_count(
+            start_board=board, depth=depth, table=table, bulk=bulk
+        )
+    return Counter(dict(enumerate(counts, start=1)))
 
-def get_node_count(start_board: Board, curr_depth: int, max_depth: int) -> Counter[int]:
+
+def get_node_count(
+    start_board: Position, curr_depth: int, max_depth: int, bulk: bool = False
+) -> Counter[int]:
     """Depth first traversal of positions that occur"""
     node_count = Counter({curr_depth + 1: 0})
 
     if curr_depth >= max_depth:
         return node_count
 
-    for move in legal_move_generator(
-        piece_map=start_board.piece_map,
-        to_move=start_board.to_move,
-        castle_rights=start_board.castle_rights,
-        en_passant_sq=start_board.en_passant_target,
-    ):
-        child_board = start_board.apply_move(move)
+    if bulk and curr_depth == max_depth - 1:
+        # The moves of the final level have no subtrees
+        # to walk, so they only need counting
+        node_count[curr_depth + 1] = start_board.count_legal_moves()
+        return node_count
+
+    for move in start_board.legal_moves():
+        # Walk the tree on a single board, reverting each
+        # move once its subtree has been counted
+        start_board.push(move)
         one_deeper = curr_depth + 1
         node_count += get_node_count(
-            start_board=child_board,
+            start_board=start_board,
             curr_depth=one_deeper,
             max_depth=max_depth,
+            bulk=bulk,
         )
+        start_board.pop()
         node_count[curr_depth + 1] += 1
 
     return node_count
+
+
+def get_hashed_node_count(
+    start_board: Position, depth: int, table: PerftTable, bulk: bool = False
+) -> tuple[int, ...]:
+    """Depth first traversal which consults `table` before counting
+    a subtree. Returns the node counts at each of the `depth`
+    levels below `start_board`, nearest first.
+    """
+    if (counts := table.probe(start_board.zobrist_key, depth)) is not None:
+        return counts
+
+    if bulk and depth == 1:
+        counts = (start_board.count_legal_moves(),)
+        table.store(start_board.zobrist_key, depth, counts)
+        return counts
+
+    totals = [0] * depth
+    for move in start_board.legal_moves():
+        totals[0] += 1
+        if depth == 1:
+            continue
+
+        start_board.push(move)
+        for level, count in enumerate(
+            get_hashed_node_count(
+                start_board=start_board, depth=depth - 1, table=table, bulk=bulk
+            ),
+            start=1,
+        ):
+            totals[level] += count
+        start_board.pop()
+
+    counts = tuple(totals)
+    table.store(start_board.zobrist_key, depth, counts)
+    return counts
+
+
+def parallel_perft(
+    board: Position,
+    depth: int,
+    workers: Optional[int] = None,
+    split_depth: int = 1,
+    bulk: bool = False,
+) -> Counter[int]:
+    """Counts the same nodes as `perft`, spreading the work
+    over a pool of processes.
+
+    The tree is walked `split_depth` levels deep in this process,
+    and the subtrees below each distinct position found there are
+    counted by the workers. Positions are sent to the workers as
+    FEN strings, and rebuilt with the same backend as `board`.
+
+    workers: Number of processes, defaulting to one per CPU
+    split_depth: Level of the tree at which to hand out work
+    bulk: Count the moves of the final level rather than
+        playing each of them out
+    """
+    split_depth = max(1, split_depth)
+    if depth <= split_depth:
+        return perft(board=board, depth=depth, bulk=bulk)
+
+    workers = workers or os.cpu_count() or 1
+    node_count: Counter[int] = Counter({1: 0})
+    # Transposed positions only need counting once, so
+    # each distinct FEN is sent along with its multiplicity
+    split_positions: Counter[str] = Counter()
+    _collect_split_positions(
+        board=board,
+        curr_depth=0,
+        split_depth=split_depth,
+        node_count=node_count,
+        split_positions=split_positions,
+    )
+
+    fens = list(split_positions)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        subtree_counts = executor.map(
+            _count_subtree,
+            [(board.backend_name, fen, depth - split_depth, bulk) for fen in fens],
+            # Several chunks per worker, to even out subtree sizes
+            chunksize=max(1, len(fens) // (4 * workers)),
+        )
+        for fen, subtree_count in zip(fens, subtree_counts):
+            for level, count in subtree_count.items():
+                node_count[split_depth + level] += count * split_positions[fen]
+
+    return node_count
+
+
+def _collect_split_positions(
+    board: Position,
+    curr_depth: int,
+    split_depth: int,
+    node_count: Counter[int],
+    split_positions: Counter[str],
+) -> None:
+    """Counts the nodes down to `split_depth`, gathering the
+    positions found there
+    """
+    if curr_depth == split_depth:
+        split_positions[_position_fen(board)] += 1
+        return
+
+    for move in board.legal_moves():
+        node_count[curr_depth + 1] += 1
+        board.push(move)
+        _collect_split_positions(
+            board=board,
+            curr_depth=curr_depth + 1,
+            split_depth=split_depth,
+            node_count=node_count,
+            split_positions=split_positions,
+        )
+        board.pop()
+
+
+def _position_fen(board: Position) -> str:
+    """FEN of `board` with the move clocks zeroed, as they
+    have no bearing on the moves available
+    """
+    return " ".join(board.to_fen().split()[:4] + ["0", "1"])
+
+
+def _count_subtree(job: tuple[str, str, int, bool]) -> Counter[int]:
+    """Worker side of `parallel_perft`"""
+    backend, fen, depth, bulk = job
+    board = position_from_fen(fen, backend=backend)
+    return perft(board=board, depth=depth, bulk=bulk)
@@ -3,17 +3,81 @@ from __future__ import annotations
 
 from abc import abstractmethod, abstractproperty
 from dataclasses import dataclass
-from typing import Optional, Union
+from typing import Optional, Type, TypeVar, Union, cast
 
-from pesto.board.square import Square
+from pesto.board.square import SQUARES_BY_VALUE, Square
 from pesto.board.utils import index_on_board
 from pesto.core.enums import Color, PieceType
 
-DIAG_OFFSETS: set[int] = {-15, -17, 15, 17}
-VERT_HORIZ_OFFSETS: set[int] = {-16, -1, 16, 1}
+KNIGHT_OFFSETS: tuple[int, ...] = (-33, -31, -18, -14, 14, 18, 31, 33)
+KING_OFFSETS: tuple[int, ...] = (-17, -16, -15, -1, 1, 15, 16, 17)
+DIAG_DIRECTIONS: tuple[int, ...] = (-17, -15, 15, 17)
+VERT_HORIZ_DIRECTIONS: tuple[int, ...] = (-16, -1, 1, 16)
 
+# A table holds an entry for every 0x88 index
+Rays = tuple[tuple[Square, ...], ...]
 
-@dataclass(eq=True, frozen=True)
+
+def _build_step_table(offsets: tuple[int, ...]) -> Rays:
+    """For every 0x88 index, the on-board squares a single
+    step away along each of `offsets`
+    """
+    return tuple(
+        tuple(
+            SQUARES_BY_VALUE[idx + offset]
+            for offset in offsets
+            if index_on_board(idx) and index_on_board(idx + offset)
+        )
+        for idx in range(128)
+    )
+
+
+def _build_ray_table(
+    directions: tuple[int, ...], slides: bool = True
+) -> tuple[Rays, ...]:
+    """For every 0x88 index, the on-board squares along each
+    of `directions`, ordered outward from the index.
+
+    slides: When false, rays stop after a single step, and
+        directions leading off the board are left out
+    """
+    table: list[Rays] = []
+    for idx in range(128):
+        rays: list[tuple[Square, ...]] = []
+        for direction in directions if index_on_board(idx) else ():
+            ray: list[Square] = []
+            step = idx + direction
+            while index_on_board(step):
+                ray.append(SQUARES_BY_VALUE[step])
+                if not slides:
+                    break
+                step += direction
+            if ray or slides:
+                rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return tuple(table)
+
+
+KNIGHT_TABLE = _build_step_table(KNIGHT_OFFSETS)
+KING_TABLE = _build_step_table(KING_OFFSETS)
+# Squares a pawn of the keyed color must stand on to attack the
+# indexed square, i.e. one rank behind it diagonally
+PAWN_ATTACKER_TABLE: dict[Color, Rays] = {
+    Color.WHITE: _build_step_table((-17, -15)),
+    Color.BLACK: _build_step_table((15, 17)),
+}
+DIAG_RAYS = _build_ray_table(DIAG_DIRECTIONS)
+VERT_HORIZ_RAYS = _build_ray_table(VERT_HORIZ_DIRECTIONS)
+QUEEN_RAYS = tuple(diag + vert for diag, vert in zip(DIAG_RAYS, VERT_HORIZ_RAYS))
+# Knight and king moves as rays of a single square, so that
+# every piece but the pawn walks its moves the same way
+KNIGHT_RAYS = _build_ray_table(KNIGHT_OFFSETS, slides=False)
+KING_RAYS = _build_ray_table(KING_OFFSETS, slides=False)
+
+_P = TypeVar("_P", bound="Piece")
+
+
+@dataclass(eq=True, frozen=True, slots=True)
 class Piece:
     color: Color
     curr: Square
@@ -24,9 +88,11 @@ class Piece:
         pass
 
     @classmethod
-    @abstractmethod
-    def new(cls, color: Color, curr: Square) -> Piece:
-        pass
+    def new(cls: Type[_P], color: Color, curr: Square) -> _P:
+        """Looks up the shared instance of this piece, rather
+        than creating a new one
+        """
+        return cast(_P, PIECE_TABLE[cls, color, curr])
 
     @abstractmethod
     def generate_psuedo_legal_moves(
@@ -37,19 +103,13 @@ class Piece:
         pass
 
 
-@dataclass(eq=True, frozen=True)
+@dataclass(eq=True, frozen=True, slots=True)
 class NonPawnPiece(Piece):
     @property
     @abstractproperty
-    def _slides(self) -> bool:
-        """Is the piece a sliding piece (queen, rook, bishop) or
-        not (knight and king only make one hop)"""
-
-    @property
-    @abstractproperty
-    def _offsets(self) -> set[int]:
-        """Contains offsets required for the possible locations
-        of a piece's next move"""
+    def _rays(self) -> tuple[Rays, ...]:
+        """Table of the squares the piece moves along from each
+        square, one ray per direction, ordered outward"""
 
     def generate_psuedo_legal_moves(
         self, piece_map: dict[Square, Piece], en_passant_sq: Optional[Square] = None
@@ -59,48 +119,30 @@ class NonPawnPiece(Piece):
         pieces on the board.
         """
         moves: set[SinglePieceMove] = set()
-        start_square: Square = self.curr
-
-        for offset in self._offsets:
-            blocked: bool = False
-            square: Square = self.curr
-
-            while not blocked:
-                if not index_on_board(square.value + offset):
-                    break
+        new = self.new
+        color = self.color
+        start = new(color, self.curr)
 
-                square = Square(square.value + offset)
+        # Walk out along each ray until the first piece in the way
+        for ray in self._rays[self.curr]:
+            for square in ray:
                 if (piece := piece_map.get(square)) is not None:
-                    if piece.color != self.color:
-                        moves.add(
-                            SinglePieceMove(
-                                start=self.new(self.color, start_square),
-                                end=self.new(self.color, square),
-                            )
-                        )
+                    if piece.color != color:
+                        moves.add(SinglePieceMove(start=start, end=new(color, square)))
                     break
 
-                moves.add(
-                    SinglePieceMove(
-                        start=self.new(self.color, start_square),
-                        end=self.new(self.color, square),
-                    )
-                )
-                if not self._slides:
-                    break
+                moves.add(SinglePieceMove(start=start, end=new(color, square)))
 
         return moves
 
 
 class Pawn(Piece):
+    __slots__ = ()
+
     @property
     def type(self) -> PieceType:
         return PieceType.PAWN
 
-    @classmethod
-    def new(cls, color: Color, curr: Square) -> Pawn:
-        return Pawn(color, curr)
-
     def generate_psuedo_legal_moves(
         self,
         piece_map: dict[Square, Piece],
@@ -110,30 +152,25 @@ class Pawn(Piece):
         rules of a pawn along with the placement of other
         pieces on the board.
         """
-        direction = 1 if self.color == Color.WHITE else -1
-        start_square: Square = self.curr
+        color = self.color
+        direction = 1 if color == Color.WHITE else -1
+        start = self.new(color, self.curr)
         moves: set[SinglePieceMove] = set()
         next_idx: int
         capture_idx: int
 
         # Check one and two squares forward
         forward_squares: list[int] = [1]
-        if (
-            # Is the pawn on it's starting rank
-            (self.color == Color.WHITE and 15 < self.curr.value < 24)
-            or (self.color == Color.BLACK and 95 < self.curr.value < 104)
-        ):
+        if self.curr >> 4 == (1 if color == Color.WHITE else 6):
+            # Pawn is on it's starting rank
             forward_squares.append(2)
 
         for n_squares in forward_squares:
-            next_idx = self.curr.value + (n_squares * 16 * direction)
+            next_idx = self.curr + (n_squares * 16 * direction)
             if index_on_board(next_idx):
-                if Square(next_idx) not in piece_map:
+                if (next_square := SQUARES_BY_VALUE[next_idx]) not in piece_map:
                     moves.add(
-                        SinglePieceMove(
-                            start=self.new(self.color, curr=start_square),
-                            end=self.new(self.color, curr=Square(next_idx)),
-                        )
+                        SinglePieceMove(start=start, end=self.new(color, next_square))
                     )
                 else:
                     # If moving a single space forward is blocked,
@@ -141,47 +178,47 @@ class Pawn(Piece):
                     break
 
         # Check captures left and right
-        for capture_offset in [15, 17]:
-            capture_idx = self.curr.value + (capture_offset * direction)
-            if index_on_board(capture_idx):
-                if (piece := piece_map.get(Square(capture_idx))) is not None:
-                    if piece.color != self.color:
-                        moves.add(
-                            SinglePieceMove(
-                                start=self.new(self.color, curr=start_square),
-                                end=self.new(self.color, curr=Square(capture_idx)),
-                            )
-                        )
-                elif Square(capture_idx) == en_passant_sq:
-                    # Capturing en passant is possible
-                    op_color = Color.WHITE if self.color == Color.BLACK else Color.BLACK
-                    captured_pawn_square = Square(capture_idx - 16 * direction)
+        for capture_offset in (15, 17):
+            capture_idx = self.curr + (capture_offset * direction)
+            if not index_on_board(capture_idx):
+                continue
+
+            capture_square = SQUARES_BY_VALUE[capture_idx]
+            if (piece := piece_map.get(capture_square)) is not None:
+                if piece.color != color:
                     moves.add(
                         SinglePieceMove(
-                            start=self.new(self.color, curr=start_square),
-                            end=self.new(self.color, curr=en_passant_sq),
-                            captures=self.new(op_color, curr=captured_pawn_square),
+                            start=start, end=self.new(color, capture_square)
                         )
                     )
+            elif capture_square == en_passant_sq:
+                # Capturing en passant is possible
+                op_color = Color.WHITE if color == Color.BLACK else Color.BLACK
+                moves.add(
+                    SinglePieceMove(
+                        start=start,
+                        end=self.new(color, capture_square),
+                        captures=self.new(
+                            op_color, SQUARES_BY_VALUE[capture_idx - 16 * direction]
+                        ),
+                    )
+                )
 
         # Check for promotion possibilities
-        color_offset: int = 0 if self.color == Color.BLACK else 112
-        back_rank_squares: set[Square] = {
-            Square(idx + color_offset) for idx in list(range(8))
-        }
+        back_rank = 7 if color == Color.WHITE else 0
         final_moves: set[SinglePieceMove] = set()
         for move in moves:
-            if move.end.curr not in back_rank_squares:
+            if move.end.curr >> 4 != back_rank:
                 final_moves.add(move)
                 continue
 
             # Pawn promotes - disregard pawn move and add new
             # moves for each possible promotion piece instead
-            for promotion_piece in [Knight, Bishop, Rook, Queen]:
+            for promotion_piece in (Knight, Bishop, Rook, Queen):
                 final_moves.add(
                     SinglePieceMove(
-                        start=self.new(self.color, curr=move.start.curr),
-                        end=promotion_piece.new(self.color, move.end.curr),
+                        start=start,
+                        end=promotion_piece.new(color, move.end.curr),
                     )
                 )
 
@@ -189,112 +226,80 @@ class Pawn(Piece):
 
 
 class Knight(NonPawnPiece):
+    __slots__ = ()
+
     @property
     def type(self) -> PieceType:
         return PieceType.KNIGHT
 
     @property
-    def _slides(self) -> bool:
-        return False
-
-    @property
-    def _offsets(self) -> set[int]:
-        return {-33, -18, 14, 31, 33, 18, -14, -31}
-
-    @classmethod
-    def new(cls, color: Color, curr: Square) -> Knight:
-        return Knight(color, curr)
+    def _rays(self) -> tuple[Rays, ...]:
+        return KNIGHT_RAYS
 
 
 class Bishop(NonPawnPiece):
+    __slots__ = ()
+
     @property
     def type(self) -> PieceType:
         return PieceType.BISHOP
 
     @property
-    def _slides(self) -> bool:
-        return True
-
-    @property
-    def _offsets(self) -> set[int]:
-        return DIAG_OFFSETS
-
-    @classmethod
-    def new(cls, color: Color, curr: Square) -> Bishop:
-        return Bishop(color, curr)
+    def _rays(self) -> tuple[Rays, ...]:
+        return DIAG_RAYS
 
 
 class Rook(NonPawnPiece):
+    __slots__ = ()
+
     @property
     def type(self) -> PieceType:
         return PieceType.ROOK
 
     @property
-    def _slides(self) -> bool:
-        return True
-
-    @property
-    def _offsets(self) -> set[int]:
-        return VERT_HORIZ_OFFSETS
-
-    @classmethod
-    def new(cls, color: Color, curr: Square) -> Rook:
-        return Rook(color, curr)
+    def _rays(self) -> tuple[Rays, ...]:
+        return VERT_HORIZ_RAYS
 
 
 class Queen(NonPawnPiece):
+    __slots__ = ()
+
     @property
     def type(self) -> PieceType:
         return PieceType.QUEEN
 
     @property
-    def _slides(self) -> bool:
-        return True
-
-    @property
-    def _offsets(self) -> set[int]:
-        return DIAG_OFFSETS | VERT_HORIZ_OFFSETS
-
-    @classmethod
-    def new(cls, color: Color, curr: Square) -> Queen:
-        return Queen(color, curr)
+    def _rays(self) -> tuple[Rays, ...]:
+        return QUEEN_RAYS
 
 
 class King(NonPawnPiece):
+    __slots__ = ()
+
     @property
     def type(self) -> PieceType:
         return PieceType.KING
 
     @property
-    def _slides(self) -> bool:
-        return False
-
-    @property
-    def _offsets(self) -> set[int]:
-        return DIAG_OFFSETS | VERT_HORIZ_OFFSETS
+    def _rays(self) -> tuple[Rays, ...]:
+        return KING_RAYS
 
-    @classmethod
-    def new(cls, color: Color, curr: Square) -> King:
-        return King(color, curr)
 
-
-@dataclass(eq=True, frozen=True)
+@dataclass(eq=True, frozen=True, slots=True)
 class BaseMove:
     start: Piece
     end: Piece
 
     def __lt__(self, other: BaseMove) -> bool:
-        return (self.start.curr.value + self.end.curr.value) < (
-            other.start.curr.value + other.end.curr.value
-        )
+        return (self.start.curr + self.end.curr) < (other.start.curr + other.end.curr)
 
 
-@dataclass(eq=True, frozen=True)
+@dataclass(eq=True, frozen=True, slots=True)
 class SinglePieceMove(BaseMove):
     captures: Optional[Piece] = None
 
 
-@dataclass(eq=True, frozen=True)
+@dataclass(eq=True, frozen=True, slots=True)
 class CastlingMove(BaseMove):
     # Castling is mainly representated by the king move;
     # this slot holds the corresponding rook move
@@ -302,3 +307,12 @@ class CastlingMove(BaseMove):
 
 
 Move = Union[SinglePieceMove, CastlingMove]
+
+# Every piece that can stand on the board, created up front so that
+# `Piece.new` hands out shared instances instead of allocating
+PIECE_TABLE: dict[tuple[type[Piece], Color, Square], Piece] = {
+    (piece_type, color, square): piece_type(color, square)
+    for piece_type in (Pawn, Knight, Bishop, Rook, Queen, King)
+    for color in Color
+    for square in Square
+}
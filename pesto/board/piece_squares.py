@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterator
+
+from pesto.board.piece import (
+    Bishop,
+    CastlingMove,
+    King,
+    Knight,
+    Move,
+    Pawn,
+    Piece,
+    Queen,
+    Rook,
+)
+from pesto.board.square import Square
+from pesto.core.enums import Color
+
+PIECE_TYPES: tuple[type[Piece], ...] = (Pawn, Knight, Bishop, Rook, Queen, King)
+NON_KING_TYPES: tuple[type[Piece], ...] = PIECE_TYPES[:-1]
+
+
+@dataclass(slots=True)
+class PieceSquares:
+    """Squares held by each piece type of each color, kept alongside
+    a piece map so that move generation and attack detection can
+    visit only the pieces they need rather than scanning the map.
+
+    Kept in step with the map by replaying moves with `play` and
+    `revert`, as they are made and unmade on it.
+    """
+
+    squares: dict[tuple[Color, type[Piece]], set[Square]]
+    # Location of each side's king, if it has one
+    kings: dict[Color, Square]
+
+    @classmethod
+    def from_piece_map(cls, piece_map: dict[Square, Piece]) -> PieceSquares:
+        """Collects the squares of the pieces in `piece_map`"""
+        squares: dict[tuple[Color, type[Piece]], set[Square]] = {
+            (color, piece_type): set() for color in Color for piece_type in PIECE_TYPES
+        }
+        kings: dict[Color, Square] = {}
+        for square, piece in piece_map.items():
+            squares[piece.color, type(piece)].add(square)
+            if isinstance(piece, King):
+                kings[piece.color] = square
+        return PieceSquares(squares=squares, kings=kings)
+
+    def of(
+        self, color: Color, piece_types: tuple[type[Piece], ...] = PIECE_TYPES
+    ) -> Iterator[Square]:
+        """Squares held by the pieces of `color` of any of `piece_types`"""
+        return chain.from_iterable(
+            self.squares[color, piece_type] for piece_type in piece_types
+        )
+
+    def play(self, move: Move) -> None:
+        """Moves the pieces of `move`, as returned by `make_move_in_place`"""
+        start, end = move.start, move.end
+        self.squares[start.color, type(start)].remove(start.curr)
+        self.squares[end.color, type(end)].add(end.curr)
+        if isinstance(start, King):
+            self.kings[start.color] = end.curr
+
+        if isinstance(move, CastlingMove):
+            rook = move.castled_rook
+            self.squares[rook.start.color, Rook].remove(rook.start.curr)
+            self.squares[rook.end.color, Rook].add(rook.end.curr)
+        elif (captured := move.captures) is not None:
+            self.squares[captured.color, type(captured)].remove(captured.curr)
+
+    def revert(self, move: Move) -> None:
+        """Puts back the pieces of a `move` replayed with `play`"""
+        start, end = move.start, move.end
+        self.squares[end.color, type(end)].remove(end.curr)
+        self.squares[start.color, type(start)].add(start.curr)
+        if isinstance(start, King):
+            self.kings[start.color] = start.curr
+
+        if isinstance(move, CastlingMove):
+            rook = move.castled_rook
+            self.squares[rook.end.color, Rook].remove(rook.end.curr)
+            self.squares[rook.start.color, Rook].add(rook.start.curr)
+        elif (captured := move.captures) is not None:
+            self.squares[captured.color, type(captured)].add(captured.curr)
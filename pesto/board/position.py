@@ -0,0 +1,201 @@
+"""
+    Position state shared by the board representations
+
+    `Board` and `BitBoard` place their pieces differently, but keep
+    the side to move, clocks, castling rights, en passant target and
+    Zobrist key the same way. `PositionState` holds the handling of
+    those: reading and writing them in FEN, comparing positions, and
+    updating and restoring them as moves are pushed and popped.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Optional, cast
+
+from pesto.board.board_state import (
+    find_en_passant_target,
+    update_castle_rights,
+    update_halfmove_clock,
+)
+from pesto.board.fen import (
+    dump_castling_rights_to_fen,
+    dump_en_passant_target_to_fen,
+    parse_fen_castling_rights,
+    parse_fen_en_passant_target,
+)
+from pesto.board.move.castle import CastleRights
+from pesto.board.piece import Move
+from pesto.board.square import Square
+from pesto.board.zobrist import update_key
+from pesto.core.enums import Color
+
+
+@dataclass(frozen=True, slots=True)
+class UndoRecord:
+    """Board state required to revert a move played with `push`"""
+
+    move: Move
+    halfmove_clock: int
+    castle_rights: CastleRights
+    en_passant_target: Optional[Square]
+    zobrist_key: int
+
+
+@dataclass(slots=True, eq=False)
+class PositionState(ABC):
+    """Base of the board representations, which add where their
+    pieces are and implement the abstract methods handling them
+    """
+
+    ply: int
+    halfmove_clock: int
+    to_move: Color
+    castle_rights: CastleRights
+    en_passant_target: Optional[Square]
+    _undo_stack: list[UndoRecord] = field(
+        default_factory=list, repr=False, kw_only=True
+    )
+    # Computed from the position when not provided
+    _zobrist_key: Optional[int] = field(default=None, repr=False, kw_only=True)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        # Differing keys rule out a match cheaply, but equal
+        # keys may still be a collision of different positions
+        return (
+            self.zobrist_key == other.zobrist_key
+            and self._pieces() == other._pieces()
+            and self.to_move == other.to_move
+            and self.castle_rights == other.castle_rights
+            and self.en_passant_target == other.en_passant_target
+            and self.halfmove_clock == other.halfmove_clock
+            and self.ply == other.ply
+        )
+
+    def __hash__(self) -> int:
+        return self.zobrist_key
+
+    @property
+    def zobrist_key(self) -> int:
+        """64-bit Zobrist hash of the position (pieces, side to move,
+        castling rights and en passant file), kept up to date as
+        moves are played. Changes made directly to the pieces
+        are not reflected.
+        """
+        return cast(int, self._zobrist_key)
+
+    @abstractmethod
+    def _pieces(self) -> object:
+        """The pieces, comparable between boards of this representation"""
+
+    @abstractmethod
+    def _pieces_to_fen(self) -> str:
+        """The piece placement field of a FEN string"""
+
+    @abstractmethod
+    def _make(self, move: Move) -> Move:
+        """Moves the pieces for `push`, returning the move as it was
+        played (i.e. with any captured piece filled in)
+        """
+
+    @abstractmethod
+    def _unmake(self, move: Move) -> None:
+        """Moves the pieces back for `pop`, once `move`
+        is off the undo stack
+        """
+
+    @staticmethod
+    def _parse_fen(fen: str) -> tuple[str, dict[str, Any]]:
+        """Splits a FEN string into its piece placement field
+        and the remaining position state, keyed by attribute
+        """
+        (
+            pieces,
+            color,
+            castling,
+            en_passant,
+            halfmove_clock,
+            fullmove_count,
+        ) = fen.split()
+
+        to_move = Color.WHITE if color == "w" else Color.BLACK
+        ply = (int(fullmove_count) * 2) - 1
+        if to_move == Color.BLACK:
+            ply += 1
+
+        return pieces, {
+            "ply": ply,
+            "halfmove_clock": int(halfmove_clock),
+            "to_move": to_move,
+            "castle_rights": parse_fen_castling_rights(castling),
+            "en_passant_target": parse_fen_en_passant_target(en_passant),
+        }
+
+    def to_fen(self) -> str:
+        """Dumps the current board state to a FEN string"""
+        pieces = self._pieces_to_fen()
+        color = "w" if self.to_move == Color.WHITE else "b"
+        castling = dump_castling_rights_to_fen(self.castle_rights)
+        en_passant = dump_en_passant_target_to_fen(self.en_passant_target)
+        halfmove = str(self.halfmove_clock)
+        _fullmove_extra = 1 if self.to_move == Color.WHITE else 0
+        fullmove = str((self.ply // 2) + _fullmove_extra)
+
+        fen_components = [pieces, color, castling, en_passant, halfmove, fullmove]
+        return " ".join(fen_components)
+
+    def push(self, move: Move) -> None:
+        """Play `move` on this board in place, recording what's
+        needed to revert it with `pop`. Castling without the right
+        to raises a `ValueError`, leaving the board untouched.
+        """
+        self._undo_stack.append(self._play(move))
+
+    def _play(self, move: Move) -> UndoRecord:
+        """Plays `move` on this board in place, returning what's needed
+        to revert it without recording that on the undo stack
+        """
+        castle_rights = update_castle_rights(self.castle_rights, move=move)
+        played_move = self._make(move)
+        undo = UndoRecord(
+            move=played_move,
+            halfmove_clock=self.halfmove_clock,
+            castle_rights=self.castle_rights,
+            en_passant_target=self.en_passant_target,
+            zobrist_key=self.zobrist_key,
+        )
+        en_passant_target = find_en_passant_target(move=played_move)
+        self._zobrist_key = update_key(
+            key=self.zobrist_key,
+            move=played_move,
+            castle_rights=(self.castle_rights, castle_rights),
+            en_passant_target=(self.en_passant_target, en_passant_target),
+        )
+        self.ply += 1
+        self.halfmove_clock = update_halfmove_clock(
+            clock=self.halfmove_clock, move=played_move
+        )
+        self.to_move = Color.WHITE if self.to_move == Color.BLACK else Color.BLACK
+        self.castle_rights = castle_rights
+        self.en_passant_target = en_passant_target
+        return undo
+
+    def pop(self) -> Move:
+        """Revert the most recent move played with `push`,
+        returning the move as it was played
+        """
+        if not self._undo_stack:
+            raise IndexError("No moves have been pushed to revert")
+
+        undo = self._undo_stack.pop()
+        self._unmake(undo.move)
+
+        self.ply -= 1
+        self.halfmove_clock = undo.halfmove_clock
+        self.to_move = Color.WHITE if self.to_move == Color.BLACK else Color.BLACK
+        self.castle_rights = undo.castle_rights
+        self.en_passant_target = undo.en_passant_target
+        self._zobrist_key = undo.zobrist_key
+        return undo.move
@@ -1,8 +1,18 @@
-from enum import Enum
+from enum import Enum, IntEnum
+from typing import cast
 
 
-class Square(Enum):
-    """Represents square indices on a 0x88 (16x8) board"""
+class Square(IntEnum):
+    """Represents square indices on a 0x88 (16x8) board.
+
+    Squares are ints, so they hash and compare as cheaply as their
+    index and can index lookup tables or take part in arithmetic
+    directly, without going through `.value`.
+    """
+
+    # Print as enum members rather than as the plain index
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
 
     A1: int = 0
     B1: int = 1
@@ -75,3 +85,23 @@ def str_to_square(string: str) -> Square:
     if len(string) != 2:
         raise ValueError(f"Expected a single square, received {string}")
     return Square[string.upper()]
+
+
+# Maps 0x88 indices to their `Square`, far cheaper than calling
+# `Square(idx)`. Indices off the board map to `None`, so check
+# `index_on_board` before looking one up.
+_SQUARES: dict[int, Square] = {square.value: square for square in Square}
+SQUARES_BY_VALUE: tuple[Square, ...] = cast(
+    tuple[Square, ...], tuple(_SQUARES.get(idx) for idx in range(128))
+)
+
+# Maps a1=0 .. h8=63 square indices (as used by bitboards and
+# packed moves) to their 0x88 `Square`
+SQUARES_BY_INDEX: tuple[Square, ...] = tuple(
+    Square(idx + (idx & ~7)) for idx in range(64)
+)
+
+
+def square_to_index(square: Square) -> int:
+    """Maps a 0x88 `Square` to its a1=0 .. h8=63 index"""
+    return (square + (square & 7)) >> 1
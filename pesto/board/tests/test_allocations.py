@@ -0,0 +1,65 @@
+import sys
+import tracemalloc
+
+import pytest
+
+from pesto.board.allocations import allocation_report, format_report
+from pesto.board.board import Board
+from pesto.board.native import NATIVE_AVAILABLE, Backend
+from pesto.cli import main
+
+
+@pytest.mark.unit
+def test_allocation_report():
+    previous = sys.gettrace()
+    report = allocation_report(board=Board.new(), depth=2)
+
+    assert report.nodes == 20 + 400
+    assert report.bytes_per_node > 0
+    assert report.objects_per_node > 0
+    sizes = [line.bytes_per_node for line in report.lines]
+    assert sizes == sorted(sizes, reverse=True)
+    # Each node's counter and undo record
+    assert any("board/perft.py" in line.location for line in report.lines)
+    assert any("board/position.py" in line.location for line in report.lines)
+
+    assert sys.gettrace() is previous
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.unit
+def test_allocation_report_temporaries(monkeypatch: pytest.MonkeyPatch):
+    def count_legal_moves(_board: Board) -> int:
+        return len(bytearray(100_000)) // 5_000
+
+    monkeypatch.setattr(Board, "count_legal_moves", count_legal_moves)
+    report = allocation_report(board=Board.new(), depth=1, bulk=True)
+
+    # Memory freed again on the same line is still counted
+    assert report.nodes == 20
+    assert report.lines[0].location.startswith(f"{__file__}:")
+    assert report.lines[0].bytes_per_node * report.nodes > 99_000
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not NATIVE_AVAILABLE, reason="native backend is not built")
+def test_allocation_report_native():
+    board = Board.from_fen(Board.new().to_fen(), backend=Backend.NATIVE)
+    with pytest.raises(ValueError):
+        allocation_report(board=board, depth=1)
+
+
+@pytest.mark.unit
+def test_allocation_report_json():
+    report = allocation_report(board=Board.new(), depth=2, bulk=True)
+    data = report.to_json(limit=3)
+    assert data["nodes"] == report.nodes
+    assert len(data["lines"]) == min(3, len(report.lines))
+    assert format_report(report, limit=3).count("\n") == 1 + len(data["lines"])
+
+
+@pytest.mark.unit
+def test_perft_command_allocations(capsys: pytest.CaptureFixture):
+    fen = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+    assert main(["perft", fen, "2", "--allocations"]) == 0
+    assert "bytes/node" in capsys.readouterr().out
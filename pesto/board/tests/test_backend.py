@@ -0,0 +1,70 @@
+# pylint: disable=protected-access
+import pytest
+
+from pesto.board import backend as backend_module
+from pesto.board.backend import (
+    BACKEND_ENV_VAR,
+    PositionBackend,
+    available_backends,
+    get_backend,
+    position_from_fen,
+)
+from pesto.board.bitboard import BitBoard
+from pesto.board.board import Board
+
+
+@pytest.mark.unit
+def test_default_backend(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv(BACKEND_ENV_VAR, raising=False)
+    assert isinstance(position_from_fen(Board.new().to_fen()), Board)
+
+
+@pytest.mark.unit
+def test_backend_from_env_var(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(BACKEND_ENV_VAR, "bitboard")
+    assert isinstance(position_from_fen(Board.new().to_fen()), BitBoard)
+    # Naming a backend takes precedence over the environment
+    assert isinstance(position_from_fen(Board.new().to_fen(), "python"), Board)
+
+
+@pytest.mark.unit
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend("abacus")
+
+
+@pytest.mark.unit
+def test_unavailable_backend(monkeypatch: pytest.MonkeyPatch):
+    unavailable = PositionBackend(
+        name="unbuilt", from_fen=Board.from_fen, available=False
+    )
+    monkeypatch.setitem(backend_module._BACKENDS, unavailable.name, unavailable)
+
+    with pytest.raises(RuntimeError):
+        get_backend("unbuilt")
+    assert unavailable not in available_backends()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    ],
+)
+def test_backends_agree(fen: str):
+    """Every available backend holds the same position"""
+    reference = Board.from_fen(fen)
+    for backend in available_backends():
+        position = backend.from_fen(fen)
+        assert position.backend_name == backend.name
+        assert position.to_fen() == fen
+        assert position.zobrist_key == reference.zobrist_key
+        assert position.legal_moves() == reference.legal_moves()
+
+        move = next(iter(position.legal_moves()))
+        position.push(move)
+        assert position.zobrist_key == reference.apply_move(move).zobrist_key
+        position.pop()
+        assert position.to_fen() == fen
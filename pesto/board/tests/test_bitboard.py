@@ -0,0 +1,79 @@
+import pytest
+from pytest_cases import parametrize_with_cases
+
+from pesto.board.bitboard import BitBoard
+from pesto.board.board import Board
+from pesto.board.piece import CastlingMove
+from pesto.board.tests.test_bitboard_cases import TestBitBoardFenCases
+
+
+class TestBitBoard:
+    @pytest.mark.unit
+    @parametrize_with_cases("fen", TestBitBoardFenCases)
+    def test_fen_round_trip(self, fen: str):
+        obs = BitBoard.from_fen(fen)
+        assert obs.to_fen() == fen
+        assert obs.piece_map == Board.from_fen(fen).piece_map
+
+    @pytest.mark.unit
+    @parametrize_with_cases("fen", TestBitBoardFenCases)
+    def test_legal_moves_match_board(self, fen: str):
+        obs = BitBoard.from_fen(fen).legal_moves()
+        exp = Board.from_fen(fen).legal_moves()
+        assert obs == exp
+
+    @pytest.mark.unit
+    @parametrize_with_cases("fen", TestBitBoardFenCases)
+    def test_count_legal_moves(self, fen: str):
+        obs = BitBoard.from_fen(fen).count_legal_moves()
+        assert obs == len(Board.from_fen(fen).legal_moves())
+
+    @pytest.mark.unit
+    @parametrize_with_cases("fen", TestBitBoardFenCases)
+    def test_push_and_pop(self, fen: str):
+        """Pushing a move matches the `Board` backend, and
+        popping it restores the original board
+        """
+        board = BitBoard.from_fen(fen)
+        for move in board.legal_moves():
+            exp = Board.from_fen(fen).apply_move(move)
+            board.push(move)
+            assert board.to_fen() == exp.to_fen()
+            assert board.zobrist_key == exp.zobrist_key
+
+            board.pop()
+            assert board.to_fen() == fen
+            assert board.zobrist_key == Board.from_fen(fen).zobrist_key
+
+    @pytest.mark.unit
+    def test_new(self):
+        assert BitBoard.new().to_fen() == Board.new().to_fen()
+
+    @pytest.mark.unit
+    def test_castling_without_rights_raises(self):
+        (castle,) = [
+            move
+            for move in BitBoard.from_fen(
+                "4k3/8/8/8/8/8/8/4K2R w K - 0 1"
+            ).legal_moves()
+            if isinstance(move, CastlingMove)
+        ]
+        fen = "4k3/8/8/8/8/8/8/4K2R w - - 0 1"
+        board = BitBoard.from_fen(fen)
+        with pytest.raises(ValueError):
+            board.push(castle)
+        assert board.to_fen() == fen
+
+    @pytest.mark.unit
+    def test_apply_move_leaves_nothing_to_pop(self):
+        board = BitBoard.new()
+        child = board.apply_move(next(iter(board.legal_moves())))
+        with pytest.raises(IndexError):
+            child.pop()
+
+    @pytest.mark.unit
+    def test_from_fen_of_subclass(self):
+        class TracedBitBoard(BitBoard):
+            pass
+
+        assert isinstance(TracedBitBoard.new(), TracedBitBoard)
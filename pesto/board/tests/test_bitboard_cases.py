@@ -0,0 +1,36 @@
+_TestFenCase = str
+
+
+class TestBitBoardFenCases:
+    def case_starting_position(self) -> _TestFenCase:
+        return "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+    def case_caro_kann_fantasy(self) -> _TestFenCase:
+        return "rnbqkbnr/pp2pppp/2p5/3p4/3PP3/5P2/PPP3PP/RNBQKBNR b KQkq - 0 3"
+
+    def case_en_passant(self) -> _TestFenCase:
+        return "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"
+
+    def case_castling_and_promotions(self) -> _TestFenCase:
+        return "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+
+    def case_kiwipete(self) -> _TestFenCase:
+        return "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+    def case_en_passant_pinned_along_rank(self) -> _TestFenCase:
+        return "8/2p5/3p4/KP5r/1R2Pp1k/8/6P1/8 b - e3 0 1"
+
+    def case_black_in_check(self) -> _TestFenCase:
+        return "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R b KQ - 1 8"
+
+    def case_double_check(self) -> _TestFenCase:
+        return "4k3/8/8/8/1b6/8/8/r3K1N1 w - - 0 1"
+
+    def case_pinned_pieces(self) -> _TestFenCase:
+        return "4k3/8/4r3/1b6/8/2P1N3/8/4K3 w - - 0 1"
+
+    def case_pinned_pawn_captures_pinner(self) -> _TestFenCase:
+        return "4k3/8/8/8/8/2b5/3P4/4K3 w - - 0 1"
+
+    def case_check_blocked_by_pawn(self) -> _TestFenCase:
+        return "4k3/8/8/8/r7/8/1P6/K7 w - - 0 1"
@@ -2,10 +2,16 @@ import pytest
 from pytest_cases import parametrize_with_cases
 
 from pesto.board.board import Board
+from pesto.board.move.castle import CastleSide
+from pesto.board.move.legal import legal_move_generator
+from pesto.board.piece import CastlingMove
+from pesto.board.square import Square
 from pesto.board.tests.test_board_cases import (
     TestBoardFromFenCases,
+    TestBoardPushPopCases,
     TestBoardToFenCases,
 )
+from pesto.core.enums import Color
 
 
 class TestBoard:
@@ -26,3 +32,161 @@ class TestBoard:
     def test_to_fen(self, board: Board, exp: str):
         obs = board.to_fen()
         assert obs == exp
+
+    @pytest.mark.unit
+    @parametrize_with_cases("fen", TestBoardPushPopCases)
+    def test_push_and_pop(self, fen: str):
+        """Pushing a move matches `apply_move`, and popping it
+        restores the original board
+        """
+        board = Board.from_fen(fen)
+        for move in legal_move_generator(
+            piece_map=board.piece_map,
+            to_move=board.to_move,
+            castle_rights=board.castle_rights,
+            en_passant_sq=board.en_passant_target,
+        ):
+            exp = board.apply_move(move)
+            board.push(move)
+            assert board.to_fen() == exp.to_fen()
+
+            board.pop()
+            assert board.to_fen() == fen
+
+    @pytest.mark.unit
+    @parametrize_with_cases("fen", TestBoardPushPopCases)
+    def test_zobrist_key_is_updated_incrementally(self, fen: str):
+        """Keys kept up to date by `push`, `pop` and `apply_move`
+        match the key computed from scratch
+        """
+        board = Board.from_fen(fen)
+        start_key = board.zobrist_key
+        for move in board.legal_moves():
+            exp = board.apply_move(move)
+            board.push(move)
+            assert board.zobrist_key == exp.zobrist_key
+            assert board.zobrist_key == Board.from_fen(board.to_fen()).zobrist_key
+
+            for reply in board.legal_moves():
+                board.push(reply)
+                assert board.zobrist_key == Board.from_fen(board.to_fen()).zobrist_key
+                board.pop()
+
+            board.pop()
+            assert board.zobrist_key == start_key
+
+    @pytest.mark.unit
+    def test_zobrist_key_of_transposition(self):
+        """Reaching the same position by a different move
+        order gives the same key
+        """
+        board = Board.new()
+        for fen in [
+            "rnbqkbnr/pppppppp/8/8/8/5N2/PPPPPPPP/RNBQKB1R b KQkq - 1 1",
+            "rnbqkb1r/pppppppp/5n2/8/8/5N2/PPPPPPPP/RNBQKB1R w KQkq - 2 2",
+            "rnbqkb1r/pppppppp/5n2/8/8/8/PPPPPPPP/RNBQKBNR b KQkq - 3 2",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 4 3",
+        ]:
+            (move,) = [
+                move
+                for move in board.legal_moves()
+                if board.apply_move(move).to_fen() == fen
+            ]
+            board.push(move)
+
+        assert board.zobrist_key == Board.new().zobrist_key
+        assert board != Board.new()
+
+    @pytest.mark.unit
+    def test_positions_with_colliding_keys_differ(self):
+        board = Board.from_fen("4k3/8/8/8/8/8/8/4K2R w K - 0 1")
+        other = Board.from_fen("4k3/8/8/8/8/8/8/R3K3 w Q - 0 1")
+        other._zobrist_key = board.zobrist_key  # pylint: disable=protected-access
+        assert board != other
+        assert board == Board.from_fen(board.to_fen())
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "fen",
+        [
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR b KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w Kkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e3 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq d3 0 1",
+        ],
+    )
+    def test_zobrist_key_differs_from_starting_position(self, fen: str):
+        assert Board.from_fen(fen).zobrist_key != Board.new().zobrist_key
+
+    @pytest.mark.unit
+    def test_push_generated_capture_resets_halfmove_clock(self):
+        """Generated moves don't describe their captures, which are
+        only found once the move is played
+        """
+        board = Board.from_fen("4k3/8/8/3r4/8/8/8/3QK3 w - - 7 30")
+        (capture,) = [
+            move for move in board.legal_moves() if move.end.curr == Square.D5
+        ]
+        assert board.apply_move(capture).halfmove_clock == 0
+
+        board.push(capture)
+        assert board.halfmove_clock == 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        ("fen", "exp"),
+        [
+            ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", False),
+            ("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3", True),
+            ("4k3/8/8/8/8/8/8/R3K2r w Q - 0 1", True),
+        ],
+    )
+    def test_is_check(self, fen: str, exp: bool):
+        assert Board.from_fen(fen).is_check() is exp
+
+    @pytest.mark.unit
+    def test_attack_map_is_cached_per_position(self):
+        board = Board.from_fen("R3k3/8/8/8/8/8/8/4K3 b - - 0 1")
+        attack_map = board.attack_map
+        # The king is lifted off the board, so the checking
+        # rook sees through it to the end of the rank
+        assert {Square.E8, Square.H8, Square.A1, Square.D2} <= attack_map
+        assert board.attack_map is attack_map
+
+        board.push(next(iter(board.legal_moves())))
+        assert board.attack_map is not attack_map
+        board.pop()
+        assert board.attack_map == attack_map
+
+    @pytest.mark.unit
+    def test_castling_without_rights_raises(self):
+        (castle,) = [
+            move
+            for move in Board.from_fen("4k3/8/8/8/8/8/8/4K2R w K - 0 1").legal_moves()
+            if isinstance(move, CastlingMove)
+        ]
+        fen = "4k3/8/8/8/8/8/8/4K2R w - - 0 1"
+        board = Board.from_fen(fen)
+        with pytest.raises(ValueError):
+            board.apply_move(castle)
+        with pytest.raises(ValueError):
+            board.push(castle)
+        assert board.to_fen() == fen
+
+    @pytest.mark.unit
+    def test_child_shares_immutable_castle_rights(self):
+        """A move keeping the rights shares them with the child
+        board, so they mustn't be changeable in place
+        """
+        board = Board.from_fen("r3k2r/8/8/8/8/8/P7/R3K2R w KQkq - 0 1")
+        (pawn_move,) = [
+            move for move in board.legal_moves() if move.end.curr == Square.A3
+        ]
+        child = board.apply_move(pawn_move)
+        assert child.castle_rights is board.castle_rights
+
+        with pytest.raises(TypeError):
+            child.castle_rights.set_false(Color.BLACK, CastleSide.SHORT)
+        revoked = child.castle_rights.revoked(Color.BLACK, CastleSide.SHORT)
+        assert not revoked.has(Color.BLACK, CastleSide.SHORT)
+        assert board.castle_rights.has(Color.BLACK, CastleSide.SHORT)
@@ -246,3 +246,17 @@ class TestBoardToFenCases:
         )
         fen = "3k4/5RN1/4P3/5P2/7K/8/8/6q1 b - - 2 136"
         return board, fen
+
+
+_TestBoardPushPopCase = str
+
+
+class TestBoardPushPopCases:
+    def case_starting_position(self) -> _TestBoardPushPopCase:
+        return "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+    def case_castling_and_promotions(self) -> _TestBoardPushPopCase:
+        return "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+
+    def case_en_passant(self) -> _TestBoardPushPopCase:
+        return "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"
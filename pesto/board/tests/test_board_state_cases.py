@@ -8,6 +8,7 @@ from pesto.board.piece import (
     Knight,
     Move,
     Pawn,
+    Queen,
     Rook,
     SinglePieceMove,
 )
@@ -57,7 +58,7 @@ class UpdateCastleRightsCases:
 
     def case_castled_short(self) -> _UpdateCastleRightsCase:
         castle_rights = CastleRights.new()
-        castle_rights.set_false(Color.WHITE, CastleSide.LONG)
+        castle_rights = castle_rights.revoked(Color.WHITE, CastleSide.LONG)
         move = CastlingMove(
             start=King(Color.WHITE, Square.E1),
             end=King(Color.WHITE, Square.G1),
@@ -66,13 +67,13 @@ class UpdateCastleRightsCases:
             ),
         )
         exp = CastleRights.new()
-        exp.set_false(Color.WHITE, CastleSide.SHORT)
-        exp.set_false(Color.WHITE, CastleSide.LONG)
+        exp = exp.revoked(Color.WHITE, CastleSide.SHORT)
+        exp = exp.revoked(Color.WHITE, CastleSide.LONG)
         return castle_rights, move, exp
 
     def case_castled_long(self) -> _UpdateCastleRightsCase:
         castle_rights = CastleRights.new()
-        castle_rights.set_false(Color.WHITE, CastleSide.SHORT)
+        castle_rights = castle_rights.revoked(Color.WHITE, CastleSide.SHORT)
         move = CastlingMove(
             start=King(Color.WHITE, Square.E1),
             end=King(Color.WHITE, Square.C1),
@@ -81,8 +82,8 @@ class UpdateCastleRightsCases:
             ),
         )
         exp = CastleRights.new()
-        exp.set_false(Color.WHITE, CastleSide.SHORT)
-        exp.set_false(Color.WHITE, CastleSide.LONG)
+        exp = exp.revoked(Color.WHITE, CastleSide.SHORT)
+        exp = exp.revoked(Color.WHITE, CastleSide.LONG)
         return castle_rights, move, exp
 
     def case_moved_queen_rook(self) -> _UpdateCastleRightsCase:
@@ -92,7 +93,7 @@ class UpdateCastleRightsCases:
             end=Rook(Color.WHITE, Square.C1),
         )
         exp = CastleRights.new()
-        exp.set_false(Color.WHITE, CastleSide.LONG)
+        exp = exp.revoked(Color.WHITE, CastleSide.LONG)
         return castle_rights, move, exp
 
     def case_moved_king_rook(self) -> _UpdateCastleRightsCase:
@@ -102,7 +103,7 @@ class UpdateCastleRightsCases:
             end=Rook(Color.BLACK, Square.G8),
         )
         exp = CastleRights.new()
-        exp.set_false(Color.BLACK, CastleSide.SHORT)
+        exp = exp.revoked(Color.BLACK, CastleSide.SHORT)
         return castle_rights, move, exp
 
     def case_moved_king(self) -> _UpdateCastleRightsCase:
@@ -112,8 +113,8 @@ class UpdateCastleRightsCases:
             end=King(Color.WHITE, Square.F1),
         )
         exp = CastleRights.new()
-        exp.set_false(Color.WHITE, CastleSide.SHORT)
-        exp.set_false(Color.WHITE, CastleSide.LONG)
+        exp = exp.revoked(Color.WHITE, CastleSide.SHORT)
+        exp = exp.revoked(Color.WHITE, CastleSide.LONG)
         return castle_rights, move, exp
 
     def case_king_rook_moved_a_second_time(self) -> _UpdateCastleRightsCase:
@@ -137,7 +138,36 @@ class UpdateCastleRightsCases:
             captures=Rook(Color.WHITE, Square.H1),
         )
         exp = CastleRights.new()
-        exp.set_false(Color.WHITE, CastleSide.SHORT)
+        exp = exp.revoked(Color.WHITE, CastleSide.SHORT)
+        return castle_rights, move, exp
+
+    def case_rook_captures_rook(self) -> _UpdateCastleRightsCase:
+        """Both the capturing and the captured rook lose their rights"""
+        castle_rights = CastleRights.new()
+        move = SinglePieceMove(
+            start=Rook(Color.WHITE, Square.A1),
+            end=Rook(Color.WHITE, Square.A8),
+            captures=Rook(Color.BLACK, Square.A8),
+        )
+        exp = CastleRights.new()
+        exp = exp.revoked(Color.WHITE, CastleSide.LONG)
+        exp = exp.revoked(Color.BLACK, CastleSide.LONG)
+        return castle_rights, move, exp
+
+    def case_capture_promoted_rook_on_opposite_corner(
+        self,
+    ) -> _UpdateCastleRightsCase:
+        """Rights follow the corner squares rather than the rooks,
+        so only the rights of the corner's own color are cleared
+        """
+        castle_rights = CastleRights.new()
+        move = SinglePieceMove(
+            start=Queen(Color.WHITE, Square.D1),
+            end=Queen(Color.WHITE, Square.A1),
+            captures=Rook(Color.BLACK, Square.A1),
+        )
+        exp = CastleRights.new()
+        exp = exp.revoked(Color.WHITE, CastleSide.LONG)
         return castle_rights, move, exp
 
 
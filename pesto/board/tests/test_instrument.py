@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from pesto.board import instrument
+from pesto.board.board import Board
+from pesto.board.instrument import get_stats, instrumented
+from pesto.board.move import apply, legal
+from pesto.board.perft import perft
+from pesto.cli import main
+
+
+@pytest.mark.unit
+def test_disabled_by_default():
+    """Nothing is wrapped unless instrumentation is enabled"""
+    originals = (legal.legal_move_generator, apply.make_move_in_place, Board.push)
+    assert not instrument.is_enabled()
+
+    with instrumented():
+        assert instrument.is_enabled()
+        assert legal.legal_move_generator is not originals[0]
+        assert Board.push is not originals[2]
+
+    assert (legal.legal_move_generator, apply.make_move_in_place, Board.push) == (
+        originals
+    )
+
+
+@pytest.mark.unit
+def test_counts_calls():
+    start = time.perf_counter()
+    with instrumented():
+        perft(board=Board.new(), depth=2)
+    elapsed = time.perf_counter() - start
+
+    stats = get_stats()
+    # One call for the root, each of its 20 moves and their 400 replies
+    assert stats["pesto.board.perft.get_node_count"]["calls"] == 421
+    assert stats["PositionState.push"]["calls"] == 420
+    assert stats["PositionState.pop"]["calls"] == 420
+    assert stats["pesto.board.move.legal.legal_move_generator"]["calls"] == 21
+    # Recursion is timed once, from the outermost call
+    assert 0 < stats["pesto.board.perft.get_node_count"]["seconds"] <= elapsed
+
+
+@pytest.mark.unit
+def test_stats_kept_until_reset():
+    with instrumented():
+        perft(board=Board.new(), depth=1)
+    perft(board=Board.new(), depth=1)
+
+    assert get_stats()["PositionState.push"]["calls"] == 20
+    instrument.reset()
+    assert not get_stats()
+
+
+@pytest.mark.unit
+def test_perft_command(capsys: pytest.CaptureFixture):
+    fen = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+    assert main(["perft", fen, "2", "--instrument"]) == 0
+
+    output = capsys.readouterr().out.splitlines()
+    assert output[:2] == ["1: 14", "2: 191"]
+    assert any(line.startswith("PositionState.push") for line in output)
@@ -0,0 +1,49 @@
+from pathlib import Path
+from random import Random
+
+import pytest
+
+from pesto.board.magic import (
+    BISHOP_MAGICS,
+    DIAG_STEPS,
+    ORTH_STEPS,
+    bishop_attacks,
+    bishop_ray_attacks,
+    find_magics,
+    relevant_mask,
+    render_header,
+    rook_attacks,
+    rook_ray_attacks,
+)
+
+HEADER = Path(__file__).parents[3] / "src" / "magics.h"
+
+
+@pytest.mark.unit
+def test_relevant_mask():
+    # d4's diagonals, less the edge squares a1, a7, g1 and h8
+    assert relevant_mask(27, DIAG_STEPS) == 0x0040221400142200
+    # A rook in the corner still ignores the far ends of its lines
+    assert relevant_mask(0, ORTH_STEPS) == 0x000101010101017E
+
+
+@pytest.mark.unit
+def test_magic_attacks_match_ray_scans():
+    random = Random(0)
+    for _ in range(200):
+        occupied = random.getrandbits(64) & random.getrandbits(64)
+        for idx in range(64):
+            assert bishop_attacks(idx, occupied) == bishop_ray_attacks(idx, occupied)
+            assert rook_attacks(idx, occupied) == rook_ray_attacks(idx, occupied)
+
+
+@pytest.mark.unit
+def test_find_magics_is_repeatable():
+    # Rook magics take minutes to find, bishops' are quick
+    assert find_magics(DIAG_STEPS, bishop_ray_attacks) == BISHOP_MAGICS
+
+
+@pytest.mark.unit
+def test_header_is_up_to_date():
+    """The C++ core shares the magics through a generated header"""
+    assert HEADER.read_text(encoding="utf-8") == render_header()
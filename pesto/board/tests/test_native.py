@@ -0,0 +1,55 @@
+import pytest
+from pytest_cases import parametrize_with_cases
+
+from pesto.board.board import Board
+from pesto.board.native import NATIVE_AVAILABLE, Backend
+from pesto.board.piece import King, SinglePieceMove
+from pesto.board.square import Square
+from pesto.board.tests.test_board_cases import TestBoardPushPopCases
+from pesto.core.enums import Color
+
+pytestmark = pytest.mark.skipif(
+    not NATIVE_AVAILABLE, reason="pesto._native extension module is not built"
+)
+
+
+class TestNativeBoard:
+    @pytest.mark.unit
+    @parametrize_with_cases("fen", TestBoardPushPopCases)
+    def test_legal_moves_match_python(self, fen: str):
+        board = Board.from_fen(fen)
+        native_board = Board.from_fen(fen, backend=Backend.NATIVE)
+        assert native_board.legal_moves() == board.legal_moves()
+        assert native_board.count_legal_moves() == board.count_legal_moves()
+
+    @pytest.mark.unit
+    @parametrize_with_cases("fen", TestBoardPushPopCases)
+    def test_push_and_pop(self, fen: str):
+        """The native position follows moves played on the board"""
+        board = Board.from_fen(fen, backend=Backend.NATIVE)
+        for move in board.legal_moves():
+            board.push(move)
+            assert board.native_position.to_fen() == board.to_fen()
+            assert board.legal_moves() == Board.from_fen(board.to_fen()).legal_moves()
+
+            board.pop()
+            assert board.native_position.to_fen() == fen
+
+    @pytest.mark.unit
+    def test_apply_move_keeps_backend(self):
+        board = Board.from_fen(Board.new().to_fen(), backend=Backend.NATIVE)
+        new_board = board.apply_move(next(iter(board.legal_moves())))
+        assert new_board.backend == Backend.NATIVE
+        assert new_board.native_position.to_fen() == new_board.to_fen()
+
+    @pytest.mark.unit
+    def test_push_illegal_move(self):
+        fen = "4k3/8/8/8/8/8/4r3/4K3 w - - 0 1"
+        board = Board.from_fen(fen, backend=Backend.NATIVE)
+        move = SinglePieceMove(
+            start=King.new(Color.WHITE, Square.E1),
+            end=King.new(Color.WHITE, Square.D2),
+        )
+        with pytest.raises(ValueError):
+            board.push(move)
+        assert board.to_fen() == fen
@@ -1,7 +1,9 @@
 import pytest
 
+from pesto.board.bitboard import BitBoard
 from pesto.board.board import Board
-from pesto.board.perft import perft
+from pesto.board.native import NATIVE_AVAILABLE, Backend
+from pesto.board.perft import PerftTable, ReplacementPolicy, parallel_perft, perft
 
 
 @pytest.mark.perft
@@ -34,3 +36,160 @@ def test_perft_position_5():
     node_count = perft(board=Board.from_fen(fen), depth=3)
     expected = {1: 44, 2: 1_486, 3: 62_379}
     assert node_count == expected
+
+
+@pytest.mark.perft
+def test_perft_bitboard_starting_position():
+    fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+    node_count = perft(board=BitBoard.from_fen(fen), depth=4)
+    expected = {1: 20, 2: 400, 3: 8_902, 4: 197_281}
+    assert node_count == expected
+
+
+@pytest.mark.perft
+def test_perft_bitboard_position_5():
+    fen = "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+    node_count = perft(board=BitBoard.from_fen(fen), depth=3)
+    expected = {1: 44, 2: 1_486, 3: 62_379}
+    assert node_count == expected
+
+
+@pytest.mark.perft
+@pytest.mark.parametrize("replacement", list(ReplacementPolicy))
+def test_perft_hashed_starting_position(replacement: ReplacementPolicy):
+    fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+    table = PerftTable(size_mb=1, replacement=replacement)
+    node_count = perft(board=Board.from_fen(fen), depth=4, table=table)
+    expected = {1: 20, 2: 400, 3: 8_902, 4: 197_281}
+    assert node_count == expected
+    assert table.hits > 0
+
+
+@pytest.mark.perft
+def test_perft_hashed_position_3():
+    fen = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+    node_count = perft(board=BitBoard.from_fen(fen), depth=4, table=PerftTable())
+    expected = {1: 14, 2: 191, 3: 2_812, 4: 43_238}
+    assert node_count == expected
+
+
+@pytest.mark.unit
+def test_perft_table_size():
+    table = PerftTable(size_mb=1)
+    assert table.entries & (table.entries - 1) == 0
+    assert table.entries * 160 <= 2**20 < table.entries * 2 * 160
+
+
+@pytest.mark.unit
+def test_perft_table_probe_and_store():
+    table = PerftTable(size_mb=1)
+    assert table.probe(key=123, depth=2) is None
+
+    table.store(key=123, depth=2, counts=(20, 400))
+    assert table.probe(key=123, depth=2) == (20, 400)
+    assert table.probe(key=123, depth=3) is None
+    assert (table.probes, table.hits, table.hit_rate) == (3, 1, 1 / 3)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("replacement", "exp"),
+    [
+        (ReplacementPolicy.ALWAYS, (8,)),
+        (ReplacementPolicy.DEPTH_PREFERRED, (20, 400)),
+    ],
+)
+def test_perft_table_replacement(replacement: ReplacementPolicy, exp: tuple[int, ...]):
+    """A shallower subtree landing in the same slot only replaces
+    the stored one when the policy allows it
+    """
+    table = PerftTable(size_mb=0, replacement=replacement)
+    assert table.entries == 1
+
+    table.store(key=1, depth=2, counts=(20, 400))
+    table.store(key=2, depth=1, counts=(8,))
+    obs = table.probe(key=2, depth=1) or table.probe(key=1, depth=2)
+    assert obs == exp
+
+
+@pytest.mark.perft
+def test_perft_bulk_position_4():
+    fen = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+    node_count = perft(board=Board.from_fen(fen), depth=4, bulk=True)
+    expected = {1: 6, 2: 264, 3: 9_467, 4: 422_333}
+    assert node_count == expected
+
+
+@pytest.mark.perft
+def test_perft_bulk_hashed_bitboard_position_5():
+    fen = "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+    board = BitBoard.from_fen(fen)
+    node_count = perft(board=board, depth=4, table=PerftTable(), bulk=True)
+    expected = {1: 44, 2: 1_486, 3: 62_379, 4: 2_103_487}
+    assert node_count == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("depth", [0, 1, 2])
+def test_perft_bulk_matches_full_walk(depth: int):
+    """Bulk counting reports exactly what playing out
+    every move of the final level does
+    """
+    board = Board.new()
+    assert dict(perft(board=board, depth=depth, bulk=True)) == dict(
+        perft(board=board, depth=depth)
+    )
+
+
+@pytest.mark.perft
+@pytest.mark.parametrize("split_depth", [1, 2])
+def test_parallel_perft_starting_position(split_depth: int):
+    fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+    node_count = parallel_perft(
+        board=Board.from_fen(fen), depth=4, workers=2, split_depth=split_depth
+    )
+    expected = {1: 20, 2: 400, 3: 8_902, 4: 197_281}
+    assert node_count == expected
+
+
+@pytest.mark.perft
+def test_parallel_perft_bitboard_position_4():
+    fen = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+    board = BitBoard.from_fen(fen)
+    node_count = parallel_perft(board=board, depth=4, workers=2, bulk=True)
+    expected = {1: 6, 2: 264, 3: 9_467, 4: 422_333}
+    assert node_count == expected
+    assert board.to_fen() == fen
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("split_depth", [0, 1, 2, 3])
+def test_parallel_perft_matches_perft(split_depth: int):
+    fen = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+    node_count = parallel_perft(
+        board=Board.from_fen(fen), depth=2, workers=2, split_depth=split_depth
+    )
+    assert node_count == perft(board=Board.from_fen(fen), depth=2)
+
+
+@pytest.mark.perft
+@pytest.mark.skipif(not NATIVE_AVAILABLE, reason="native backend is not built")
+@pytest.mark.parametrize("bulk", [False, True])
+def test_perft_native_position_4(bulk: bool):
+    fen = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+    board = Board.from_fen(fen, backend=Backend.NATIVE)
+    node_count = perft(board=board, depth=3, bulk=bulk)
+    expected = {1: 6, 2: 264, 3: 9_467}
+    assert node_count == expected
+    assert board.native_position.to_fen() == fen
+
+
+@pytest.mark.perft
+@pytest.mark.skipif(not NATIVE_AVAILABLE, reason="native backend is not built")
+def test_perft_native_hashed_starting_position():
+    """With a table, the walk happens in Python on native move generation"""
+    fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+    board = Board.from_fen(fen, backend=Backend.NATIVE)
+    node_count = perft(board=board, depth=3, table=PerftTable())
+    expected = {1: 20, 2: 400, 3: 8_902}
+    assert node_count == expected
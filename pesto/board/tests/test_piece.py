@@ -3,7 +3,22 @@ from typing import Optional
 import pytest
 from pytest_cases import parametrize_with_cases
 
-from pesto.board.piece import Bishop, King, Knight, Move, Pawn, Piece, Queen, Rook
+from pesto.board.piece import (
+    KING_RAYS,
+    KNIGHT_RAYS,
+    KNIGHT_TABLE,
+    QUEEN_RAYS,
+    VERT_HORIZ_RAYS,
+    Bishop,
+    King,
+    Knight,
+    Move,
+    Pawn,
+    Piece,
+    Queen,
+    Rook,
+    SinglePieceMove,
+)
 from pesto.board.square import Square
 from pesto.board.tests.test_piece_cases import (
     TestBishopPsuedoLegalMovesCases,
@@ -13,6 +28,7 @@ from pesto.board.tests.test_piece_cases import (
     TestQueenPsuedoLegalMovesCases,
     TestRookPsuedoLegalMovesCases,
 )
+from pesto.core.enums import Color
 
 
 class TestPawn:
@@ -97,3 +113,42 @@ class TestKing:
     ):
         obs = king.generate_psuedo_legal_moves(piece_map=piece_map)
         assert obs == exp
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("piece_type", [Pawn, Knight, Bishop, Rook, Queen, King])
+def test_new_returns_shared_instance(piece_type: type[Piece]):
+    piece = piece_type.new(Color.BLACK, Square.D4)
+    assert piece is piece_type.new(Color.BLACK, Square.D4)
+    assert piece == piece_type(Color.BLACK, Square.D4)
+    assert isinstance(piece, piece_type)
+
+
+@pytest.mark.unit
+def test_generated_moves_share_pieces():
+    rook = Rook.new(Color.WHITE, Square.A1)
+    for move in rook.generate_psuedo_legal_moves(piece_map={Square.A1: rook}):
+        assert move.start is rook
+        assert move.end is Rook.new(Color.WHITE, move.end.curr)
+
+
+@pytest.mark.unit
+def test_pieces_and_moves_have_no_instance_dict():
+    pawn = Pawn.new(Color.WHITE, Square.E2)
+    move = SinglePieceMove(start=pawn, end=Pawn.new(Color.WHITE, Square.E4))
+    assert not hasattr(pawn, "__dict__")
+    assert not hasattr(move, "__dict__")
+
+
+@pytest.mark.unit
+def test_ray_tables():
+    """Rays run outward from the square, and knight and king rays
+    hold a single square each, leaving out those off the board
+    """
+    assert QUEEN_RAYS[Square.D4][0] == (Square.C3, Square.B2, Square.A1)
+    assert sum(len(ray) for ray in QUEEN_RAYS[Square.D4]) == 27
+    assert VERT_HORIZ_RAYS[Square.A1][0] == ()
+
+    assert set(KNIGHT_RAYS[Square.A1]) == {(Square.B3,), (Square.C2,)}
+    assert len(KING_RAYS[Square.E4]) == 8
+    assert set(KNIGHT_TABLE[Square.H8]) == {Square.F7, Square.G6}
@@ -0,0 +1,56 @@
+import pytest
+
+from pesto.board.board import Board, starting_piece_map
+from pesto.board.piece import King, Knight
+from pesto.board.piece_squares import NON_KING_TYPES, PieceSquares
+from pesto.board.square import Square
+from pesto.core.enums import Color
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+@pytest.mark.unit
+def test_from_piece_map():
+    piece_squares = PieceSquares.from_piece_map(starting_piece_map())
+
+    assert piece_squares.kings == {Color.WHITE: Square.E1, Color.BLACK: Square.E8}
+    assert piece_squares.squares[Color.BLACK, Knight] == {Square.B8, Square.G8}
+    assert piece_squares.squares[Color.WHITE, King] == {Square.E1}
+    assert len(list(piece_squares.of(Color.WHITE, NON_KING_TYPES))) == 15
+
+
+@pytest.mark.unit
+def test_play_and_revert():
+    """Captures, castling, promotions and en passant all stay in
+    step with the piece map, two moves deep
+    """
+    board = Board.from_fen(KIWIPETE)
+    original = PieceSquares.from_piece_map(board.piece_map)
+
+    for move in board.legal_moves():
+        board.push(move)
+        for reply in board.legal_moves():
+            board.push(reply)
+            assert board.piece_squares == PieceSquares.from_piece_map(board.piece_map)
+            board.pop()
+        board.pop()
+
+    assert board.piece_squares == original
+
+
+@pytest.mark.unit
+def test_moves_replayed_when_needed():
+    """Moves pushed without generating moves in between are only
+    replayed once the squares are next needed
+    """
+    board = Board.from_fen(KIWIPETE)
+    board.push(next(iter(board.legal_moves())))
+    for move in list(board.legal_moves())[:5]:
+        board.push(move)
+        reply = next(iter(board.legal_moves()))
+        board.push(reply)
+        board.pop()
+        board.pop()
+
+    board.push(next(iter(board.legal_moves())))
+    assert board.piece_squares == PieceSquares.from_piece_map(board.piece_map)
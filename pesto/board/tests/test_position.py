@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+import pytest
+
+from pesto.board.move.castle import CastleRights
+from pesto.board.position import PositionState
+from pesto.core.enums import Color
+
+
+@pytest.mark.unit
+def test_missing_piece_handling_fails_on_instantiation():
+    @dataclass(slots=True, eq=False)
+    class PiecelessBoard(PositionState):  # pylint: disable=abstract-method
+        def _pieces(self) -> object:
+            return None
+
+        def _pieces_to_fen(self) -> str:
+            return "8/8/8/8/8/8/8/8"
+
+    with pytest.raises(TypeError, match="_make"):
+        PiecelessBoard(  # pylint: disable=abstract-class-instantiated
+            ply=1,
+            halfmove_clock=0,
+            to_move=Color.WHITE,
+            castle_rights=CastleRights.none(),
+            en_passant_target=None,
+        )
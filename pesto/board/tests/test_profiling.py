@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from pesto.board.board import Board
+from pesto.board.perft import perft
+from pesto.board.profiling import Profile, format_table, profiled
+from pesto.cli import main
+
+
+def _profile_perft(depth: int) -> Profile:
+    with profiled() as profile:
+        perft(board=Board.new(), depth=depth)
+    return profile
+
+
+@pytest.mark.unit
+def test_profiler_removed_afterwards():
+    previous = sys.getprofile()
+    _profile_perft(depth=1)
+    assert sys.getprofile() is previous
+
+
+@pytest.mark.unit
+def test_functions():
+    functions = {stats.name: stats for stats in _profile_perft(depth=2).functions()}
+
+    node_count = functions["pesto.board.perft:get_node_count"]
+    assert node_count.calls == 421
+    assert 0 < node_count.self_seconds <= node_count.cumulative_seconds
+    # Recursive calls don't count the same time again
+    assert (
+        node_count.cumulative_seconds
+        <= functions["pesto.board.perft:perft"].cumulative_seconds
+    )
+    assert functions["pesto.board.move.legal:legal_move_generator"].calls == 21
+    assert functions["pesto.board.position:PositionState.push"].calls == 420
+
+
+@pytest.mark.unit
+def test_generator_calls():
+    def countdown(start: int):
+        yield from range(start, 0, -1)
+
+    def numbers():
+        yield 0
+        yield from countdown(3)
+
+    with profiled() as profile:
+        assert list(numbers()) == [0, 3, 2, 1]
+
+    # Resuming after each yield isn't another call
+    functions = {stats.name: stats for stats in profile.functions()}
+    assert functions[f"{__name__}:test_generator_calls.<locals>.numbers"].calls == 1
+    assert functions[f"{__name__}:test_generator_calls.<locals>.countdown"].calls == 1
+
+
+@pytest.mark.unit
+def test_collapsed_stacks():
+    lines = _profile_perft(depth=2).collapsed().splitlines()
+    assert lines
+
+    stacks = []
+    for line in lines:
+        stack, microseconds = line.rsplit(" ", 1)
+        assert int(microseconds) > 0
+        stacks.append(stack.split(";"))
+
+    # Move generation is found below the recursion of perft
+    assert any(
+        stack[-2:]
+        == [
+            "pesto.board.board:Board.legal_moves",
+            "pesto.board.move.legal:legal_move_generator",
+        ]
+        and stack.count("pesto.board.perft:get_node_count") == 2
+        for stack in stacks
+    )
+
+
+@pytest.mark.unit
+def test_format_table():
+    lines = format_table(_profile_perft(depth=1), limit=5).splitlines()
+    assert len(lines) == 6
+    # Sorted by cumulative time, so the outermost calls lead
+    assert {line.split()[0] for line in lines[1:3]} == {
+        "pesto.board.perft:perft",
+        "pesto.board.perft:get_node_count",
+    }
+
+
+@pytest.mark.unit
+def test_perft_command_profile(tmp_path: Path, capsys: pytest.CaptureFixture):
+    fen = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+    prefix = str(tmp_path / "perft")
+    assert main(["perft", fen, "2", "--profile", prefix]) == 0
+
+    assert "get_node_count" in Path(f"{prefix}.collapsed").read_text(encoding="utf-8")
+    assert "legal_move_generator" in Path(f"{prefix}.txt").read_text(encoding="utf-8")
+    assert capsys.readouterr().out.startswith("1: 14\n2: 191\n")
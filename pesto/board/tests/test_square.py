@@ -1,6 +1,11 @@
 import pytest
 
-from pesto.board.square import Square, str_to_square
+from pesto.board.square import (
+    SQUARES_BY_INDEX,
+    Square,
+    square_to_index,
+    str_to_square,
+)
 
 
 @pytest.mark.unit
@@ -27,3 +32,20 @@ def test_str_to_square(string: str, exp: Square):
 def test_str_to_square_raises():
     with pytest.raises(ValueError):
         _ = str_to_square("e2e4")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("square", "exp"),
+    [
+        (Square.A1, 0),
+        (Square.H1, 7),
+        (Square.A2, 8),
+        (Square.E4, 28),
+        (Square.H8, 63),
+    ],
+)
+def test_square_to_index(square: Square, exp: int):
+    obs = square_to_index(square)
+    assert obs == exp
+    assert SQUARES_BY_INDEX[obs] == square
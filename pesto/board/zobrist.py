@@ -0,0 +1,125 @@
+"""
+    Zobrist hashing
+
+    Every (piece, square) pair, castling right and en passant file
+    is assigned a fixed random 64-bit number. A position's key is the
+    XOR of the numbers of everything present in it, so playing a move
+    only needs to XOR out what changed and XOR in what replaced it.
+"""
+from functools import reduce
+from operator import xor
+from random import Random
+from typing import Optional
+
+from pesto.board.move.castle import CASTLE_BITS, CastleRights, CastleSide
+from pesto.board.piece import (
+    Bishop,
+    CastlingMove,
+    King,
+    Knight,
+    Move,
+    Pawn,
+    Piece,
+    Queen,
+    Rook,
+)
+from pesto.board.square import Square
+from pesto.core.enums import Color
+
+# Keys are generated from a fixed seed so that they, and any
+# hashes built from them, are the same across runs and processes
+_random = Random(0x9E3779B97F4A7C15)
+
+PIECE_KEYS: dict[tuple[type[Piece], Color, Square], int] = {
+    (piece_type, color, square): _random.getrandbits(64)
+    for piece_type in (Pawn, Knight, Bishop, Rook, Queen, King)
+    for color in Color
+    for square in Square
+}
+# Included when black is to move
+SIDE_KEY: int = _random.getrandbits(64)
+CASTLING_KEYS: dict[tuple[Color, CastleSide], int] = {
+    (color, castle_side): _random.getrandbits(64)
+    for color in Color
+    for castle_side in CastleSide
+}
+# Combined key of each combination of `CastleRights.bits`
+CASTLE_RIGHTS_KEYS: tuple[int, ...] = tuple(
+    reduce(
+        xor,
+        (
+            castle_key
+            for right, castle_key in CASTLING_KEYS.items()
+            if bits & CASTLE_BITS[right]
+        ),
+        0,
+    )
+    for bits in range(16)
+)
+# Indexed by the file of the en passant target square
+EN_PASSANT_KEYS: tuple[int, ...] = tuple(_random.getrandbits(64) for _ in range(8))
+
+
+def piece_key(piece: Piece) -> int:
+    """Key of `piece` standing on its square"""
+    return PIECE_KEYS[type(piece), piece.color, piece.curr]
+
+
+def castle_rights_key(castle_rights: CastleRights) -> int:
+    """Combined key of the castling rights still available"""
+    return CASTLE_RIGHTS_KEYS[castle_rights.bits]
+
+
+def en_passant_key(en_passant_target: Optional[Square]) -> int:
+    """Key of the file of `en_passant_target`, if there is one"""
+    if en_passant_target is None:
+        return 0
+    return EN_PASSANT_KEYS[en_passant_target & 7]
+
+
+def hash_position(
+    piece_map: dict[Square, Piece],
+    to_move: Color,
+    castle_rights: CastleRights,
+    en_passant_target: Optional[Square],
+) -> int:
+    """Computes the Zobrist key of a position from scratch"""
+    key = 0
+    for piece in piece_map.values():
+        key ^= PIECE_KEYS[type(piece), piece.color, piece.curr]
+
+    if to_move == Color.BLACK:
+        key ^= SIDE_KEY
+    return key ^ castle_rights_key(castle_rights) ^ en_passant_key(en_passant_target)
+
+
+def update_key(
+    key: int,
+    move: Move,
+    castle_rights: tuple[CastleRights, CastleRights],
+    en_passant_target: tuple[Optional[Square], Optional[Square]],
+) -> int:
+    """Derives the key of the position reached by playing `move`
+    from the `key` of the position it was played from.
+
+    move: The move as it was played, i.e. with any captured
+        piece filled in
+    castle_rights: Castling rights before and after the move
+    en_passant_target: En passant target before and after the move
+    """
+    key ^= SIDE_KEY
+    key ^= PIECE_KEYS[type(move.start), move.start.color, move.start.curr]
+    key ^= PIECE_KEYS[type(move.end), move.end.color, move.end.curr]
+
+    if isinstance(move, CastlingMove):
+        key ^= piece_key(move.castled_rook.start) ^ piece_key(move.castled_rook.end)
+    elif move.captures is not None:
+        key ^= piece_key(move.captures)
+
+    key ^= CASTLE_RIGHTS_KEYS[castle_rights[0].bits]
+    key ^= CASTLE_RIGHTS_KEYS[castle_rights[1].bits]
+    return (
+        key
+        ^ en_passant_key(en_passant_target[0])
+        ^ en_passant_key(en_passant_target[1])
+    )
@@ -0,0 +1,250 @@
+"""
+    Command line entry point, installed as `pesto`
+"""
+import argparse
+import json
+import sys
+from contextlib import ExitStack
+from typing import Any, Optional, Sequence
+
+from pesto.bench.backends import compare_backends, format_timings
+from pesto.bench.bench import run_bench
+from pesto.bench.positions import BENCH_POSITIONS
+from pesto.bench.suite import (
+    DEFAULT_HISTORY,
+    MICRO_BENCHMARKS,
+    append_history,
+    compare_runs,
+    format_comparisons,
+    format_run,
+    load_run,
+    run_suite,
+)
+from pesto.board.allocations import allocation_report, format_report
+from pesto.board.backend import position_from_fen
+from pesto.board.instrument import format_stats, get_stats, instrumented
+from pesto.board.perft import perft
+from pesto.board.profiling import Profile, format_table, profiled
+
+
+def _write_json(data: Any, path: Optional[str]) -> None:
+    """Prints `data` as JSON, or writes it to `path` when given"""
+    output = json.dumps(data, indent=2)
+    if path is None:
+        print(output)
+        return
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(output + "\n")
+
+
+def _write_profile(profile: Profile, prefix: str) -> None:
+    """Writes the collapsed stacks and function table of `profile`
+    to `<prefix>.collapsed` and `<prefix>.txt`
+    """
+    with open(f"{prefix}.collapsed", "w", encoding="utf-8") as file:
+        file.write(profile.collapsed())
+    with open(f"{prefix}.txt", "w", encoding="utf-8") as file:
+        file.write(format_table(profile, limit=None) + "\n")
+
+
+def _bench(args: argparse.Namespace) -> int:
+    with ExitStack() as stack:
+        if args.instrument:
+            stack.enter_context(instrumented())
+        profile = stack.enter_context(profiled()) if args.profile else None
+        report = run_bench(backend=args.backend).to_json()
+
+    if args.instrument:
+        report["instrumentation"] = get_stats()
+    if args.allocations:
+        # Walked separately, as tracing allocations distorts the
+        # timings, and a level shallower, as tracing every line is
+        # slow. The figures are per node either way.
+        report["allocations"] = {
+            position.name: allocation_report(
+                board=position_from_fen(position.fen, backend=args.backend),
+                depth=position.depth - 1,
+            ).to_json(limit=20)
+            for position in BENCH_POSITIONS
+        }
+    if profile is not None:
+        _write_profile(profile, args.profile)
+    _write_json(report, args.output)
+    return 0
+
+
+def _perft(args: argparse.Namespace) -> int:
+    board = position_from_fen(args.fen, backend=args.backend)
+    with ExitStack() as stack:
+        stats = stack.enter_context(instrumented()) if args.instrument else None
+        profile = stack.enter_context(profiled()) if args.profile else None
+        node_count = perft(board=board, depth=args.depth, bulk=args.bulk)
+
+    for depth, count in sorted(node_count.items()):
+        print(f"{depth}: {count}")
+    if stats is not None:
+        print(format_stats(stats))
+    if profile is not None:
+        _write_profile(profile, args.profile)
+        print(format_table(profile, limit=20))
+    if args.allocations:
+        board = position_from_fen(args.fen, backend=args.backend)
+        report = allocation_report(board=board, depth=args.depth, bulk=args.bulk)
+        print(format_report(report))
+    return 0
+
+
+def _bench_backends(args: argparse.Namespace) -> int:
+    print(format_timings(compare_backends(backends=args.backend or None)))
+    return 0
+
+
+def _suite_run(args: argparse.Namespace) -> int:
+    run = run_suite(repeats=args.repeats, warmup=args.warmup, names=args.only)
+    print(format_run(run))
+    if args.output is not None:
+        _write_json(run, args.output)
+    if not args.no_history:
+        append_history(run, path=args.history)
+    return 0
+
+
+def _suite_compare(args: argparse.Namespace) -> int:
+    comparisons = compare_runs(
+        base=load_run(args.base),
+        new=load_run(args.new),
+        alpha=args.alpha,
+        threshold=args.threshold,
+    )
+    print(format_comparisons(comparisons))
+    # Fail when anything got slower, for use in scripts
+    return 1 if any(comparison.regression for comparison in comparisons) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pesto")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bench = commands.add_parser(
+        "bench",
+        help="Time FEN parsing, movegen, make/unmake and perft "
+        "over a fixed set of positions, reporting JSON",
+    )
+    bench.add_argument(
+        "--backend", help="Backend to time, defaulting to $PESTO_BACKEND"
+    )
+    bench.add_argument("--output", help="Write the JSON report to this file")
+    bench.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Include call counts and times of the hot functions in the report",
+    )
+    bench.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        help="Profile the run, writing collapsed stacks to PREFIX.collapsed "
+        "and a table of functions by cumulative time to PREFIX.txt",
+    )
+    bench.add_argument(
+        "--allocations",
+        action="store_true",
+        help="Report bytes and objects allocated per perft node by source line",
+    )
+    bench.set_defaults(func=_bench)
+
+    perft_command = commands.add_parser(
+        "perft", help="Count the nodes at each level below a position"
+    )
+    perft_command.add_argument("fen", help="Position to start from")
+    perft_command.add_argument("depth", type=int, help="Levels to count")
+    perft_command.add_argument(
+        "--backend", help="Backend to use, defaulting to $PESTO_BACKEND"
+    )
+    perft_command.add_argument(
+        "--bulk", action="store_true", help="Count rather than play the last level"
+    )
+    perft_command.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Report call counts and times of the hot functions",
+    )
+    perft_command.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        help="Profile the run, writing collapsed stacks to PREFIX.collapsed "
+        "and a table of functions by cumulative time to PREFIX.txt",
+    )
+    perft_command.add_argument(
+        "--allocations",
+        action="store_true",
+        help="Report bytes and objects allocated per perft node by source line",
+    )
+    perft_command.set_defaults(func=_perft)
+
+    bench_backends = commands.add_parser(
+        "bench-backends",
+        help="Run the same perft positions on every installed backend",
+    )
+    bench_backends.add_argument(
+        "--backend",
+        action="append",
+        help="Only time this backend, may be given more than once",
+    )
+    bench_backends.set_defaults(func=_bench_backends)
+
+    suite = commands.add_parser(
+        "suite", help="Micro-benchmarks with a local history of results"
+    )
+    suite_commands = suite.add_subparsers(dest="suite_command", required=True)
+
+    suite_run = suite_commands.add_parser(
+        "run", help="Time each micro-benchmark and record the run"
+    )
+    suite_run.add_argument("--repeats", type=int, default=7, help="Samples to take")
+    suite_run.add_argument(
+        "--warmup", type=int, default=1, help="Untimed batches before sampling"
+    )
+    suite_run.add_argument(
+        "--only",
+        action="append",
+        choices=[benchmark.name for benchmark in MICRO_BENCHMARKS],
+        help="Only time this benchmark, may be given more than once",
+    )
+    suite_run.add_argument("--output", help="Also write the run to this file")
+    suite_run.add_argument(
+        "--history", default=DEFAULT_HISTORY, help="History file to append to"
+    )
+    suite_run.add_argument(
+        "--no-history", action="store_true", help="Don't record the run"
+    )
+    suite_run.set_defaults(func=_suite_run)
+
+    suite_compare = suite_commands.add_parser(
+        "compare",
+        help="Flag significant slowdowns between two result files, "
+        "taking the latest run of a history file",
+    )
+    suite_compare.add_argument("base", help="Result or history file to compare to")
+    suite_compare.add_argument("new", help="Result or history file to check")
+    suite_compare.add_argument(
+        "--alpha", type=float, default=0.05, help="Significance level"
+    )
+    suite_compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="Smallest relative slowdown of the median to flag",
+    )
+    suite_compare.set_defaults(func=_suite_compare)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
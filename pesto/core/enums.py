@@ -1,7 +1,15 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
-class Color(Enum):
+class Color(IntEnum):
+    """Side of the board. Colors are ints, so they hash and compare
+    as cheaply as their value and can index lookup tables directly.
+    """
+
+    # Print as enum members rather than as the plain value
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
+
     WHITE: int = 0
     BLACK: int = 1
 
@@ -0,0 +1,117 @@
+/*
+  Python bindings for the C++ core, built as the optional
+  `pesto._native` extension module.
+
+  Moves cross the boundary as the 16-bit codes described in
+  pesto/board/move/encode.py, so no move objects are created
+  on either side until Python decodes them.
+*/
+#include <cstdint>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include "board.h"
+#include "perft.h"
+
+namespace py = pybind11;
+
+
+// Flags of the encoded move layout
+constexpr uint16_t QUIET = 0;
+constexpr uint16_t DOUBLE_PAWN_PUSH = 1;
+constexpr uint16_t KING_CASTLE = 2;
+constexpr uint16_t QUEEN_CASTLE = 3;
+constexpr uint16_t CAPTURE = 4;
+constexpr uint16_t EN_PASSANT = 5;
+constexpr uint16_t PROMOTION = 8;
+
+
+class NativePosition {
+  public:
+    explicit NativePosition(const std::string &fen) { board.fromFen(fen); }
+
+    std::string toFen() { return board.toFen(); }
+
+    std::vector<uint16_t> legalMoveCodes() {
+      std::vector<uint16_t> codes;
+      for (Move &move : generateLegalMoves(board)) {
+        codes.push_back(encode(move));
+      }
+      return codes;
+    }
+
+    size_t countLegalMoves() { return generateLegalMoves(board).size(); }
+
+    void push(uint16_t code) {
+      for (Move &move : generateLegalMoves(board)) {
+        if (encode(move) == code) {
+          history.push_back(makeMove(board, move));
+          return;
+        }
+      }
+      throw std::invalid_argument(
+        "Move code " + std::to_string(code) + " is not legal in " + toFen()
+      );
+    }
+
+    void pop() {
+      if (history.empty()) {
+        throw std::out_of_range("No moves have been pushed to revert");
+      }
+      unmakeMove(board, history.back());
+      history.pop_back();
+    }
+
+    std::vector<U64> countNodes(int depth, bool bulk) {
+      return perft(board, depth, bulk);
+    }
+
+  private:
+    Board board;
+    std::vector<UndoState> history;
+
+    /*
+      Packs a move of the side to move into a move code,
+      before it's played
+    */
+    uint16_t encode(Move &move) {
+      Color other{board.to_move ^ BLACK};
+      U64 from_bb = 1ULL << move.from;
+      bool capture = (board.pieces.getColor(other) & (1ULL << move.to)) != 0;
+      int distance = (move.to > move.from) ? move.to - move.from : move.from - move.to;
+
+      uint16_t flags = capture ? CAPTURE : QUIET;
+      if ((board.pieces.get(KING)->at(board.to_move) & from_bb) != 0
+          && distance == 2) {
+        flags = (move.to > move.from) ? KING_CASTLE : QUEEN_CASTLE;
+      } else if (move.ep_capture != nullsq) {
+        flags = EN_PASSANT;
+      } else if (move.promotion != NULL_PIECE) {
+        flags |= PROMOTION | (move.promotion - KNIGHT);
+      } else if ((board.pieces.get(PAWN)->at(board.to_move) & from_bb) != 0
+                 && distance == 16) {
+        flags = DOUBLE_PAWN_PUSH;
+      }
+      return move.from | (move.to << 6) | (flags << 12);
+    }
+};
+
+
+PYBIND11_MODULE(_native, m) {
+  m.doc() = "Move generation and perft from the C++ core";
+
+  py::class_<NativePosition>(m, "Position")
+    .def(py::init<const std::string &>(), py::arg("fen"))
+    .def("to_fen", &NativePosition::toFen)
+    .def("legal_move_codes", &NativePosition::legalMoveCodes)
+    .def("count_legal_moves", &NativePosition::countLegalMoves)
+    .def("push", &NativePosition::push, py::arg("code"))
+    .def("pop", &NativePosition::pop)
+    .def("perft", &NativePosition::countNodes, py::arg("depth"),
+         py::arg("bulk") = false);
+}
@@ -1,38 +1,93 @@
 #include "exceptions.h"
 #include "legal.h"
 
-#include <iostream>
-
 
+/*
+  Looks outward from `square` the way each piece type attacks,
+  for a piece of that type belonging to `by`. Pieces don't
+  attack squares held by their own color.
+*/
 bool squareIsAttacked(Pieces *pieces, Square square, Color by) {
+  U64 square_bb = 1ULL << square;
+  if ((pieces->getColor(by) & square_bb) != 0ULL) { return false; }
+
+  U64 occupied = pieces->occupied();
+  U64 queens = pieces->get(QUEEN)->at(by);
+  U64 none = 0ULL;
+
+  // A pawn attacks the squares from which a pawn of
+  // the other color would be attacking it
+  return (
+    (getPawnCaptureSquares(square_bb, Color(by ^ BLACK))
+     & pieces->get(PAWN)->at(by))
+    | (getLoneKnightAttacks(square, occupied, none) & pieces->get(KNIGHT)->at(by))
+    | (getLoneKingAttacks(square, occupied, none) & pieces->get(KING)->at(by))
+    | (getBishopAttacks(square, occupied) & (pieces->get(BISHOP)->at(by) | queens))
+    | (getRookAttacks(square, occupied) & (pieces->get(ROOK)->at(by) | queens))
+  ) != 0ULL;
+}
+
+
+/*
+  Adds the castling moves available to `to_move`, which requires the
+  right to castle, an empty path between king and rook, and none of
+  the squares the king starts on, crosses or lands on being attacked
+*/
+void addCastlingMoves(Pieces *pieces, MoveList *moves, Color to_move,
+                      CastleRights castle_rights) {
+  Square king_square = (to_move == WHITE) ? e1 : e8;
   U64 occupied = pieces->occupied();
-  U64 same_color = pieces->getColor(by);
-
-  bool promotion = false;
-  U64 pawn = getPawnAttacks(pieces->get(PAWN)->at(by), occupied, same_color, by,
-                            promotion, true);
-  U64 knight = getPieceAttacks(KNIGHT, pieces->get(KNIGHT)->at(by),
-                               occupied, same_color);
-  U64 bishop = getPieceAttacks(BISHOP, pieces->get(BISHOP)->at(by),
-                               occupied, same_color);
-  U64 rook = getPieceAttacks(ROOK, pieces->get(ROOK)->at(by),
-                               occupied, same_color);
-  U64 queen = getPieceAttacks(QUEEN, pieces->get(QUEEN)->at(by),
-                               occupied, same_color);
-  U64 king = getPieceAttacks(KING, pieces->get(KING)->at(by),
-                               occupied, same_color);
-
-  U64 attacked = pawn | knight | bishop | rook | queen | king;
-  return ((1ULL << square) & attacked) != 0ULL;
+  U64 rooks = pieces->get(ROOK)->at(to_move);
+  Color other_color{to_move ^ BLACK};
+
+  if ((pieces->get(KING)->at(to_move) & (1ULL << king_square)) == 0) {
+    return;
+  }
+  if (squareIsAttacked(pieces, king_square, other_color)) { return; }
+
+  Square kingside_rook = Square(king_square + 3);
+  U64 kingside_path = (1ULL << (king_square + 1)) | (1ULL << (king_square + 2));
+  if (castle_rights.kingside
+      && (rooks & (1ULL << kingside_rook)) != 0
+      && (occupied & kingside_path) == 0
+      && !squareIsAttacked(pieces, Square(king_square + 1), other_color)
+      && !squareIsAttacked(pieces, Square(king_square + 2), other_color)) {
+    moves->push_back(Move(king_square, Square(king_square + 2)));
+  }
+
+  Square queenside_rook = Square(king_square - 4);
+  U64 queenside_path = (
+    (1ULL << (king_square - 1))
+    | (1ULL << (king_square - 2))
+    | (1ULL << (king_square - 3))
+  );
+  if (castle_rights.queenside
+      && (rooks & (1ULL << queenside_rook)) != 0
+      && (occupied & queenside_path) == 0
+      && !squareIsAttacked(pieces, Square(king_square - 1), other_color)
+      && !squareIsAttacked(pieces, Square(king_square - 2), other_color)) {
+    moves->push_back(Move(king_square, Square(king_square - 2)));
+  }
 }
 
 
-std::vector<Move> generateLegalMoves(Pieces *pieces, Color to_move,
-                                     Square en_passant) {
+MoveList generateLegalMoves(Pieces *pieces, Color to_move,
+                            Square en_passant, CastleRights castle_rights) {
+  MoveList legal_moves = generateLegalMoves(pieces, to_move, en_passant);
+  addCastlingMoves(pieces, &legal_moves, to_move, castle_rights);
+  return legal_moves;
+}
+
 
-  std::vector<Move> legal_moves;
-  std::vector<Move> potential_moves;
-  std::vector<Move> potential_king_moves;
+/*
+  Generates the pseudo-legal moves into one list, then keeps the
+  moves that don't leave the king attacked, in their original
+  order at the front of the list
+*/
+MoveList generateLegalMoves(Pieces *pieces, Color to_move,
+                            Square en_passant) {
+
+  MoveList moves;
 
   Square king_square = getLeastSigBit(pieces->get(KING)->at(to_move));
   U64 occupied = pieces->occupied();
@@ -45,36 +100,31 @@ std::vector<Move> generateLegalMoves(Pieces *pieces, Color to_move,
     U64 from_bb = pieces->get(piece_type)->at(to_move);
     if (from_bb == 0) { continue; }
 
-    addPieceTypeMoves(piece_type, &potential_moves, from_bb,
-                      occupied, same_color);
+    addPieceTypeMoves(piece_type, &moves, from_bb, occupied, same_color);
   }
 
   // Collect pawn moves
-  addPawnMoves(&potential_moves, pieces->get(PAWN)->at(to_move), occupied,
+  addPawnMoves(&moves, pieces->get(PAWN)->at(to_move), occupied,
                to_move, same_color, en_passant);
 
-  bool legal;
-  for (Move &move : potential_moves) {
-    legal = true;
-    applyMove(pieces, move, to_move);
-    if (squareIsAttacked(pieces, king_square, other_color)) { legal = false; }
-    revertMove(pieces, move, to_move);
-
-    if (legal) { legal_moves.push_back(move); }
-  }
-
-  // Collect and check king moves
+  // Collect king moves, which are checked on the square they land on
+  std::size_t king_moves_start = moves.size();
   PieceType king = KING;
-  addPieceTypeMoves(king, &potential_king_moves, pieces->get(KING)->at(to_move),
+  addPieceTypeMoves(king, &moves, pieces->get(KING)->at(to_move),
                     occupied, same_color);
-  for (Move &move : potential_king_moves) {
-    legal = true;
+
+  std::size_t legal = 0;
+  for (std::size_t idx = 0; idx < moves.size(); idx++) {
+    // Applying the move records any piece it captures
+    Move &move = moves[idx];
     applyMove(pieces, move, to_move);
-    if (squareIsAttacked(pieces, move.to, other_color)) { legal = false; }
+    Square checked = (idx < king_moves_start) ? king_square : move.to;
+    bool in_check = squareIsAttacked(pieces, checked, other_color);
     revertMove(pieces, move, to_move);
 
-    if (legal) { legal_moves.push_back(move); }
+    if (!in_check) { moves[legal++] = move; }
   }
+  moves.resize(legal);
 
-  return legal_moves;
-}
\ No newline at end of file
+  return moves;
+}
@@ -1,8 +1,6 @@
 #ifndef _LEGAL_H_
 #define _LEGAL_H_
 
-#include <vector>
-
 #include "collections.h"
 #include "move.h"
 #include "square.h"
@@ -11,7 +9,12 @@
 
 bool squareIsAttacked(Pieces *pieces, Square square, Color by);
 
-std::vector<Move> generateLegalMoves(Pieces *pieces, Color to_move,
-                                     Square en_passant = nullsq);
+void addCastlingMoves(Pieces *pieces, MoveList *moves, Color to_move,
+                      CastleRights castle_rights);
+
+MoveList generateLegalMoves(Pieces *pieces, Color to_move,
+                            Square en_passant = nullsq);
+MoveList generateLegalMoves(Pieces *pieces, Color to_move,
+                            Square en_passant, CastleRights castle_rights);
 
 #endif  // _LEGAL_H_
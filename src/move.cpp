@@ -1,97 +1,76 @@
-#include <functional>
-#include <iostream>
-#include <vector>
-
 #include "exceptions.h"
 #include "move.h"
 #include "piece.h"
 #include "types.h"
 
 
-std::vector<PieceType> promotionPieces {KNIGHT, BISHOP, ROOK, QUEEN};
+constexpr PieceType promotionPieces[] {KNIGHT, BISHOP, ROOK, QUEEN};
 
 
-void addPawnMoves(std::vector<Move> *moves, U64 pawns, U64 &occupied,
+void addPawnMoves(MoveList *moves, U64 pawns, U64 &occupied,
                   Color color, U64 &same_color, Square en_passant) {
 
-  while (true) {
-    try {
-      Square from_sq = popLeastSigBit(pawns);
-      bool promotion = false;
-      U64 attacks = getLonePawnAttacks(from_sq, occupied, same_color, color,
-                                       promotion, en_passant);
-      while (true) {
-        try {
-          Square to_sq = popLeastSigBit(attacks);
-
-          PieceType captured = NULL_PIECE;
-          Square ep_capture = nullsq;
-          if (to_sq == en_passant) {
-            captured = PAWN;
-            if (color == WHITE) { ep_capture = Square(to_sq - 8); }
-            else { ep_capture = Square(to_sq + 8); }
-          }
-
-          if (promotion) {
-            for (PieceType piece : promotionPieces) {
-              Move move(from_sq, to_sq, piece, captured, ep_capture);
-              moves->push_back(move);
-            }
-          } else {
-            Move move(from_sq, to_sq, NULL_PIECE, captured, ep_capture);
-            moves->push_back(move);
-          }
-
-        } catch(EmptyBitboardException){ break; }
+  while (pawns) {
+    Square from_sq = popLsb(pawns);
+    bool promotion = false;
+    U64 attacks = getLonePawnAttacks(from_sq, occupied, same_color, color,
+                                     promotion, en_passant);
+    while (attacks) {
+      Square to_sq = popLsb(attacks);
+
+      PieceType captured = NULL_PIECE;
+      Square ep_capture = nullsq;
+      if (to_sq == en_passant) {
+        captured = PAWN;
+        if (color == WHITE) { ep_capture = Square(to_sq - 8); }
+        else { ep_capture = Square(to_sq + 8); }
+      }
+
+      if (promotion) {
+        for (PieceType piece : promotionPieces) {
+          moves->push_back(Move(from_sq, to_sq, piece, captured, ep_capture));
+        }
+      } else {
+        moves->push_back(Move(from_sq, to_sq, NULL_PIECE, captured, ep_capture));
       }
-    } catch(EmptyBitboardException){ break; }
+    }
   }
 }
 
 
-void addPieceTypeMoves(PieceType &piece_type, std::vector<Move> *moves,
+void addPieceTypeMoves(PieceType &piece_type, MoveList *moves,
                        U64 pieces, U64 &occupied, U64 &same_color) {
 
-  std::function<U64(Square, U64 &, U64 &)> getPieceAttacks;
-  switch(piece_type) {
-    case KNIGHT:
-      getPieceAttacks = getLoneKnightAttacks;
-      break;
-    
-    case BISHOP:
-      getPieceAttacks = getLoneBishopAttacks;
-      break;
-
-    case ROOK:
-      getPieceAttacks = getLoneRookAttacks;
-      break;
-    
-    case QUEEN:
-      getPieceAttacks = getLoneQueenAttacks;
-      break;
-    
-    case KING:
-      getPieceAttacks = getLoneKingAttacks;
-      break;
-    
-    default:
-      throw InvalidPieceException();
+  LonePieceAttacks getAttacks = getLonePieceAttacks(piece_type);
+  while (pieces) {
+    Square from_sq = popLsb(pieces);
+    U64 attacks = getAttacks(from_sq, occupied, same_color);
+    while (attacks) {
+      moves->push_back(Move(from_sq, popLsb(attacks)));
+    }
   }
+}
 
-  while (true) {
-    try {
-      Square from_sq = popLeastSigBit(pieces);
-      U64 attacks = getPieceAttacks(from_sq, occupied, same_color);
-
-      while (true) {
-        try {
-          Square to_sq = popLeastSigBit(attacks);
-          Move move(from_sq, to_sq);
-          moves->push_back(move);
-        } catch(EmptyBitboardException){ break; }
-      }
-    } catch(EmptyBitboardException){ break; }
+
+/*
+  Castling is described by the king's two square move alone
+*/
+bool isCastlingMove(PieceType piece_type, Move &move) {
+  return piece_type == KING && (move.to - move.from == 2 || move.from - move.to == 2);
+}
+
+/*
+  Swaps the castled rook between its corner and the square
+  next to the king, on whichever side the king moved towards
+*/
+void moveCastledRook(Pieces *pieces, Move &move, Color color) {
+  U64 rook_squares;
+  if (move.to > move.from) {
+    rook_squares = (1ULL << (move.from + 3)) | (1ULL << (move.from + 1));
+  } else {
+    rook_squares = (1ULL << (move.from - 4)) | (1ULL << (move.from - 1));
   }
+  pieces->get(ROOK)->at(color) ^= rook_squares;
 }
 
 
@@ -145,6 +124,8 @@ void applyMove(Pieces *pieces, Move &move, Color to_move) {
   } else {
     from_piece_bb->at(to_move) |= to_bb;
   }
+
+  if (isCastlingMove(from_piece_type, move)) { moveCastledRook(pieces, move, to_move); }
 }
 
 void revertMove(Pieces *pieces, Move &move, Color moved) {
@@ -185,5 +166,8 @@ void revertMove(Pieces *pieces, Move &move, Color moved) {
   } else {
     moved_piece_bb->at(moved) |= from_bb;
   }
+
+  // Moving the rook is its own inverse
+  if (isCastlingMove(moved_piece_type, move)) { moveCastledRook(pieces, move, moved); }
 }
 
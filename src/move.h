@@ -1,7 +1,8 @@
 #ifndef _MOVE_H_
 #define _MOVE_H_
 
-#include <vector>
+#include <cassert>
+#include <cstddef>
 
 #include "collections.h"
 #include "square.h"
@@ -17,6 +18,9 @@ struct Move{
   // not where the capturing piece moved to
   Square ep_capture;
 
+  // Leaves the move unset, for slots of a `MoveList`
+  Move() = default;
+
   Move(Square from, Square to) : from(from), to(to) { 
     promotion = NULL_PIECE;
     captured = NULL_PIECE;
@@ -51,11 +55,51 @@ struct Move{
 };
 
 
-void addPawnMoves(std::vector<Move> *moves, U64 pawns, U64 &occupied,
+// More than the most moves any position has
+constexpr std::size_t MAX_MOVES = 256;
+
+/*
+  Fixed capacity list of moves, kept on the stack so
+  that generating a position's moves allocates nothing
+*/
+class MoveList {
+  public:
+    using value_type = Move;
+    using iterator = Move *;
+    using const_iterator = const Move *;
+
+    void push_back(const Move &move) {
+      assert(_size < MAX_MOVES);
+      _moves[_size++] = move;
+    }
+    // Drops all but the first `size` moves
+    void resize(std::size_t size) { _size = size; }
+
+    std::size_t size() const { return _size; }
+    bool empty() const { return _size == 0; }
+
+    Move &operator[](std::size_t idx) { return _moves[idx]; }
+    const Move &operator[](std::size_t idx) const { return _moves[idx]; }
+
+    iterator begin() { return _moves; }
+    iterator end() { return _moves + _size; }
+    const_iterator begin() const { return _moves; }
+    const_iterator end() const { return _moves + _size; }
+
+  private:
+    Move _moves[MAX_MOVES];
+    std::size_t _size = 0;
+};
+
+
+void addPawnMoves(MoveList *moves, U64 pawns, U64 &occupied,
                   Color color, U64 &same_color, Square en_passant);
-void addPieceTypeMoves(PieceType &piece_type, std::vector<Move> *moves, 
+void addPieceTypeMoves(PieceType &piece_type, MoveList *moves,
                        U64 pieces, U64 &occupied, U64 &same_color);
 
+bool isCastlingMove(PieceType piece_type, Move &move);
+void moveCastledRook(Pieces *pieces, Move &move, Color color);
+
 void applyMove(Pieces *pieces, Move &move, Color to_move);
 void revertMove(Pieces *pieces, Move &move, Color moved);
 
@@ -0,0 +1,101 @@
+#include "legal.h"
+#include "perft.h"
+
+
+/*
+  Legal moves of the side to move, including castling
+*/
+MoveList generateLegalMoves(Board &board) {
+  CastleRights castle_rights = (
+    (board.to_move == WHITE) ? board.castle_white : board.castle_black
+  );
+  return generateLegalMoves(&board.pieces, board.to_move,
+                            board.en_passant_target, castle_rights);
+}
+
+/*
+  Drops the castling rights of any king or rook leaving,
+  or being captured on, its starting square
+*/
+void updateCastleRights(Board &board, Square square) {
+  switch(square) {
+    case e1: board.castle_white = CastleRights(false, false); break;
+    case h1: board.castle_white.kingside = false; break;
+    case a1: board.castle_white.queenside = false; break;
+    case e8: board.castle_black = CastleRights(false, false); break;
+    case h8: board.castle_black.kingside = false; break;
+    case a8: board.castle_black.queenside = false; break;
+    default: break;
+  }
+}
+
+/*
+  Plays `move` on `board` in place, returning what's needed
+  to revert it with `unmakeMove`
+*/
+UndoState makeMove(Board &board, Move move) {
+  UndoState undo{move, board.en_passant_target, board.castle_white,
+                 board.castle_black, board.halfmove_clock};
+
+  U64 from_bb = 1ULL << move.from;
+  bool pawn_move = (board.pieces.get(PAWN)->at(board.to_move) & from_bb) != 0;
+  bool capture = (
+    (board.pieces.getColor(Color(board.to_move ^ BLACK)) & (1ULL << move.to)) != 0
+  );
+
+  applyMove(&board.pieces, undo.move, board.to_move);
+
+  board.en_passant_target = nullsq;
+  if (pawn_move && (move.to - move.from == 16 || move.from - move.to == 16)) {
+    board.en_passant_target = Square((move.from + move.to) / 2);
+  }
+  updateCastleRights(board, move.from);
+  updateCastleRights(board, move.to);
+
+  board.halfmove_clock = (pawn_move || capture) ? 0 : board.halfmove_clock + 1;
+  board.to_move = Color(board.to_move ^ BLACK);
+  board.ply++;
+  return undo;
+}
+
+/*
+  Reverts the move recorded in `undo`, which must
+  be the most recent move played on `board`
+*/
+void unmakeMove(Board &board, UndoState &undo) {
+  board.to_move = Color(board.to_move ^ BLACK);
+  board.ply--;
+  revertMove(&board.pieces, undo.move, board.to_move);
+
+  board.en_passant_target = undo.en_passant_target;
+  board.castle_white = undo.castle_white;
+  board.castle_black = undo.castle_black;
+  board.halfmove_clock = undo.halfmove_clock;
+}
+
+static void perft(Board &board, int depth, bool bulk,
+                  std::vector<U64> &counts, int level) {
+  MoveList moves = generateLegalMoves(board);
+  if (bulk && level + 1 == depth) {
+    counts[level] += moves.size();
+    return;
+  }
+
+  for (Move &move : moves) {
+    UndoState undo = makeMove(board, move);
+    counts[level]++;
+    if (level + 1 < depth) { perft(board, depth, bulk, counts, level + 1); }
+    unmakeMove(board, undo);
+  }
+}
+
+/*
+  Counts the nodes at each of the `depth` levels below `board`,
+  nearest first. With `bulk`, moves of the final level are
+  counted rather than played out.
+*/
+std::vector<U64> perft(Board &board, int depth, bool bulk) {
+  std::vector<U64> counts(depth > 0 ? depth : 0, 0);
+  if (depth > 0) { perft(board, depth, bulk, counts, 0); }
+  return counts;
+}
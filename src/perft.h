@@ -0,0 +1,29 @@
+#ifndef _PERFT_H_
+#define _PERFT_H_
+
+#include <vector>
+
+#include "board.h"
+#include "collections.h"
+#include "move.h"
+#include "square.h"
+#include "types.h"
+
+
+// Board state a move overwrites, kept to revert it
+struct UndoState {
+  Move move;
+  Square en_passant_target;
+  CastleRights castle_white;
+  CastleRights castle_black;
+  int halfmove_clock;
+};
+
+MoveList generateLegalMoves(Board &board);
+
+UndoState makeMove(Board &board, Move move);
+void unmakeMove(Board &board, UndoState &undo);
+
+std::vector<U64> perft(Board &board, int depth, bool bulk = false);
+
+#endif  // _PERFT_H_
@@ -1,9 +1,9 @@
 #include <algorithm>
 #include <bit>
-#include <functional>
 #include <iostream>
 
 #include "exceptions.h"
+#include "magics.h"
 #include "piece.h"
 
 
@@ -270,6 +270,89 @@ U64 getVertHorizAttacks(Square square, U64 &occupied)
 }
 
 
+/*
+  Magic bitboard slider attacks, see `pesto/board/magic.py`
+  for how the magics were found
+*/
+
+/*
+  Squares along the lines of a slider on `square` whose
+  occupancy can change its attacks. The edge square ending
+  each line is attacked whether occupied or not.
+*/
+U64 getRelevantMask(Square square, PieceType piece_type)
+{
+  U64 edges = Rank1 | Rank8 | FileA | FileH;
+  U64 empty = 0ULL;
+  if (piece_type == BISHOP) {
+    return getDiagAttacks(square, empty) & ~edges;
+  }
+  // A rook's rank ends at the side edges, and its file at
+  // the top and bottom, even when it stands on an edge
+  return (
+    (SLIDING_ATTACKS[N][square] | SLIDING_ATTACKS[S][square]) & ~(Rank1 | Rank8)
+  ) | (
+    (SLIDING_ATTACKS[E][square] | SLIDING_ATTACKS[W][square]) & ~(FileA | FileH)
+  );
+}
+
+/*
+  Fills `table` with the attacks of a slider on each square
+  for every occupancy of its relevant squares, at the index
+  the square's magic maps the occupancy to. Each square's
+  attacks take up the next 2^(relevant squares) entries.
+*/
+void initMagics(Magic magics[64], U64 *table, const U64 magic_numbers[64],
+                PieceType piece_type)
+{
+  for (int idx = 0; idx < 64; idx++) {
+    Square square = Square(idx);
+    Magic &entry = magics[idx];
+    entry.mask = getRelevantMask(square, piece_type);
+    entry.magic = magic_numbers[idx];
+    entry.shift = 64 - std::popcount(entry.mask);
+    entry.attacks = table;
+
+    // Walk every subset of the mask with the carry-rippler trick
+    U64 occupied = 0ULL;
+    do {
+      table[entry.index(occupied)] = (
+        piece_type == BISHOP
+        ? getDiagAttacks(square, occupied)
+        : getVertHorizAttacks(square, occupied)
+      );
+      occupied = (occupied - entry.mask) & entry.mask;
+    } while (occupied);
+
+    table += 1ULL << (64 - entry.shift);
+  }
+}
+
+Magic BISHOP_MAGIC_ENTRIES[64];
+Magic ROOK_MAGIC_ENTRIES[64];
+U64 BISHOP_ATTACK_TABLE[BISHOP_TABLE_SIZE];
+U64 ROOK_ATTACK_TABLE[ROOK_TABLE_SIZE];
+
+// Runs after `SLIDING_ATTACKS` is built, as it's defined above
+const bool MAGICS_READY = (
+  initMagics(BISHOP_MAGIC_ENTRIES, BISHOP_ATTACK_TABLE, BISHOP_MAGICS, BISHOP),
+  initMagics(ROOK_MAGIC_ENTRIES, ROOK_ATTACK_TABLE, ROOK_MAGICS, ROOK),
+  true
+);
+
+U64 getBishopAttacks(Square square, U64 occupied)
+{
+  const Magic &entry = BISHOP_MAGIC_ENTRIES[square];
+  return entry.attacks[entry.index(occupied)];
+}
+
+U64 getRookAttacks(Square square, U64 occupied)
+{
+  const Magic &entry = ROOK_MAGIC_ENTRIES[square];
+  return entry.attacks[entry.index(occupied)];
+}
+
+
 /*
   Attack map generation
 */
@@ -299,23 +382,16 @@ U64 getLonePawnAttacks(Square square, U64 &occupied, U64 &same_color,
       }
     }
 
-    U64 capture_diag;
-    U64 capture_en_passant;
-    if (color == WHITE) {
-      capture_diag = pawn_bb << 7 | pawn_bb << 9;
-      capture_en_passant = pawn_bb << 7 | pawn_bb << 9;
-    } else {
-      capture_diag = pawn_bb >> 7 | pawn_bb >> 9;
-      capture_en_passant = pawn_bb >> 7 | pawn_bb >> 9;
-    }
+    U64 capture_diag = getPawnCaptureSquares(pawn_bb, color);
+    U64 capture_en_passant = capture_diag;
     if (!attack_empty_squares) {
-      if (!(capture_diag && occupied)) {
-        capture_diag = 0ULL;
-      } else {
-        capture_diag &= occupied;
-      }
+      capture_diag &= occupied;
+    }
+    if (en_passant == nullsq) {
+      capture_en_passant = 0ULL;
+    } else {
+      capture_en_passant &= (1ULL << en_passant);
     }
-    capture_en_passant &= (1ULL << en_passant);
 
 
     U64 attacks = (
@@ -333,7 +409,21 @@ U64 getLonePawnAttacks(Square square, U64 &occupied, U64 &same_color,
     return attacks;
 }
 
-U64 getLoneKnightAttacks(Square square, U64 &occupied, U64 &same_color)
+/*
+  Squares attacked diagonally by every pawn in `pawn_bb`,
+  regardless of whether anything stands on them
+*/
+U64 getPawnCaptureSquares(U64 pawn_bb, Color color)
+{
+  if (color == WHITE) {
+    return northWestOne(pawn_bb) | northEastOne(pawn_bb);
+  }
+  return southWestOne(pawn_bb) | southEastOne(pawn_bb);
+}
+
+// Shares the signature of the sliding pieces, but ignores `occupied`
+U64 getLoneKnightAttacks(Square square, [[maybe_unused]] U64 &occupied,
+                         U64 &same_color)
 {
   U64 knight_bb = 1ULL << square;
   U64 no_no_ea = knightNorthNorthEast(knight_bb);
@@ -354,25 +444,27 @@ U64 getLoneKnightAttacks(Square square, U64 &occupied, U64 &same_color)
 
 U64 getLoneBishopAttacks(Square square, U64 &occupied, U64 &same_color)
 {
-  U64 attacks = getDiagAttacks(square, occupied);
+  U64 attacks = getBishopAttacks(square, occupied);
   return attacks & ~same_color;
 }
 
 
 U64 getLoneRookAttacks(Square square, U64 &occupied, U64 &same_color)
 {
-  U64 attacks = getVertHorizAttacks(square, occupied);
+  U64 attacks = getRookAttacks(square, occupied);
   return attacks & ~same_color;
 }
 
 U64 getLoneQueenAttacks(Square square, U64 &occupied, U64 &same_color)
 {
-  U64 attack_diag = getDiagAttacks(square, occupied);
-  U64 attack_vert_horiz = getVertHorizAttacks(square, occupied);
+  U64 attack_diag = getBishopAttacks(square, occupied);
+  U64 attack_vert_horiz = getRookAttacks(square, occupied);
   return (attack_diag | attack_vert_horiz) & ~same_color;
 }
 
-U64 getLoneKingAttacks(Square square, U64 &occupied, U64 &same_color)
+// Shares the signature of the sliding pieces, but ignores `occupied`
+U64 getLoneKingAttacks(Square square, [[maybe_unused]] U64 &occupied,
+                       U64 &same_color)
 {
   U64 king_bb = 1ULL << square;
   U64 north = northOne(king_bb);
@@ -395,52 +487,32 @@ U64 getLoneKingAttacks(Square square, U64 &occupied, U64 &same_color)
 U64 getPawnAttacks(U64 pawn_bb, U64 &occupied, U64 &same_color,
                    Color color, bool &promotion, bool attack_empty_squares) {
   U64 attacks = 0ULL;
-  while (true) {
-    try {
-      Square from_sq = popLeastSigBit(pawn_bb);
-      attacks |= getLonePawnAttacks(from_sq, occupied, same_color, color,
-                                    promotion, nullsq, attack_empty_squares);
-    } catch(EmptyBitboardException) { break; }
+  while (pawn_bb) {
+    Square from_sq = popLsb(pawn_bb);
+    attacks |= getLonePawnAttacks(from_sq, occupied, same_color, color,
+                                  promotion, nullsq, attack_empty_squares);
   }
   return attacks;
 }
 
-U64 getPieceAttacks(PieceType piece_type, U64 piece_bb, U64 &occupied,
-                    U64 &same_color) {
-
-  std::function<U64(Square, U64&, U64&)> getAttacks;
+LonePieceAttacks getLonePieceAttacks(PieceType piece_type) {
   switch(piece_type) {
-    case KNIGHT:
-      getAttacks = getLoneKnightAttacks;
-      break;
-
-    case BISHOP:
-      getAttacks = getLoneBishopAttacks;
-      break;
-
-    case ROOK:
-      getAttacks = getLoneRookAttacks;
-      break;
-
-    case QUEEN:
-      getAttacks = getLoneQueenAttacks;
-      break;
-
-    case KING:
-      getAttacks = getLoneKingAttacks;
-      break;
-
-    default:
-      throw InvalidPieceException();
+    case KNIGHT: return getLoneKnightAttacks;
+    case BISHOP: return getLoneBishopAttacks;
+    case ROOK:   return getLoneRookAttacks;
+    case QUEEN:  return getLoneQueenAttacks;
+    case KING:   return getLoneKingAttacks;
+    default:     throw InvalidPieceException();
   }
+}
 
+U64 getPieceAttacks(PieceType piece_type, U64 piece_bb, U64 &occupied,
+                    U64 &same_color) {
+  LonePieceAttacks getAttacks = getLonePieceAttacks(piece_type);
   U64 attacks = 0ULL;
-  while (true) {
-    try {
-      Square from_sq = popLeastSigBit(piece_bb);
-      attacks |= getAttacks(from_sq, occupied, same_color);
-    } catch(EmptyBitboardException) { break; }
+  while (piece_bb) {
+    Square from_sq = popLsb(piece_bb);
+    attacks |= getAttacks(from_sq, occupied, same_color);
   }
-
   return attacks;
 }
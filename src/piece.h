@@ -1,6 +1,7 @@
 #ifndef _PIECE_H_
 #define _PIECE_H_
 
+#include <bit>
 #include <vector>
 
 #include "square.h"
@@ -12,6 +13,18 @@ Square popMostSigBit (U64 &piece_bb);
 Square getLeastSigBit(U64 piece_bb);
 Square getMostSigBit (U64 piece_bb);
 
+/*
+  Pops the least significant set bit of a non-empty bitboard
+  without checking it's empty first, for loops shaped like
+  `while (bb) { Square square = popLsb(bb); ... }`
+*/
+inline Square popLsb(U64 &piece_bb)
+{
+  Square square = Square(std::countr_zero(piece_bb));
+  piece_bb &= piece_bb - 1;
+  return square;
+}
+
 /* 
   Single square movements
 */
@@ -49,18 +62,47 @@ std::vector<std::vector<U64>> getSlidingAttacks();
 U64 getDiagAttacks(Square square, U64 &occupied);
 U64 getVertHorizAttacks(Square square, U64 &occupied);
 
+/*
+  Magic bitboard slider attacks
+*/
+
+// Entries in all squares' attack tables together
+constexpr int BISHOP_TABLE_SIZE = 5248;
+constexpr int ROOK_TABLE_SIZE = 102400;
+
+struct Magic {
+  U64 mask;
+  U64 magic;
+  // Start of the square's slice of the attack table
+  U64 *attacks;
+  unsigned shift;
+
+  unsigned index(U64 occupied) const {
+    return unsigned(((occupied & mask) * magic) >> shift);
+  }
+};
+
+U64 getRelevantMask(Square square, PieceType piece_type);
+U64 getBishopAttacks(Square square, U64 occupied);
+U64 getRookAttacks(Square square, U64 occupied);
+
 /*
   Attack map generation
 */
 U64 getLonePawnAttacks(Square square, U64 &occupied, U64 &same_color,
                        Color color, bool &promotion, Square en_passant = nullsq,
                        bool attack_empty_squares = false);
+U64 getPawnCaptureSquares(U64 pawn_bb, Color color);
 U64 getLoneKnightAttacks(Square square, U64 &occupied, U64 &same_color);
 U64 getLoneBishopAttacks(Square square, U64 &occupied, U64 &same_color);
 U64 getLoneRookAttacks  (Square square, U64 &occupied, U64 &same_color);
 U64 getLoneQueenAttacks (Square square, U64 &occupied, U64 &same_color);
 U64 getLoneKingAttacks  (Square square, U64 &occupied, U64 &same_color);
 
+// Signature shared by the `getLone*Attacks` of non-pawn pieces
+typedef U64 (*LonePieceAttacks)(Square, U64 &, U64 &);
+LonePieceAttacks getLonePieceAttacks(PieceType piece_type);
+
 U64 getPawnAttacks(U64 pawn_bb, U64 &occupied, U64 &same_color,
                    Color color, bool &promotion, bool attack_empty_squares);
 U64 getPieceAttacks(PieceType piece_type, U64 piece_bb, U64 &occupied,
@@ -3,6 +3,7 @@
 
 #include <cstdint>
 #include <memory>
+#include <vector>
 
 typedef uint64_t U64;
 typedef std::vector<U64> bb_vec;
@@ -66,7 +66,7 @@ TEST(GenerateLegalMovesTest, NoLegalMoves)
   pieces.get(KING)->at(WHITE) = 1ULL << a1;
   pieces.get(ROOK)->at(BLACK) = 1ULL << h2 | 1ULL << b8;
 
-  std::vector<Move> moves = generateLegalMoves(&pieces, WHITE);
+  MoveList moves = generateLegalMoves(&pieces, WHITE);
   EXPECT_TRUE(moves.size() == 0);
 }
 
@@ -80,7 +80,7 @@ TEST(GenerateLegalMovesTest, NoLegalMovesPieceIsPinned)
   pieces.get(KNIGHT)->at(BLACK) = 1ULL << h7;
   pieces.get(ROOK)->at(WHITE) = 1ULL << h1 | 1ULL << g1;
 
-  std::vector<Move> moves = generateLegalMoves(&pieces, BLACK);
+  MoveList moves = generateLegalMoves(&pieces, BLACK);
   EXPECT_TRUE(moves.size() == 0);
 }
 
@@ -93,7 +93,7 @@ TEST(GenerateLegalMovesTest, SingleLegalNonKingMove)
   pieces.get(PAWN)->at(WHITE) = 1ULL << e4;
   pieces.get(ROOK)->at(BLACK) = 1ULL << h2 | 1ULL << b8;
 
-  std::vector<Move> moves = generateLegalMoves(&pieces, WHITE);
+  MoveList moves = generateLegalMoves(&pieces, WHITE);
   EXPECT_THAT(moves, ::testing::ElementsAre(Move{e4, e5}));
 }
 
@@ -108,7 +108,7 @@ TEST(GenerateLegalMovesTest, SingleLegalEnPassantMove)
   pieces.get(PAWN)->at(BLACK) = 1ULL << c5;
   pieces.get(QUEEN)->at(BLACK) = 1ULL << h3;
 
-  std::vector<Move> moves = generateLegalMoves(&pieces, WHITE, c6);
+  MoveList moves = generateLegalMoves(&pieces, WHITE, c6);
   EXPECT_THAT(moves, ::testing::ElementsAre(Move(b5, c6, NULL_PIECE, PAWN, c5)));
 }
 
@@ -119,7 +119,7 @@ TEST(GenerateLegalMovesTest, MultipleLegalMoves)
   pieces.get(PAWN)->at(WHITE) = 1ULL << b6;
   pieces.get(BISHOP)->at(BLACK) = 1ULL << d6;
 
-  std::vector<Move> moves = generateLegalMoves(&pieces, WHITE);
+  MoveList moves = generateLegalMoves(&pieces, WHITE);
   EXPECT_THAT(moves,
               ::testing::ElementsAre(Move{b6, b7},
                                      Move{a8, a7},
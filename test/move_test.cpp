@@ -7,9 +7,24 @@
 #include "move.h"
 
 
+TEST(MoveListTest, PushAndResize)
+{
+  MoveList moves;
+  EXPECT_TRUE(moves.empty());
+
+  moves.push_back(Move{e2, e4});
+  moves.push_back(Move{g1, f3});
+  moves.push_back(Move{b1, c3});
+  ASSERT_THAT(moves, ::testing::ElementsAre(Move{e2, e4}, Move{g1, f3}, Move{b1, c3}));
+
+  moves.resize(1);
+  EXPECT_EQ(moves.size(), 1);
+  EXPECT_EQ(moves[0], (Move{e2, e4}));
+}
+
 TEST(AddPawnMovesTest, SinglePawnWithoutPromotion)
 {
-  std::vector<Move> obs_moves;
+  MoveList obs_moves;
   U64 pawns = 1ULL << b2;
   U64 occupied = 1ULL << b2;
   Color color = WHITE;
@@ -22,7 +37,7 @@ TEST(AddPawnMovesTest, SinglePawnWithoutPromotion)
 
 TEST(AddPawnMovesTest, TwoPawnsWithoutPromotion)
 {
-  std::vector<Move> obs_moves;
+  MoveList obs_moves;
   U64 pawns = 1ULL << b2 | 1ULL << c5;
   U64 occupied = 1ULL << b2 | 1ULL << c5;
   Color color = WHITE;
@@ -38,7 +53,7 @@ TEST(AddPawnMovesTest, TwoPawnsWithoutPromotion)
 
 TEST(AddPawnMovesTest, SinglePawnPromotes)
 {
-  std::vector<Move> obs_moves;
+  MoveList obs_moves;
   U64 pawns = 1ULL << d7;
   U64 occupied = 1ULL << d7;
   Color color = WHITE;
@@ -57,7 +72,7 @@ TEST(AddPawnMovesTest, SinglePawnPromotes)
 
 TEST(AddPawnMovesTest, EnPassantCapture)
 {
-  std::vector<Move> obs_moves;
+  MoveList obs_moves;
   U64 pawns = 1ULL << b5;
   U64 occupied = 1ULL << b5 | 1ULL << c5;
   Color color = WHITE;
@@ -76,7 +91,7 @@ TEST(AddPawnMovesTest, EnPassantCapture)
 
 TEST(AddPieceTypeMovesTest, SingleBishop)
 {
-  std::vector<Move> obs_moves;
+  MoveList obs_moves;
   PieceType piece_type = BISHOP;
   U64 bishops = 1ULL << b2;
   U64 occupied = 0x50200ULL;
@@ -91,7 +106,7 @@ TEST(AddPieceTypeMovesTest, SingleBishop)
 
 TEST(AddPieceTypeMovesTest, TwoRooksTrappedBySameColor)
 {
-  std::vector<Move> obs_moves;
+  MoveList obs_moves;
   PieceType piece_type = ROOK;
   U64 rooks = 0x3ULL;
   U64 occupied = 0x707ULL;
@@ -103,7 +118,7 @@ TEST(AddPieceTypeMovesTest, TwoRooksTrappedBySameColor)
 
 TEST(AddPieceTypeMovesTest, SingleRookInCorner)
 {
-  std::vector<Move> obs_moves;
+  MoveList obs_moves;
   PieceType piece_type = ROOK;
   U64 rooks = 1ULL << h1;
   U64 occupied = 0x80a0ULL;
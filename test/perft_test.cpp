@@ -0,0 +1,79 @@
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include "perft.h"
+
+
+TEST(PerftTest, StartingPosition)
+{
+  Board board;
+  board.fromFen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1");
+  EXPECT_THAT(perft(board, 4), testing::ElementsAre(20, 400, 8902, 197281));
+}
+
+TEST(PerftTest, Position2)
+{
+  Board board;
+  board.fromFen(
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+  );
+  EXPECT_THAT(perft(board, 3), testing::ElementsAre(48, 2039, 97862));
+}
+
+TEST(PerftTest, Position3)
+{
+  Board board;
+  board.fromFen("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1");
+  EXPECT_THAT(perft(board, 4), testing::ElementsAre(14, 191, 2812, 43238));
+}
+
+TEST(PerftTest, Position4)
+{
+  Board board;
+  board.fromFen(
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+  );
+  EXPECT_THAT(perft(board, 4, true),
+              testing::ElementsAre(6, 264, 9467, 422333));
+}
+
+TEST(PerftTest, Position5)
+{
+  Board board;
+  board.fromFen("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8");
+  EXPECT_THAT(perft(board, 3), testing::ElementsAre(44, 1486, 62379));
+}
+
+TEST(PerftTest, BoardIsRestored)
+{
+  std::string fen = (
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+  );
+  Board board;
+  board.fromFen(fen);
+  perft(board, 3);
+  EXPECT_EQ(board.toFen(), fen);
+}
+
+TEST(MakeMoveTest, DoublePawnPushSetsEnPassantTarget)
+{
+  Board board;
+  UndoState undo = makeMove(board, Move(e2, e4));
+  EXPECT_EQ(board.en_passant_target, e3);
+  EXPECT_EQ(board.to_move, BLACK);
+
+  unmakeMove(board, undo);
+  EXPECT_EQ(board.en_passant_target, nullsq);
+  EXPECT_EQ(board.to_move, WHITE);
+}
+
+TEST(MakeMoveTest, CastlingMovesRook)
+{
+  Board board;
+  board.fromFen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1");
+  UndoState undo = makeMove(board, Move(e1, g1));
+  EXPECT_EQ(board.toFen(), "r3k2r/8/8/8/8/8/8/R4RK1 b kq - 1 1");
+
+  unmakeMove(board, undo);
+  EXPECT_EQ(board.toFen(), "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1");
+}
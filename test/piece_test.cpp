@@ -86,6 +86,17 @@ TEST(PopMostSigBitTest, BitboardWithSingleSquare)
   EXPECT_EQ(bb_h8, 0ULL);
 }
 
+TEST(PopLsbTest, VisitsEverySquareInOrder)
+{
+  U64 board = 1ULL << a1 | 1ULL << d4 | 1ULL << h8;
+  std::vector<Square> squares;
+  while (board) { squares.push_back(popLsb(board)); }
+
+  std::vector<Square> exp_squares = {a1, d4, h8};
+  EXPECT_EQ(squares, exp_squares);
+  EXPECT_EQ(board, 0ULL);
+}
+
 TEST(PopSigBitException, EmptyBitboardException){
   U64 empty_bb = 0ULL;
   EXPECT_THROW(popLeastSigBit(empty_bb), EmptyBitboardException);
@@ -305,6 +316,43 @@ TEST(GetSlidingAttacks, SpotCheckTest)
   EXPECT_EQ(attacks[NW][h7], exp_north_west_h7);
 }
 
+/*
+  Test magic bitboard slider attacks
+*/
+TEST(GetRelevantMask, SpotCheckTest)
+{
+  U64 exp_bishop_d4 = (
+    1ULL << c3 | 1ULL << b2 | 1ULL << e5 | 1ULL << f6 | 1ULL << g7 |
+    1ULL << c5 | 1ULL << b6 | 1ULL << e3 | 1ULL << f2
+  );
+  EXPECT_EQ(getRelevantMask(d4, BISHOP), exp_bishop_d4);
+
+  // Own rank and file still end short of the far corners
+  U64 exp_rook_a1 = 0x000101010101017eULL;
+  EXPECT_EQ(getRelevantMask(a1, ROOK), exp_rook_a1);
+}
+
+/*
+  Magic lookups should match scanning each ray for its
+  first blocker, for a spread of pseudo-random occupancies
+*/
+TEST(MagicAttacks, MatchRayScans)
+{
+  U64 state = 0x9E3779B97F4A7C15ULL;
+  for (int trial = 0; trial < 1000; trial++) {
+    state ^= state << 13;
+    state ^= state >> 7;
+    state ^= state << 17;
+    U64 occupied = state & (state >> 11);
+
+    for (int idx = 0; idx < 64; idx++) {
+      Square square = Square(idx);
+      EXPECT_EQ(getBishopAttacks(square, occupied), getDiagAttacks(square, occupied));
+      EXPECT_EQ(getRookAttacks(square, occupied), getVertHorizAttacks(square, occupied));
+    }
+  }
+}
+
 /*
   Confirm Pawn movement
 */